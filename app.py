@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="NHL DB Sync - stepwise")
+    parser.add_argument("--profile", action="store_true", help="Run the command under cProfile and write a .prof stats file plus a sorted report")
+    parser.add_argument("--profile-dir", default="profiles", help="Directory for --profile output (default: profiles)")
+    parser.add_argument("--profile-sort", default="cumulative", help="pstats sort key for the --profile report (default: cumulative)")
     sub = parser.add_subparsers(dest="command", required=True)
 
     # Defer command registration to modular command modules
@@ -37,6 +40,36 @@ def build_parser() -> argparse.ArgumentParser:
     except Exception as e:
         logger.warning(f"Failed to register live command: {e}")
 
+    try:
+        from nhl_db.commands.backfill import register as register_backfill
+        register_backfill(sub)
+    except Exception as e:
+        logger.warning(f"Failed to register backfill command: {e}")
+
+    try:
+        from nhl_db.commands.replay import register as register_replay
+        register_replay(sub)
+    except Exception as e:
+        logger.warning(f"Failed to register replay command: {e}")
+
+    try:
+        from nhl_db.commands.migrate import register as register_migrate
+        register_migrate(sub)
+    except Exception as e:
+        logger.warning(f"Failed to register migrate command: {e}")
+
+    try:
+        from nhl_db.commands.export import register as register_export
+        register_export(sub)
+    except Exception as e:
+        logger.warning(f"Failed to register export command: {e}")
+
+    try:
+        from nhl_db.commands.analytics import register as register_analytics
+        register_analytics(sub)
+    except Exception as e:
+        logger.warning(f"Failed to register analytics command: {e}")
+
     return parser
 
 
@@ -48,7 +81,11 @@ def main(argv: Optional[List[str]] = None) -> int:
     try:
         parser = build_parser()
         args = parser.parse_args(argv)
-        args.func(args)
+        if args.profile or getattr(args, "profile_cycles", None):
+            from nhl_db.profiling import run_profiled
+            run_profiled(args.func, args, args.command, directory=args.profile_dir, sort=args.profile_sort)
+        else:
+            args.func(args)
         logger.info("NHL Companion application completed successfully")
         return 0
     except Exception as e:
@@ -0,0 +1,194 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from ..config import get_env
+from ..repositories.plays_repo import get_play_stats_by_season, iter_plays_by_season
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# Missing IDs are stored as -1, missing coordinates as NaN
+MISSING_ID = -1
+
+# name -> (dtype, source column in PlayRow)
+COLUMN_SPECS: Dict[str, Tuple[str, str]] = {
+    "game_id": ("int64", "playGameId"),
+    "period": ("int8", "playPeriod"),
+    "team_id": ("int32", "playTeamId"),
+    "primary_player_id": ("int64", "playPrimaryPlayerId"),
+    "opposing_player_id": ("int64", "playLosingPlayerId"),
+    "secondary_player_id": ("int64", "playSecondaryPlayerId"),
+    "tertiary_player_id": ("int64", "playTertiaryPlayerId"),
+    "x": ("float32", "playXCoord"),
+    "y": ("float32", "playYCoord"),
+    "type_code": ("uint8", "playType"),
+    "zone_code": ("uint8", "playZone"),
+}
+# Columns stored as small integer codes into a per-season vocabulary
+_CODED = {"type_code": "types", "zone_code": "zones"}
+
+
+class SeasonPlays:
+    """
+    One season of plays as NumPy column arrays (see COLUMN_SPECS).
+
+    playType and playZone are dictionary-encoded: ``type_code`` / ``zone_code``
+    index into ``types`` / ``zones``. Arrays loaded from the cache are read-only
+    memory maps, so opening a season costs no parsing and pages are read on demand.
+    """
+
+    def __init__(self, season: int, arrays: Dict[str, np.ndarray], types: List[str], zones: List[str]) -> None:
+        self.season = season
+        self.arrays = arrays
+        self.types = types
+        self.zones = zones
+
+    def __len__(self) -> int:
+        return int(self.arrays["game_id"].shape[0])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        arrays = self.__dict__.get("arrays") or {}
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    def type_mask(self, names: Iterable[str]) -> np.ndarray:
+        """Boolean mask of plays whose playType is one of ``names``."""
+        codes = [self.types.index(n) for n in names if n in self.types]
+        return np.isin(self.arrays["type_code"], np.asarray(codes, dtype=np.uint8))
+
+
+def season_signature(season: int) -> str:
+    """
+    Digest of every game's (play count, highest playId, play content checksum) in a season.
+
+    One grouped query that returns a row per game, so checking a cache is cheap;
+    it changes whenever plays are added to, removed from or corrected in any game
+    of the season.
+    """
+    stats = get_play_stats_by_season(season)
+    payload = json.dumps(sorted(stats.items()), separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _encode(values: Sequence[Any], vocabulary: Dict[str, int]) -> np.ndarray:
+    codes = [vocabulary.setdefault("" if v is None else str(v), len(vocabulary)) for v in values]
+    if len(vocabulary) > 255:
+        raise ValueError("more than 255 distinct values in a dictionary-encoded play column")
+    return np.asarray(codes, dtype=np.uint8)
+
+
+def build_season_plays(season: int, chunk_size: int = 50000) -> SeasonPlays:
+    """Read a season's plays from MySQL (streamed, ``chunk_size`` rows at a time) into column arrays."""
+    vocabularies: Dict[str, Dict[str, int]] = {"types": {}, "zones": {}}
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in COLUMN_SPECS}
+    rows = iter_plays_by_season(season, chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        for name, (dtype, source) in COLUMN_SPECS.items():
+            values = [getattr(row, source) for row in chunk]
+            if name in _CODED:
+                parts[name].append(_encode(values, vocabularies[_CODED[name]]))
+            elif dtype.startswith("float"):
+                # None becomes NaN
+                parts[name].append(np.asarray(values, dtype=np.float64).astype(dtype))
+            else:
+                parts[name].append(np.asarray([MISSING_ID if v is None else v for v in values], dtype=dtype))
+    arrays = {
+        name: np.concatenate(chunks) if chunks else np.empty(0, dtype=COLUMN_SPECS[name][0])
+        for name, chunks in parts.items()
+    }
+    return SeasonPlays(season, arrays, list(vocabularies["types"]), list(vocabularies["zones"]))
+
+
+def _cache_root() -> Path:
+    return Path(get_env("NHL_ANALYTICS_CACHE_DIR", ".cache/analytics"))
+
+
+def _read_meta(directory: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(directory / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+
+def _write_cache(directory: Path, plays: SeasonPlays, signature: str) -> None:
+    """Write one .npy file per column plus meta.json, swapping the whole directory in at the end."""
+    tmp = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name, array in plays.arrays.items():
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(array))
+    meta = {
+        "version": CACHE_VERSION,
+        "season": plays.season,
+        "rows": len(plays),
+        "signature": signature,
+        "types": plays.types,
+        "zones": plays.zones,
+        "builtAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+    old = directory.with_name(directory.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, old)
+    os.replace(tmp, directory)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def _load_cache(directory: Path, season: int, meta: Dict[str, Any]) -> SeasonPlays:
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in COLUMN_SPECS}
+    return SeasonPlays(season, arrays, list(meta["types"]), list(meta["zones"]))
+
+
+def load_season_plays(season: int, refresh: bool = False, validate: bool = True) -> SeasonPlays:
+    """
+    A season's plays as column arrays, from the memory-mapped cache when it is current.
+
+    The cache lives in NHL_ANALYTICS_CACHE_DIR/<season> (default: .cache/analytics).
+    With ``validate`` the cache is checked against season_signature() (one
+    grouped query) and rebuilt from MySQL if plays changed; without it, any
+    existing cache is used as-is, which needs no database at all.
+
+    Args:
+        season: Season in YYYYYYYY format
+        refresh: Rebuild the cache unconditionally
+        validate: Compare the cache with the database before using it
+    """
+    directory = _cache_root() / str(season)
+    meta = None if refresh else _read_meta(directory)
+    signature: Optional[str] = None
+    if meta is not None and validate:
+        signature = season_signature(season)
+        if meta.get("signature") != signature:
+            logger.info(f"Analytics cache for {season} is stale; rebuilding")
+            meta = None
+    if meta is not None:
+        return _load_cache(directory, season, meta)
+
+    started = time.perf_counter()
+    if signature is None:
+        signature = season_signature(season)
+    plays = build_season_plays(season)
+    _write_cache(directory, plays, signature)
+    logger.info(f"Built analytics cache for {season}: {len(plays)} plays in {time.perf_counter() - started:.1f}s")
+    meta = _read_meta(directory)
+    return _load_cache(directory, season, meta) if meta is not None else plays
@@ -0,0 +1,220 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .columns import MISSING_ID, SeasonPlays
+
+# Unblocked and blocked shot attempts (Corsi events); goals are not counted as shots-on-goal
+SHOT_TYPES = ("shot-on-goal", "missed-shot", "blocked-shot", "goal")
+
+# Play types whose owner (playTeamId, and the team playZone is relative to) is the
+# defending team: a blocked shot belongs to the team that blocked it
+DEFENDER_OWNED_TYPES = ("blocked-shot",)
+
+# Team IDs are small; game_id * _TEAM_SPAN + team_id keys a (game, team) pair
+_TEAM_SPAN = 1 << 20
+
+# Rink coordinates are in feet from center ice; the goal line is at |x| = 89
+GOAL_X = 89.0
+RINK_HALF_LENGTH = 100.0
+RINK_HALF_WIDTH = 42.5
+
+
+class EventTable(NamedTuple):
+    """Counts per key (player or team ID) and label (play type or zone), from a single bincount."""
+
+    keys: np.ndarray
+    labels: List[str]
+    counts: np.ndarray  # shape (len(keys), len(labels))
+
+    def totals(self) -> np.ndarray:
+        return self.counts.sum(axis=1)
+
+    def shares(self) -> np.ndarray:
+        """Each row divided by its total (rows without events stay 0)."""
+        totals = self.totals().astype(np.float64)
+        return np.divide(self.counts, totals[:, None], out=np.zeros(self.counts.shape), where=totals[:, None] > 0)
+
+    def row(self, key: int) -> Dict[str, int]:
+        i = np.searchsorted(self.keys, key)
+        if i >= len(self.keys) or self.keys[i] != key:
+            return {label: 0 for label in self.labels}
+        return {label: int(n) for label, n in zip(self.labels, self.counts[i])}
+
+    def top(self, n: int = 10, label: Optional[str] = None) -> List[Tuple[int, int]]:
+        """(key, count) of the ``n`` largest totals, or of the largest counts for one label."""
+        values = self.totals() if label is None else self.counts[:, self.labels.index(label)]
+        order = np.argsort(values, kind="stable")[::-1][:n]
+        return [(int(self.keys[i]), int(values[i])) for i in order]
+
+
+def shooting_team_ids(plays: SeasonPlays) -> np.ndarray:
+    """
+    playTeamId with blocked shots credited to the shooting team instead of the blocker.
+
+    The shooting team is the other team of the same game, taken from the two
+    teams that own events in it. Where a game does not show exactly two teams
+    the shooter's team is unknown and MISSING_ID is used.
+    """
+    team = plays.arrays["team_id"]
+    defended = plays.type_mask(DEFENDER_OWNED_TYPES) & (team != MISSING_ID)
+    if not defended.any():
+        return team
+    game = plays.arrays["game_id"]
+    owned = team != MISSING_ID
+    pairs = np.unique(game[owned].astype(np.int64) * _TEAM_SPAN + team[owned])
+    games, team_counts = np.unique(pairs // _TEAM_SPAN, return_counts=True)
+    team_sums = np.bincount(np.searchsorted(games, pairs // _TEAM_SPAN), weights=pairs % _TEAM_SPAN).astype(np.int64)
+    # Every defended play's game owns at least that play, so it is in ``games``
+    i = np.searchsorted(games, game[defended])
+    opponent = np.where(team_counts[i] == 2, team_sums[i] - team[defended], MISSING_ID)
+    shooting = np.array(team, copy=True)
+    shooting[defended] = opponent
+    return shooting
+
+
+def attacking_zone_codes(plays: SeasonPlays) -> Tuple[np.ndarray, List[str]]:
+    """
+    zone_code with blocked shots' zones flipped (O <-> D) to the shooting team's view.
+
+    Returns the codes and the zone labels they index: ``plays.zones``, plus "O" or
+    "D" if the season's vocabulary lacks the flipped zone.
+    """
+    codes = plays.arrays["zone_code"]
+    zones = list(plays.zones)
+    defended = plays.type_mask(DEFENDER_OWNED_TYPES)
+    if not defended.any() or ("O" not in zones and "D" not in zones):
+        return codes, zones
+    for zone in ("O", "D"):
+        if zone not in zones:
+            zones.append(zone)
+    flip = np.arange(len(zones), dtype=np.int64)
+    o, d = zones.index("O"), zones.index("D")
+    flip[o], flip[d] = d, o
+    return np.where(defended, flip[codes], codes), zones
+
+
+def _key_array(plays: SeasonPlays, by: str) -> np.ndarray:
+    if by == "player":
+        return plays.arrays["primary_player_id"]
+    if by == "team":
+        return shooting_team_ids(plays)
+    raise ValueError(f"by must be 'player' or 'team', not {by}")
+
+
+def _grouped_counts(keys: np.ndarray, codes: np.ndarray, n_labels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Count (key, code) pairs with one bincount over key_index * n_labels + code."""
+    unique_keys, key_index = np.unique(keys, return_inverse=True)
+    flat = key_index.astype(np.int64) * n_labels + codes.astype(np.int64)
+    counts = np.bincount(flat, minlength=len(unique_keys) * n_labels).reshape(len(unique_keys), n_labels)
+    return unique_keys, counts
+
+
+def event_counts(plays: SeasonPlays, by: str = "player", types: Iterable[str] = SHOT_TYPES, mask: Optional[np.ndarray] = None) -> EventTable:
+    """
+    Per-player or per-team counts of each play type in ``types``.
+
+    Players are credited through playPrimaryPlayerId (the shooter for shots), teams
+    through playTeamId (the event owner), except that blocked shots count for the
+    shooting team, not the blocker (see shooting_team_ids). Plays without that ID
+    are skipped.
+    """
+    labels = [t for t in types if t in plays.types]
+    selected = plays.type_mask(labels)
+    if mask is not None:
+        selected &= mask
+    keys = _key_array(plays, by)
+    selected &= keys != MISSING_ID
+    # Remap the season's type codes to column positions in ``labels``
+    remap = np.zeros(max(len(plays.types), 1), dtype=np.int64)
+    remap[[plays.types.index(t) for t in labels]] = np.arange(len(labels))
+    unique_keys, counts = _grouped_counts(keys[selected], remap[plays.arrays["type_code"][selected]], max(len(labels), 1))
+    return EventTable(unique_keys, labels, counts[:, :len(labels)])
+
+
+def zone_splits(plays: SeasonPlays, by: str = "team", types: Iterable[str] = SHOT_TYPES, mask: Optional[np.ndarray] = None) -> EventTable:
+    """
+    Per-player or per-team counts of ``types`` events by zone (playZone: O / N / D).
+
+    Keys are credited as in event_counts. Zones are from the shooting team's view:
+    a blocked shot's playZone is relative to the blocking team, so it is flipped.
+    Use EventTable.shares() for the split as fractions.
+    """
+    selected = plays.type_mask(types)
+    if mask is not None:
+        selected &= mask
+    keys = _key_array(plays, by)
+    selected &= keys != MISSING_ID
+    zone_codes, zones = attacking_zone_codes(plays)
+    labels = [z or "?" for z in zones]
+    unique_keys, counts = _grouped_counts(keys[selected], zone_codes[selected], max(len(labels), 1))
+    return EventTable(unique_keys, labels, counts[:, :len(labels)])
+
+
+def attacking_coordinates(plays: SeasonPlays, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coordinates of the selected plays mirrored so every event attacks the net at x = +89.
+
+    Teams switch ends between periods, so raw coordinates mix both directions.
+    Events at negative x are rotated 180 degrees about center ice. For shots that
+    approximates the attacking direction well, since nearly all come from the
+    offensive half. Plays without coordinates are dropped.
+    """
+    x = plays.arrays["x"]
+    y = plays.arrays["y"]
+    selected = np.isfinite(x) & np.isfinite(y)
+    if mask is not None:
+        selected &= mask
+    x = x[selected].astype(np.float64)
+    y = y[selected].astype(np.float64)
+    flip = x < 0
+    return np.where(flip, -x, x), np.where(flip, -y, y)
+
+
+def shot_distances(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Distance in feet from attacking coordinates to the center of the goal line."""
+    return np.hypot(GOAL_X - x, y)
+
+
+def heatmap(
+    plays: SeasonPlays,
+    types: Iterable[str] = SHOT_TYPES,
+    mask: Optional[np.ndarray] = None,
+    bins: Sequence[int] = (50, 34),
+    normalize: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Binned counts of ``types`` events over the attacking half of the rink.
+
+    Args:
+        plays: Season columns
+        types: Play types to include
+        mask: Optional extra selection, e.g. ``shooting_team_ids(plays) == 10``
+        bins: Bins along x (0..100 ft) and y (-42.5..42.5 ft)
+        normalize: Divide by the total so cells sum to 1
+
+    Returns:
+        (counts with shape bins, x edges, y edges), as from numpy.histogram2d
+    """
+    selected = plays.type_mask(types)
+    if mask is not None:
+        selected &= mask
+    x, y = attacking_coordinates(plays, selected)
+    counts, x_edges, y_edges = np.histogram2d(
+        x, y, bins=bins, range=((0.0, RINK_HALF_LENGTH), (-RINK_HALF_WIDTH, RINK_HALF_WIDTH)),
+    )
+    if normalize and counts.sum() > 0:
+        counts = counts / counts.sum()
+    return counts, x_edges, y_edges
+
+
+def player_shot_summary(plays: SeasonPlays, player_id: int) -> Dict[str, float]:
+    """Shot attempts by type, goals, shooting percentage and mean shot distance of one player."""
+    shooter = plays.arrays["primary_player_id"] == player_id
+    summary: Dict[str, float] = {t: float(np.count_nonzero(shooter & plays.type_mask([t]))) for t in SHOT_TYPES}
+    on_net = summary["shot-on-goal"] + summary["goal"]
+    summary["attempts"] = float(sum(summary[t] for t in SHOT_TYPES))
+    summary["shooting_pct"] = summary["goal"] / on_net if on_net else 0.0
+    x, y = attacking_coordinates(plays, shooter & plays.type_mask(SHOT_TYPES))
+    summary["mean_distance_ft"] = float(shot_distances(x, y).mean()) if len(x) else 0.0
+    return summary
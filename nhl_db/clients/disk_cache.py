@@ -0,0 +1,150 @@
+from typing import Any, Optional
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from ..config import get_env
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Persistent, content-addressed cache of decoded API responses.
+
+    Entries are keyed by the SHA-256 of the request URL and stored as gzip-compressed
+    JSON under a two-character shard directory. Only responses that can never
+    change (finished games, past schedule weeks) should be stored.
+
+    Recency and sizes are tracked in an in-memory LRU index, built from one scan of
+    the directory (ordered by mtime) on first use. Once the cache grows past
+    ``max_bytes``, the least recently used entries are evicted until it is below
+    ``low_water`` of ``max_bytes``, so a full cache is not trimmed on every put().
+    Reads also bump the file's mtime, which orders the index of the next process.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, low_water: float = 0.9) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self.low_water_bytes = int(self.max_bytes * min(1.0, max(0.0, low_water)))
+        self._lock = threading.Lock()
+        # path -> size in bytes, least recently used first; None until scanned
+        self._index: Optional["OrderedDict[Path, int]"] = None
+        self._total_bytes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json.gz"
+
+    def _load_index(self) -> "OrderedDict[Path, int]":
+        # Caller holds self._lock
+        if self._index is None:
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            self._index = OrderedDict((path, size) for path, size, _ in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path} for {key}: {e}")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        with self._lock:
+            index = self._load_index()
+            if path in index:
+                index.move_to_end(path)
+        return data
+
+    def put(self, key: str, data: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+            size = os.path.getsize(tmp_name)
+            os.replace(tmp_name, path)
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            index = self._load_index()
+            self._total_bytes += size - index.pop(path, 0)
+            index[path] = size
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked(index)
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        with self._lock:
+            if self._index is not None:
+                self._total_bytes -= self._index.pop(path, 0)
+
+    def _entries(self):  # type: ignore[no-untyped-def]
+        for path in self.directory.glob("*/*.json.gz"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            yield path, st.st_size, st.st_mtime
+
+    def _evict_locked(self, index: "OrderedDict[Path, int]") -> None:
+        # Caller holds self._lock
+        evicted = 0
+        while index and self._total_bytes > self.low_water_bytes:
+            path, size = index.popitem(last=False)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not evict disk cache entry {path}: {e}")
+            self._total_bytes -= size
+            evicted += 1
+        if evicted:
+            logger.info(f"Evicted {evicted} entries from disk cache {self.directory}")
+
+
+_disk_cache: Optional[DiskCache] = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """
+    Return the process-wide DiskCache, or None when NHL_CACHE_DIR is not set.
+
+    NHL_CACHE_MAX_MB bounds the cache size (default: 512 MB).
+    """
+    global _disk_cache
+    directory = get_env("NHL_CACHE_DIR", "")
+    if not directory:
+        return None
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            max_mb = int(get_env("NHL_CACHE_MAX_MB", "512"))
+            _disk_cache = DiskCache(directory, max_bytes=max_mb * 1024 * 1024)
+        return _disk_cache
@@ -0,0 +1,104 @@
+from typing import Any, Dict, List, Optional
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from ..config import NHL_WEB_BASE
+from .recorder import get_recorder, record_response
+
+logger = logging.getLogger(__name__)
+
+# Mirror the retry policy of the synchronous session (see get_configured_session)
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_FORCELIST = (500, 502, 503, 504)
+
+
+def create_async_session(limit: int = 10) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp.ClientSession with a bounded connection pool.
+
+    Must be called from within a running event loop.
+
+    Args:
+        limit: Maximum number of simultaneous connections.
+
+    Returns:
+        A configured aiohttp.ClientSession.
+    """
+    connector = aiohttp.TCPConnector(limit=max(1, int(limit)), ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=30)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def fetch_json_async(session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+    """
+    GET a URL and decode its JSON body, retrying connection errors and server errors
+    with exponential backoff (0.5s, 1s, 2s).
+    """
+    attempt = 0
+    while True:
+        started = time.monotonic()
+        try:
+            async with session.get(url) as resp:
+                if resp.status in RETRY_STATUS_FORCELIST and attempt < RETRY_TOTAL:
+                    raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status, message=resp.reason or "")
+                resp.raise_for_status()
+                # The NHL API does not always send application/json
+                data = await resp.json(content_type=None) or {}
+                if get_recorder() is not None:
+                    # Recording appends to files; keep that blocking I/O off the event loop
+                    await asyncio.to_thread(record_response, url, data, time.monotonic() - started)
+                return data
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUS_FORCELIST
+            if not retryable or attempt >= RETRY_TOTAL:
+                raise
+            delay = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+            attempt += 1
+            logger.warning(f"Retrying URL={url} in {delay}s (attempt {attempt}/{RETRY_TOTAL}): {e}")
+            await asyncio.sleep(delay)
+
+
+async def fetch_schedule_for_date_async(date_str: str, session: aiohttp.ClientSession, base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    url = f"{base_url or NHL_WEB_BASE}/schedule/{date_str}"
+    try:
+        data = await fetch_json_async(session, url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching schedule for date {date_str}, URL={url}: {e}", exc_info=True)
+        raise
+    games: List[Dict[str, Any]] = []
+    for day in data.get("gameWeek", []) or []:
+        for g in day.get("games", []) or []:
+            games.append(g)
+    return games
+
+
+async def fetch_game_landing_async(game_id: int, session: aiohttp.ClientSession, base_url: Optional[str] = None) -> Dict[str, Any]:
+    url = f"{base_url or NHL_WEB_BASE}/gamecenter/{game_id}/landing"
+    try:
+        return await fetch_json_async(session, url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching game landing for game_id={game_id}, URL={url}: {e}", exc_info=True)
+        raise
+
+
+async def fetch_game_boxscore_async(game_id: int, session: aiohttp.ClientSession, base_url: Optional[str] = None) -> Dict[str, Any]:
+    url = f"{base_url or NHL_WEB_BASE}/gamecenter/{game_id}/boxscore"
+    try:
+        return await fetch_json_async(session, url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching game boxscore for game_id={game_id}, URL={url}: {e}", exc_info=True)
+        raise
+
+
+async def fetch_game_pbp_async(game_id: int, session: aiohttp.ClientSession, base_url: Optional[str] = None) -> Dict[str, Any]:
+    url = f"{base_url or NHL_WEB_BASE}/gamecenter/{game_id}/play-by-play"
+    try:
+        return await fetch_json_async(session, url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching game play-by-play for game_id={game_id}, URL={url}: {e}", exc_info=True)
+        raise
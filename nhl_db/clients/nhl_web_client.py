@@ -1,23 +1,37 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from collections import OrderedDict
+from datetime import date, timedelta
 import logging
+import threading
+import time
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from .disk_cache import get_disk_cache
+from .recorder import record_response
 from .records_client import fetch_players_by_team
 
 from ..config import NHL_WEB_BASE
+from ..metrics import HTTP_RESPONSES, HTTP_RETRIES, STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Game states after which gamecenter payloads no longer change
+FINAL_GAME_STATES = ("FINAL", "OFF")
 
-def get_configured_session() -> requests.Session:
+
+def get_configured_session(pool_maxsize: int = 10) -> requests.Session:
     """
     Create a requests.Session with retry logic and connection pooling configured.
     
     This handles connection resets, timeouts, and transient server errors
     that occur during extended application runtime.
     
+    Args:
+        pool_maxsize: Maximum number of pooled connections kept per host. Should be
+                      at least the number of threads sharing the session.
+    
     Returns:
         A configured requests.Session with automatic retry capability.
     """
@@ -33,7 +47,7 @@ def get_configured_session() -> requests.Session:
     )
     
     # Create adapter with retry strategy
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=max(1, int(pool_maxsize)))
     
     # Mount adapter for both http and https
     session.mount("http://", adapter)
@@ -42,15 +56,173 @@ def get_configured_session() -> requests.Session:
     return session
 
 
-def fetch_roster(tricode: str, season: str, team_id: int, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
+def _endpoint_label(url: str) -> str:
+    """Short metrics label for an NHL Web API URL (landing, boxscore, play-by-play, schedule, roster)."""
+    path = url.split("?", 1)[0]
+    if path.startswith(NHL_WEB_BASE):
+        path = path[len(NHL_WEB_BASE):]
+    segments = [s for s in path.split("/") if s]
+    if not segments:
+        return "other"
+    return segments[-1] if segments[0] == "gamecenter" else segments[0]
+
+
+def _decode_response(url: str, resp: requests.Response) -> Dict[str, Any]:
+    """Count the response status and client-side retries, raise on errors and decode the JSON body."""
+    endpoint = _endpoint_label(url)
+    HTTP_RESPONSES.inc(1, endpoint, str(resp.status_code))
+    retries = getattr(getattr(resp.raw, "retries", None), "history", None)
+    if retries:
+        HTTP_RETRIES.inc(len(retries), endpoint)
+    resp.raise_for_status()
+    with STAGE_SECONDS.time("json_decode"):
+        return resp.json() or {}
+
+
+class CachedPayload(dict):
+    """
+    Decoded JSON object returned by ConditionalCache.
+
+    ``not_modified`` is True when the server answered 304 Not Modified and the body
+    was served from the cache, so callers can skip mapping and DB work.
+    """
+
+    not_modified: bool = False
+
+
+class ConditionalCache:
+    """
+    Per-URL cache of decoded JSON bodies and their HTTP validators (ETag / Last-Modified).
+
+    Requests for a cached URL send If-None-Match / If-Modified-Since; a 304 response
+    returns the cached object without downloading or decoding the body again.
+    Thread-safe so it can be shared by the watch-live fetch workers.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, Tuple[Optional[str], Optional[str], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Drop all cached bodies; the next request for each URL is a full fetch."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_json(self, session: requests.Session, url: str, timeout: int = 30) -> CachedPayload:
+        with self._lock:
+            entry = self._entries.get(url)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            etag, last_modified, _ = entry
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        resp = session.get(url, timeout=timeout, headers=headers)
+        if resp.status_code == 304 and entry is not None:
+            HTTP_RESPONSES.inc(1, _endpoint_label(url), "304")
+            with self._lock:
+                self._entries.move_to_end(url)
+            payload = CachedPayload(entry[2])
+            payload.not_modified = True
+            return payload
+
+        data = _decode_response(url, resp)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        with self._lock:
+            if etag or last_modified:
+                self._entries[url] = (etag, last_modified, data)
+                self._entries.move_to_end(url)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.pop(url, None)
+        return CachedPayload(data)
+
+
+def _is_final_game_payload(data: Dict[str, Any]) -> bool:
+    return str(data.get("gameState") or "").upper() in FINAL_GAME_STATES
+
+
+def _is_past_schedule_payload(data: Dict[str, Any]) -> bool:
+    """True when every day of a schedule gameWeek is in the past and all its games are final."""
+    days = data.get("gameWeek") or []
+    if not days:
+        return False
+    # One day of slack so late games in western time zones are never cached early
+    cutoff = (date.today() - timedelta(days=1)).isoformat()
+    for day in days:
+        if not isinstance(day.get("date"), str) or day["date"] >= cutoff:
+            return False
+        for g in day.get("games", []) or []:
+            if not _is_final_game_payload(g):
+                return False
+    return True
+
+
+def _get_json(
+    session: requests.Session,
+    url: str,
+    cache: Optional[ConditionalCache] = None,
+    immutable: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    """
+    GET a URL and decode its JSON body.
+
+    When ``immutable`` is given and the on-disk cache is enabled (NHL_CACHE_DIR),
+    a stored response is served without touching the network, and a fresh
+    response for which ``immutable(data)`` is True is stored for next time.
+
+    When NHL_RECORD_DIR is set, every response is also recorded for replay
+    (see recorder.ResponseRecorder).
+    """
+    disk_cache = get_disk_cache() if immutable is not None else None
+    if disk_cache is not None:
+        cached = disk_cache.get(url)
+        if cached is not None:
+            record_response(url, cached, 0.0)
+            return cached
+
+    started = time.monotonic()
+    if cache is not None:
+        data: Dict[str, Any] = cache.get_json(session, url)
+    else:
+        resp = session.get(url, timeout=30)
+        data = _decode_response(url, resp)
+    elapsed = time.monotonic() - started
+    STAGE_SECONDS.observe(elapsed, f"fetch_{_endpoint_label(url)}")
+    record_response(url, data, elapsed)
+
+    if disk_cache is not None and immutable is not None and immutable(data):
+        try:
+            disk_cache.put(url, data)
+        except Exception as e:
+            logger.warning(f"Failed to store response for URL={url} in disk cache: {e}")
+    return data
+
+
+def fetch_roster(
+    tricode: str,
+    season: str,
+    team_id: int,
+    session: Optional[requests.Session] = None,
+    records_players: Optional[List[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch a team's roster for a season from the NHL Web API, filled in with Records API players.
+
+    ``records_players`` may be passed when the caller already fetched the team's
+    Records API players (they do not depend on the season).
+    """
     session = session or get_configured_session()
     tri = (tricode or "").lower()
     # NHL Web roster (primary source)
     url = f"{NHL_WEB_BASE}/roster/{tri}/{season}"
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json() or {}
+        data = _get_json(session, url)
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching roster for {tricode} (team_id={team_id}), URL={url}: {e}", exc_info=True)
         raise
@@ -71,7 +243,8 @@ def fetch_roster(tricode: str, season: str, team_id: int, session: Optional[requ
             continue
 
     # Records API players (secondary source, fill only missing players)
-    records_players = fetch_players_by_team(team_id, session=session)
+    if records_players is None:
+        records_players = fetch_players_by_team(team_id, session=session)
     merged: List[Dict[str, Any]] = list(web_players)
     for rp in records_players:
         try:
@@ -113,55 +286,57 @@ def fetch_roster(tricode: str, season: str, team_id: int, session: Optional[requ
     return merged
 
 
-def fetch_schedule_for_date(date_str: str, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
-    print(f"Fetching schedule for date: {date_str}...")
+def fetch_schedule_week(date_str: str, session: Optional[requests.Session] = None, cache: Optional[ConditionalCache] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch the schedule gameWeek that starts at ``date_str``.
+
+    Returns:
+        The gameWeek days, each a dict with a "date" (YYYY-MM-DD) and its "games".
+    """
     session = session or get_configured_session()
     url = f"{NHL_WEB_BASE}/schedule/{date_str}"
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json() or {}
+        data = _get_json(session, url, cache, immutable=_is_past_schedule_payload)
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching schedule for date {date_str}, URL={url}: {e}", exc_info=True)
         raise
+    return list(data.get("gameWeek", []) or [])
+
+
+def fetch_schedule_for_date(date_str: str, session: Optional[requests.Session] = None, cache: Optional[ConditionalCache] = None) -> List[Dict[str, Any]]:
+    print(f"Fetching schedule for date: {date_str}...")
     games: List[Dict[str, Any]] = []
-    for day in data.get("gameWeek", []) or []:
+    for day in fetch_schedule_week(date_str, session=session, cache=cache):
         for g in day.get("games", []) or []:
             games.append(g)
     return games
 
 
-def fetch_game_landing(game_id: int, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+def fetch_game_landing(game_id: int, session: Optional[requests.Session] = None, cache: Optional[ConditionalCache] = None) -> Dict[str, Any]:
     session = session or get_configured_session()
     url = f"{NHL_WEB_BASE}/gamecenter/{game_id}/landing"
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        return resp.json() or {}
+        return _get_json(session, url, cache, immutable=_is_final_game_payload)
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching game landing for game_id={game_id}, URL={url}: {e}", exc_info=True)
         raise
 
 
-def fetch_game_boxscore(game_id: int, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+def fetch_game_boxscore(game_id: int, session: Optional[requests.Session] = None, cache: Optional[ConditionalCache] = None) -> Dict[str, Any]:
     session = session or get_configured_session()
     url = f"{NHL_WEB_BASE}/gamecenter/{game_id}/boxscore"
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        return resp.json() or {}
+        return _get_json(session, url, cache, immutable=_is_final_game_payload)
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching game boxscore for game_id={game_id}, URL={url}: {e}", exc_info=True)
         raise
 
 
-def fetch_game_pbp(game_id: int, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+def fetch_game_pbp(game_id: int, session: Optional[requests.Session] = None, cache: Optional[ConditionalCache] = None) -> Dict[str, Any]:
     session = session or get_configured_session()
     url = f"{NHL_WEB_BASE}/gamecenter/{game_id}/play-by-play"
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        return resp.json() or {}
+        return _get_json(session, url, cache, immutable=_is_final_game_payload)
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching game play-by-play for game_id={game_id}, URL={url}: {e}", exc_info=True)
         raise
@@ -0,0 +1,112 @@
+from typing import Any, Dict, Optional, Tuple
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from ..config import NHL_WEB_BASE, RECORDS_BASE, get_env
+
+logger = logging.getLogger(__name__)
+
+# Top-level directories of a recording, one per upstream API
+API_NAMES = ("web", "records")
+
+
+def split_api_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a client URL into (api name, path relative to that API's base URL).
+
+    Returns None for URLs that belong to neither configured API.
+    """
+    for api, base in (("web", NHL_WEB_BASE), ("records", RECORDS_BASE)):
+        if url.startswith(base):
+            return api, url[len(base):] or "/"
+    return None
+
+
+def recording_relpath(api: str, relative_url: str) -> str:
+    """
+    Map an API-relative URL to the file (relative to the recording root) holding its responses.
+
+    The path is kept readable (web/gamecenter/2025020076/landing.jsonl); a query
+    string, which can be long for the Records API, is replaced by a short hash.
+    """
+    parts = urlsplit(relative_url)
+    path = parts.path.strip("/") or "index"
+    safe = "/".join(seg.replace("..", "_") for seg in path.split("/") if seg)
+    if parts.query:
+        safe += "__q" + hashlib.sha1(parts.query.encode("utf-8")).hexdigest()[:12]
+    return f"{api}/{safe}.jsonl"
+
+
+class ResponseRecorder:
+    """
+    Appends every decoded API response to a recording directory for later replay.
+
+    Each URL gets a JSON-lines file (see recording_relpath) with one entry per
+    distinct body: the wall-clock capture time ``t``, the request latency in
+    milliseconds and the body. Consecutive identical bodies are skipped, so a
+    game polled every few seconds only grows its file when something changed.
+    Thread-safe so it can be shared by the watch-live fetch workers.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._last_digest: Dict[str, str] = {}
+
+    def record(self, url: str, data: Any, elapsed_seconds: float) -> None:
+        split = split_api_url(url)
+        if split is None:
+            return
+        relpath = recording_relpath(*split)
+        body = json.dumps(data, separators=(",", ":"), sort_keys=True)
+        digest = hashlib.sha1(body.encode("utf-8")).hexdigest()
+        line = json.dumps({
+            "t": round(time.time(), 3),
+            "elapsed_ms": round(elapsed_seconds * 1000, 1),
+            "url": split[1],
+        }, separators=(",", ":"))
+        # Splice the pre-serialized body in rather than encoding it twice
+        line = line[:-1] + ',"body":' + body + "}\n"
+        path = self.directory / relpath
+        with self._lock:
+            if self._last_digest.get(relpath) == digest:
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._last_digest[relpath] = digest
+
+
+_recorder: Optional[ResponseRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> Optional[ResponseRecorder]:
+    """Return the process-wide ResponseRecorder, or None when NHL_RECORD_DIR is not set."""
+    global _recorder
+    directory = get_env("NHL_RECORD_DIR", "")
+    if not directory:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = ResponseRecorder(directory)
+            logger.info(f"Recording API responses to {directory}")
+        return _recorder
+
+
+def record_response(url: str, data: Any, elapsed_seconds: float) -> None:
+    """Record a response when recording is enabled; never lets a recording failure break a fetch."""
+    recorder = get_recorder()
+    if recorder is None:
+        return
+    try:
+        recorder.record(url, data, elapsed_seconds)
+    except Exception as e:
+        logger.warning(f"Failed to record response for URL={url}: {e}")
@@ -1,9 +1,11 @@
 from typing import Any, Dict, List, Optional
 
 import logging
+import time
 import requests
 
 from ..config import RECORDS_BASE
+from .recorder import record_response
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,15 @@ def get_configured_session() -> requests.Session:
     return _get_configured_session()
 
 
+def _get_json(session: requests.Session, url: str) -> Dict[str, Any]:
+    started = time.monotonic()
+    resp = session.get(url, timeout=30)
+    resp.raise_for_status()
+    data = resp.json() or {}
+    record_response(url, data, time.monotonic() - started)
+    return data
+
+
 def fetch_franchises(session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
     session = session or get_configured_session()
     includes = (
@@ -28,9 +39,7 @@ def fetch_franchises(session: Optional[requests.Session] = None) -> List[Dict[st
     )
     url = f"{RECORDS_BASE}/franchise?{includes}"
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json() or {}
+        data = _get_json(session, url)
         return data.get("data", [])
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching franchises from Records API, URL={url}: {e}", exc_info=True)
@@ -42,9 +51,7 @@ def fetch_players_by_team(team_id: int, session: Optional[requests.Session] = No
     session = session or get_configured_session()
     url = f"{RECORDS_BASE}/player/byTeam/{team_id}"
     try:
-        resp = session.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json() or {}
+        data = _get_json(session, url)
         return data.get("data", [])
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching players for team_id={team_id} from Records API, URL={url}: {e}", exc_info=True)
@@ -0,0 +1,57 @@
+import argparse
+import time
+
+
+def _cmd_analytics(args: argparse.Namespace) -> None:
+    # Imported lazily so the other commands do not require numpy
+    import numpy as np
+
+    from ..analytics.columns import load_season_plays
+    from ..analytics.events import SHOT_TYPES, event_counts, heatmap, player_shot_summary, shooting_team_ids, zone_splits
+
+    season = int(args.season)
+    started = time.perf_counter()
+    plays = load_season_plays(season, refresh=bool(args.refresh), validate=not args.no_validate)
+    loaded = time.perf_counter()
+    print(f"Season {season}: {len(plays)} plays loaded in {(loaded - started) * 1000:.0f} ms")
+
+    # Blocked shots are owned by the blocking team; select by the shooting team instead
+    mask = shooting_team_ids(plays) == int(args.team) if args.team else None
+    shooters = event_counts(plays, by="player", mask=mask)
+    print(f"\nTop {args.top} shooters by attempts ({', '.join(shooters.labels)}):")
+    for player_id, attempts in shooters.top(int(args.top)):
+        counts = shooters.row(player_id)
+        print(f"  {player_id:>8}  {attempts:>5}  " + "  ".join(f"{counts[t]:>4}" for t in shooters.labels))
+
+    zones = zone_splits(plays, by="team", mask=mask)
+    shares = zones.shares()
+    print(f"\nShot attempts by zone per team ({' / '.join(zones.labels)}):")
+    for i, team_id in enumerate(zones.keys):
+        print(f"  {int(team_id):>4}  {int(zones.totals()[i]):>6}  " + "  ".join(f"{s:6.1%}" for s in shares[i]))
+
+    if args.player:
+        summary = player_shot_summary(plays, int(args.player))
+        print(f"\nPlayer {args.player}: " + ", ".join(f"{k}={v:.3f}" if isinstance(v, float) and not v.is_integer() else f"{k}={v:g}" for k, v in summary.items()))
+
+    if args.heatmap_out:
+        player_mask = plays.primary_player_id == int(args.player) if args.player else None
+        if mask is not None and player_mask is not None:
+            player_mask &= mask
+        nx, ny = (int(v) for v in args.bins.lower().split("x"))
+        counts, _, _ = heatmap(plays, SHOT_TYPES, mask=player_mask if player_mask is not None else mask, bins=(nx, ny))
+        np.savetxt(args.heatmap_out, counts.T, fmt="%d", delimiter=",")
+        print(f"\nHeatmap ({nx}x{ny} bins over the attacking half, rows = y) written to {args.heatmap_out}")
+    print(f"\nAnalytics computed in {(time.perf_counter() - loaded) * 1000:.0f} ms")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("analytics", help="Shot and event analytics for a season from cached NumPy columns")
+    p.add_argument("season", help="Season in YYYYYYYY format, e.g. 20242025")
+    p.add_argument("--team", type=int, default=None, help="Only count shot attempts taken by this team ID (blocked ones included)")
+    p.add_argument("--player", type=int, default=None, help="Print a shot summary (and heatmap) for this player ID")
+    p.add_argument("--top", type=int, default=10, help="Number of shooters listed (default: 10)")
+    p.add_argument("--heatmap-out", default=None, help="Write a shot-location heatmap as CSV to this path")
+    p.add_argument("--bins", default="50x34", help="Heatmap bins along x and y (default: 50x34, about 2x2.5 ft)")
+    p.add_argument("--refresh", action="store_true", help="Rebuild the season's column cache from MySQL")
+    p.add_argument("--no-validate", action="store_true", help="Use an existing cache without checking the database")
+    p.set_defaults(func=_cmd_analytics)
@@ -0,0 +1,25 @@
+import argparse
+
+from ..services.backfill_service import backfill_plays
+
+
+def _cmd_backfill_plays(args: argparse.Namespace) -> None:
+    game_types = [int(t) for t in args.game_types.split(",") if t.strip()] if args.game_types else None
+    games, plays, failed = backfill_plays(
+        int(args.season),
+        max_concurrency=int(args.max_concurrency),
+        batch_games=int(args.batch_games),
+        game_types=game_types,
+        restart=bool(args.restart),
+    )
+    print(f"Finished backfilling {plays} plays across {games} games ({failed} failed).")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("backfill-plays", help="Load play-by-play for every finished game of a season (resumable)")
+    p.add_argument("season", help="Season in YYYYYYYY format, e.g. 20242025")
+    p.add_argument("--max-concurrency", type=int, default=8, help="Games fetched in parallel (default: 8)")
+    p.add_argument("--batch-games", type=int, default=25, help="Games written per transaction (default: 25)")
+    p.add_argument("--game-types", default=None, help="Optional comma-separated game types (1=preseason, 2=regular, 3=playoffs)")
+    p.add_argument("--restart", action="store_true", help="Clear this season's checkpoints and reload every game")
+    p.set_defaults(func=_cmd_backfill_plays)
@@ -0,0 +1,33 @@
+import argparse
+
+from ..services.export_service import export_season
+
+
+def _cmd_export(args: argparse.Namespace) -> None:
+    for season in args.seasons:
+        print(f"Exporting season {season} to {args.out}...")
+        stats = export_season(
+            int(season),
+            out_dir=args.out,
+            fmt=args.format,
+            games_per_file=int(args.games_per_file),
+            chunk_size=int(args.chunk_size),
+            full=bool(args.full),
+        )
+        print(f"Season {season}: {stats.describe()}.")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("export", help="Export seasons of games and plays to partitioned Parquet / CSV files (incremental)")
+    p.add_argument("seasons", nargs="+", help="Seasons in YYYYYYYY format, e.g. 20242025")
+    p.add_argument("--out", default="exports", help="Export directory (default: exports)")
+    p.add_argument(
+        "--format",
+        choices=["auto", "parquet", "csv"],
+        default="auto",
+        help="File format: parquet (requires pyarrow), csv (gzip-compressed) or auto (parquet if pyarrow is installed; default)"
+    )
+    p.add_argument("--games-per-file", type=int, default=100, help="Game numbers per plays file (default: 100)")
+    p.add_argument("--chunk-size", type=int, default=50000, help="Rows streamed from MySQL and written per batch (default: 50000)")
+    p.add_argument("--full", action="store_true", help="Ignore the manifest and rewrite every file")
+    p.set_defaults(func=_cmd_export)
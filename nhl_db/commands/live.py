@@ -5,17 +5,47 @@ from ..services.live_service import update_live_once, watch_live_games
 
 def _cmd_update_live(args: argparse.Namespace) -> None:
     game_id = int(args.game)
-    count = update_live_once(game_id)
+    count = update_live_once(game_id, single_endpoint=bool(args.single_endpoint))
     print(f"Updated game {game_id}; upserted {count} plays.")
 
 
+# watch-live flags implemented only by the sync engine
+_SYNC_ONLY_FLAGS = (
+    ("single_endpoint", "--single-endpoint"),
+    ("metrics_port", "--metrics-port"),
+    ("persist_first_seen", "--persist-first-seen"),
+    ("memwatch", "--memwatch"),
+)
+
+
 def _cmd_watch_live(args: argparse.Namespace) -> None:
-    watch_live_games(poll_seconds=int(args.poll_seconds))
+    if args.engine == "async":
+        unsupported = [flag for attr, flag in _SYNC_ONLY_FLAGS if getattr(args, attr) not in (None, False)]
+        if unsupported:
+            raise SystemExit(f"watch-live: {', '.join(unsupported)} not supported by --engine async; use --engine sync")
+        # Imported lazily so the default engine does not require aiohttp/aiomysql
+        from ..services.live_async_service import run_watch_live_async
+        run_watch_live_async(
+            poll_seconds=int(args.poll_seconds),
+            max_concurrency=int(args.max_concurrency),
+            max_cycles=args.profile_cycles,
+        )
+        return
+    watch_live_games(
+        poll_seconds=int(args.poll_seconds),
+        max_concurrency=int(args.max_concurrency),
+        single_endpoint=True if args.single_endpoint else None,
+        metrics_port=args.metrics_port,
+        persist_first_seen=bool(args.persist_first_seen),
+        max_cycles=args.profile_cycles,
+        memwatch=True if args.memwatch else None,
+    )
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
     p = subparsers.add_parser("update-live", help="Update live game state and plays for a gameId")
     p.add_argument("game", help="Game ID (e.g., 2025020001)")
+    p.add_argument("--single-endpoint", action="store_true", help="Derive game fields from play-by-play only (boxscore as fallback)")
     p.set_defaults(func=_cmd_update_live)
 
     p2 = subparsers.add_parser("watch-live", help="Continuously watch all LIVE games and update DB")
@@ -25,6 +55,45 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         default=5, 
         help="Polling interval when live games exist (default: 5 seconds). No games = 5 minutes."
     )
+    p2.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=0,
+        help="Maximum number of live games fetched in parallel per cycle (default: LIVE_MAX_CONCURRENCY from config)."
+    )
+    p2.add_argument(
+        "--single-endpoint",
+        action="store_true",
+        help="Derive game fields from play-by-play only, fetching the boxscore only when a field is missing (sync engine)."
+    )
+    p2.add_argument(
+        "--engine",
+        choices=["sync", "async"],
+        default="sync",
+        help="Live engine: 'sync' (thread pool + requests/mysql-connector) or 'async' (asyncio + aiohttp/aiomysql)."
+    )
+    p2.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default: NHL_METRICS_PORT; 0 disables, sync engine)."
+    )
+    p2.add_argument(
+        "--persist-first-seen",
+        action="store_true",
+        help="Store when each new play was first seen in plays.playFirstSeenUtc (run `migrate` first; sync engine)."
+    )
+    p2.add_argument(
+        "--profile-cycles",
+        type=int,
+        default=None,
+        help="Profile the first N poll cycles, then stop (implies the global --profile)."
+    )
+    p2.add_argument(
+        "--memwatch",
+        action="store_true",
+        help="Log RSS and the top growing allocation sites every NHL_MEMWATCH_INTERVAL_SECONDS (default: NHL_MEMWATCH; sync engine)."
+    )
     p2.set_defaults(func=_cmd_watch_live)
 
 
@@ -0,0 +1,49 @@
+import argparse
+
+from ..migrations.runner import migrate, migration_status
+
+
+def _cmd_migrate(args: argparse.Namespace) -> None:
+    if args.status:
+        for migration, state in migration_status():
+            print(f"{migration.label:<40} {state or 'pending'}")
+        return
+    if not args.explain_only:
+        done = migrate(
+            target=args.target,
+            dry_run=bool(args.dry_run),
+            allow_locking=bool(args.allow_locking),
+            lock_wait_timeout=int(args.lock_wait_timeout),
+        )
+        if done and not args.dry_run:
+            print(f"Applied {len(done)} migration(s).")
+    if args.explain or args.explain_only:
+        # Imported lazily: it pulls in every repository module
+        from ..migrations.explain import check_repository_queries
+        results = check_repository_queries()
+        for result in results:
+            print(f"[{result.status.upper():<4}] {result.name}: {result.detail}")
+        failed = [r.name for r in results if r.status == "fail"]
+        if failed:
+            raise SystemExit(f"migrate: {len(failed)} repository query(ies) do not use an index: {', '.join(failed)}")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("migrate", help="Apply pending schema migrations (nhl_db/migrations/versions)")
+    p.add_argument("--status", action="store_true", help="List migrations and whether each is applied, then exit")
+    p.add_argument("--dry-run", action="store_true", help="Print pending migrations without applying them")
+    p.add_argument("--target", type=int, default=None, help="Apply migrations up to and including this version")
+    p.add_argument(
+        "--allow-locking",
+        action="store_true",
+        help="If MySQL cannot run a change online (ALGORITHM=INPLACE, LOCK=NONE), retry it with table locking"
+    )
+    p.add_argument(
+        "--lock-wait-timeout",
+        type=int,
+        default=10,
+        help="Seconds each ALTER may wait for its metadata lock before failing (default: 10)"
+    )
+    p.add_argument("--explain", action="store_true", help="After migrating, EXPLAIN the repository queries and fail if one does not use an index")
+    p.add_argument("--explain-only", action="store_true", help="Only run the EXPLAIN check")
+    p.set_defaults(func=_cmd_migrate)
@@ -4,14 +4,20 @@ from ..services.players_service import sync_players_roster
 
 
 def _cmd_sync_players_roster(args: argparse.Namespace) -> None:
-    total = sync_players_roster(args.season, teams_filter=args.teams)
-    print(f"Finished syncing {total} players across active teams.")
+    seasons = [s.strip() for s in (args.seasons or "").split(",") if s.strip()]
+    if args.season:
+        seasons.append(args.season)
+    if not seasons:
+        raise SystemExit("sync-players-roster: provide a season or --seasons")
+    stats = sync_players_roster(sorted(set(seasons)), teams_filter=args.teams, max_concurrency=int(args.max_concurrency), force=bool(args.force))
+    print(f"Finished syncing {stats.total} players across active teams: {stats.describe()}.")
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
     p = subparsers.add_parser("sync-players-roster", help="Import players via NHL roster per team and season")
-    p.add_argument("season", help="Season in YYYYYYYY format, e.g. 20252026")
+    p.add_argument("season", nargs="?", default=None, help="Season in YYYYYYYY format, e.g. 20252026")
+    p.add_argument("--seasons", help="Optional comma-separated seasons to sync in one run (e.g. '20242025,20252026')", default=None)
     p.add_argument("--teams", help="Optional comma-separated triCodes to limit (e.g. 'SEA,VGK')", default=None)
+    p.add_argument("--max-concurrency", type=int, default=8, help="Teams fetched in parallel (default: 8)")
+    p.add_argument("--force", action="store_true", help="Rewrite every row even if its fingerprint is unchanged")
     p.set_defaults(func=_cmd_sync_players_roster)
-
-
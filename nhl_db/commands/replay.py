@@ -0,0 +1,25 @@
+import argparse
+
+from ..replay.server import serve_replay
+
+
+def _cmd_replay_server(args: argparse.Namespace) -> None:
+    serve_replay(
+        args.directory,
+        host=args.host,
+        port=int(args.port),
+        speed=float(args.speed),
+        start_offset=float(args.start_offset),
+        simulate_latency=bool(args.latency),
+    )
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("replay-server", help="Serve API responses recorded with NHL_RECORD_DIR on a local HTTP server")
+    p.add_argument("directory", help="Recording directory (the NHL_RECORD_DIR used while recording)")
+    p.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    p.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier; 10 plays a 3h night in 18 minutes (default: 1)")
+    p.add_argument("--start-offset", type=float, default=0.0, help="Start this many recorded seconds into the recording (default: 0)")
+    p.add_argument("--latency", action="store_true", help="Delay each response by its recorded latency")
+    p.set_defaults(func=_cmd_replay_server)
@@ -4,14 +4,16 @@ from ..services.schedule_service import sync_schedule_dates
 
 
 def _cmd_sync_schedule_dates(args: argparse.Namespace) -> None:
-    total = sync_schedule_dates(args.start, args.end)
-    print(f"Finished upserting {total} games across {args.start}..{args.end}.")
+    stats = sync_schedule_dates(args.start, args.end, max_concurrency=int(args.max_concurrency), force=bool(args.force))
+    print(f"Finished syncing {stats.total} games across {args.start}..{args.end}: {stats.describe()}.")
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
     p = subparsers.add_parser("sync-schedule-dates", help="Import schedule by date range (inclusive)")
     p.add_argument("start", help="YYYY-MM-DD")
     p.add_argument("end", help="YYYY-MM-DD")
+    p.add_argument("--max-concurrency", type=int, default=4, help="Schedule weeks fetched in parallel (default: 4)")
+    p.add_argument("--force", action="store_true", help="Rewrite every row even if its fingerprint is unchanged")
     p.set_defaults(func=_cmd_sync_schedule_dates)
 
 
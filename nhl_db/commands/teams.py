@@ -3,13 +3,14 @@ import argparse
 from ..services.teams_service import sync_teams_records
 
 
-def _cmd_sync_teams_records(_: argparse.Namespace) -> None:
-    count = sync_teams_records()
-    print(f"Upserted {count} teams from Records API.")
+def _cmd_sync_teams_records(args: argparse.Namespace) -> None:
+    stats = sync_teams_records(force=bool(args.force))
+    print(f"Synced {stats.total} teams from Records API: {stats.describe()}.")
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
     p = subparsers.add_parser("sync-teams-records", help="Import teams from Records API franchise endpoint")
+    p.add_argument("--force", action="store_true", help="Rewrite every row even if its fingerprint is unchanged")
     p.set_defaults(func=_cmd_sync_teams_records)
 
 
@@ -9,8 +9,16 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-RECORDS_BASE = "https://records.nhl.com/site/api"
-NHL_WEB_BASE = "https://api-web.nhle.com/v1"
+# API base URLs; override via environment to point the clients at a local stub server
+RECORDS_BASE = os.getenv("RECORDS_BASE", "https://records.nhl.com/site/api")
+NHL_WEB_BASE = os.getenv("NHL_WEB_BASE", "https://api-web.nhle.com/v1")
+
+# Point both APIs at a local replay server (python app.py replay-server), which
+# serves the NHL Web API under /web and the Records API under /records
+NHL_REPLAY_URL = os.getenv("NHL_REPLAY_URL", "").rstrip("/")
+if NHL_REPLAY_URL:
+    NHL_WEB_BASE = f"{NHL_REPLAY_URL}/web"
+    RECORDS_BASE = f"{NHL_REPLAY_URL}/records"
 
 
 def get_env(name: str, default: Optional[str] = None) -> str:
@@ -27,4 +35,43 @@ LIVE_GAMES_POLL_SECONDS = 5
 # Poll every 5 minutes (300 seconds) when there are no live games
 NO_GAMES_POLL_SECONDS = 300
 
+# Maximum number of live games fetched concurrently per watch-live cycle
+LIVE_MAX_CONCURRENCY = 8
+
+# Derive live game fields from the play-by-play payload alone (boxscore only as a
+# fallback) instead of fetching landing + boxscore + play-by-play every poll
+LIVE_SINGLE_ENDPOINT = False
+
+# Per-game poll cadence for watch-live, chosen from each game's own gamecenter state.
+# A running clock uses --poll-seconds (LIVE_GAMES_POLL_SECONDS).
+CRIT_POLL_SECONDS = 3          # gameState CRIT: late in a close game
+SHOOTOUT_POLL_SECONDS = 5      # shootout rounds come quickly
+STOPPAGE_POLL_SECONDS = 10     # clock stopped (reviews, injuries, TV timeouts)
+INTERMISSION_POLL_SECONDS = 60 # between periods; capped by the intermission clock
+
+# How long watch-live trusts its in-memory schedule snapshot before re-fetching it.
+# Live games are tracked from their own gamecenter data in between.
+SCHEDULE_TTL_SECONDS = 15 * 60
+
+# Schedule-aware idling for watch-live (used when no game is live)
+# Wake up this many seconds before the next scheduled puck drop
+PREGAME_LEAD_SECONDS = 120
+
+# Poll interval once a game's start time is within PREGAME_LEAD_SECONDS (or overdue)
+PREGAME_POLL_SECONDS = 15
+
+# Never sleep longer than this while idle, so schedule changes are picked up
+IDLE_MAX_SLEEP_SECONDS = 3 * 60 * 60
+
+# Write-behind stage for watch-live: at most this many games wait to be written
+# (newer snapshots of a pending game replace the older one)
+LIVE_WRITE_MAX_PENDING = 64
+
+# A game whose snapshot fails to write this many times in a row is quarantined:
+# its snapshots are skipped for LIVE_WRITE_QUARANTINE_SECONDS, then tried again
+LIVE_WRITE_MAX_FAILURES = 5
+LIVE_WRITE_QUARANTINE_SECONDS = 300
 
+# On SIGTERM/shutdown, wait this long for pending live writes to be flushed
+# (Heroku kills the dyno 30 seconds after SIGTERM)
+LIVE_WRITE_FLUSH_TIMEOUT_SECONDS = 20
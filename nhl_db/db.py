@@ -1,11 +1,20 @@
-from typing import Any
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from collections import namedtuple
+import logging
+import threading
+import time
 
 import mysql.connector
 
 from .config import get_env
 
+logger = logging.getLogger(__name__)
 
-def get_db_connection():  # type: ignore[no-untyped-def]
+# Prefer the C extension when it is installed; it is substantially faster for executemany
+USE_PURE = not getattr(mysql.connector, "HAVE_CEXT", False)
+
+
+def _connect():  # type: ignore[no-untyped-def]
     return mysql.connector.connect(
         host=get_env("DB_HOST", "127.0.0.1"),
         port=int(get_env("DB_PORT", "3306")),
@@ -13,6 +22,282 @@ def get_db_connection():  # type: ignore[no-untyped-def]
         password=get_env("DB_PASSWORD", ""),
         database=get_env("DB_NAME"),
         autocommit=True,
+        use_pure=USE_PURE,
     )
 
 
+class PooledConnection:
+    """
+    Proxy around a pooled mysql.connector connection.
+
+    Behaves like the underlying connection, except that close() returns it to the
+    pool instead of closing the socket. Server-side prepared statements are cached
+    per connection (see prepared_cursor()).
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw) -> None:  # type: ignore[no-untyped-def]
+        self._pool = pool
+        self._raw = raw
+        self._created_at = time.monotonic()
+        self._last_used_at = self._created_at
+        self._prepared: Dict[str, Any] = {}
+        self._borrowed = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def prepared_cursor(self, sql: str):  # type: ignore[no-untyped-def]
+        """Return a prepared cursor for ``sql``, preparing it on first use on this connection."""
+        cur = self._prepared.get(sql)
+        if cur is None:
+            cur = self._raw.cursor(prepared=True)
+            self._prepared[sql] = cur
+        return cur
+
+    def discard_prepared(self, sql: str) -> None:
+        cur = self._prepared.pop(sql, None)
+        if cur is not None:
+            try:
+                cur.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        if self._borrowed:
+            self._borrowed = False
+            self._pool._release(self)
+
+    def discard(self) -> None:
+        """Close the underlying connection instead of returning it to the pool (e.g. with unread results)."""
+        if self._borrowed:
+            self._borrowed = False
+            self._pool._discard(self)
+
+    def _close_raw(self) -> None:
+        for sql in list(self._prepared):
+            self.discard_prepared(sql)
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe, process-wide pool of MySQL connections.
+
+    - Idle connections are reused most-recently-used first so they stay warm.
+    - Connections older than ``recycle_seconds`` are closed and replaced on checkout.
+    - Connections idle for longer than ``ping_seconds`` are pinged before reuse and
+      replaced if the server has dropped them.
+    - When ``size`` connections are checked out, callers wait up to ``timeout_seconds``.
+    """
+
+    def __init__(self, size: int = 5, recycle_seconds: int = 3600, ping_seconds: int = 30, timeout_seconds: int = 30) -> None:
+        self.size = max(1, int(size))
+        self.recycle_seconds = recycle_seconds
+        self.ping_seconds = ping_seconds
+        self.timeout_seconds = timeout_seconds
+        self._idle: List[PooledConnection] = []
+        self._open = 0
+        self._cond = threading.Condition()
+
+    def get_connection(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout_seconds
+        with self._cond:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"Timed out after {self.timeout_seconds}s waiting for a DB connection (pool size {self.size})")
+                self._cond.wait(remaining)
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._open += 1
+
+        if conn is not None:
+            conn = self._check_health(conn)
+        if conn is None:
+            try:
+                conn = PooledConnection(self, _connect())
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+        conn._borrowed = True
+        return conn
+
+    def _check_health(self, conn: PooledConnection) -> Optional[PooledConnection]:
+        """Return ``conn`` if usable, otherwise close it and return None (its slot stays reserved)."""
+        now = time.monotonic()
+        if now - conn._created_at > self.recycle_seconds:
+            conn._close_raw()
+            return None
+        if now - conn._last_used_at > self.ping_seconds:
+            try:
+                conn._raw.ping(reconnect=False)
+            except Exception as e:
+                logger.warning(f"Discarding dead pooled DB connection: {e}")
+                conn._close_raw()
+                return None
+        return conn
+
+    def _release(self, conn: PooledConnection) -> None:
+        try:
+            if getattr(conn._raw, "in_transaction", False):
+                conn._raw.rollback()
+            usable = True
+        except Exception as e:
+            logger.warning(f"Discarding pooled DB connection on release: {e}")
+            usable = False
+        conn._last_used_at = time.monotonic()
+        with self._cond:
+            if usable:
+                self._idle.append(conn)
+            else:
+                self._open -= 1
+            self._cond.notify()
+        if not usable:
+            conn._close_raw()
+
+    def _discard(self, conn: PooledConnection) -> None:
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+        conn._close_raw()
+
+    def close_all(self) -> None:
+        """Close idle connections; connections still checked out are closed when released."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn._close_raw()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_db_pool() -> ConnectionPool:
+    """
+    Return the process-wide connection pool, creating it on first use.
+
+    Sized and tuned via DB_POOL_SIZE, DB_POOL_RECYCLE_SECONDS, DB_POOL_PING_SECONDS
+    and DB_POOL_TIMEOUT_SECONDS.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                size=int(get_env("DB_POOL_SIZE", "5")),
+                recycle_seconds=int(get_env("DB_POOL_RECYCLE_SECONDS", "3600")),
+                ping_seconds=int(get_env("DB_POOL_PING_SECONDS", "30")),
+                timeout_seconds=int(get_env("DB_POOL_TIMEOUT_SECONDS", "30")),
+            )
+        return _pool
+
+
+def get_db_connection():  # type: ignore[no-untyped-def]
+    """Borrow a connection from the pool. Calling close() on it returns it to the pool."""
+    return get_db_pool().get_connection()
+
+
+def execute_prepared(conn, sql: str, params: Sequence[Any]) -> int:  # type: ignore[no-untyped-def]
+    """
+    Execute ``sql`` as a server-side prepared statement and return the affected row count.
+
+    On pooled connections the prepared statement is cached and reused across calls.
+    """
+    if not isinstance(conn, PooledConnection):
+        cur = conn.cursor(prepared=True)
+        try:
+            cur.execute(sql, tuple(params))
+            return cur.rowcount
+        finally:
+            cur.close()
+    cur = conn.prepared_cursor(sql)
+    try:
+        cur.execute(sql, tuple(params))
+        return cur.rowcount
+    except Exception:
+        conn.discard_prepared(sql)
+        raise
+
+
+def executemany_prepared(conn, sql: str, rows: Sequence[Sequence[Any]]) -> int:  # type: ignore[no-untyped-def]
+    """
+    Execute a prepared statement once per row. Returns the total affected row count.
+
+    One round trip per row: for multi-row INSERTs use cursor.executemany, which
+    the connector rewrites into a single statement.
+    """
+    total = 0
+    for row in rows:
+        total += execute_prepared(conn, sql, row)
+    return total
+
+
+_row_types: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+
+
+def _row_type(name: str, columns: Sequence[str]) -> Any:
+    key = (name, tuple(columns))
+    row_type = _row_types.get(key)
+    if row_type is None:
+        row_type = namedtuple(name, columns, rename=True)  # type: ignore[misc]
+        _row_types[key] = row_type
+    return row_type
+
+
+def iter_query(sql: str, params: Sequence[Any] = (), row_name: str = "Row", chunk_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+    """
+    Stream the rows of a query as namedtuples, ``chunk_size`` rows at a time.
+
+    Uses an unbuffered cursor, so the server streams the result and at most one
+    chunk is held in memory however many rows match; MySQL's equivalent of a
+    server-side cursor. The generator keeps a pooled connection checked out
+    until it is exhausted or closed. A generator abandoned mid-result discards
+    its connection rather than draining the remaining rows.
+
+    The session's net_write_timeout is raised to DB_STREAM_NET_WRITE_TIMEOUT_SECONDS
+    (default: 600) so a slow consumer between chunks does not make the server
+    abort the result, and restored before the connection goes back to the pool.
+    """
+    conn = get_db_connection()
+    finished = False
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT @@SESSION.net_write_timeout")
+            previous_timeout = int(cur.fetchone()[0])
+            cur.execute("SET SESSION net_write_timeout = %s", (int(get_env("DB_STREAM_NET_WRITE_TIMEOUT_SECONDS", "600")),))
+        finally:
+            cur.close()
+        cur = conn.cursor(buffered=False)
+        cur.execute(sql, tuple(params))
+        row_type = _row_type(row_name, cur.column_names)
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row_type._make(row)
+        cur.close()
+        # Later borrowers of this pooled connection must not inherit the streaming timeout
+        cur = conn.cursor()
+        try:
+            cur.execute("SET SESSION net_write_timeout = %s", (previous_timeout,))
+        finally:
+            cur.close()
+        finished = True
+    except Exception as e:
+        logger.error(f"Database error streaming {row_name} rows: {e}", exc_info=True)
+        raise
+    finally:
+        if finished:
+            conn.close()
+        else:
+            # Abandoned mid-result, failed, or the timeout could not be restored
+            conn.discard()
@@ -0,0 +1,22 @@
+import aiomysql
+
+from .config import get_env
+
+
+async def create_async_db_pool(minsize: int = 1, maxsize: int = 10) -> aiomysql.Pool:
+    """
+    Create an aiomysql connection pool using the same DB_* settings as get_db_connection().
+
+    Must be awaited from within a running event loop. Close it with
+    ``pool.close(); await pool.wait_closed()``.
+    """
+    return await aiomysql.create_pool(
+        host=get_env("DB_HOST", "127.0.0.1"),
+        port=int(get_env("DB_PORT", "3306")),
+        user=get_env("DB_USER", "root"),
+        password=get_env("DB_PASSWORD", ""),
+        db=get_env("DB_NAME"),
+        autocommit=True,
+        minsize=max(1, int(minsize)),
+        maxsize=max(1, int(maxsize)),
+    )
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Compare live game fields derived from landing + boxscore against play-by-play only.
+
+Verifies that single-endpoint mode (watch-live --single-endpoint) writes exactly the
+same game fields as the default three-endpoint mode.
+
+Usage:
+    # Record payloads for one or more games into a directory, then compare them
+    python -m nhl_db.debug.compare_live_fields --record payloads/ 2025020076 2025020077
+
+    # Compare every recorded game in a directory (no network access)
+    python -m nhl_db.debug.compare_live_fields --recorded payloads/
+
+Recorded files are named <gameId>_landing.json, <gameId>_boxscore.json and
+<gameId>_play-by-play.json. Exits with status 1 if any game differs.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from nhl_db.clients.nhl_web_client import fetch_game_boxscore, fetch_game_landing, fetch_game_pbp, get_configured_session
+from nhl_db.mappers.games import derive_game_fields_from_gamecenter, derive_game_fields_from_pbp, pbp_needs_boxscore
+
+FIELD_NAMES = ["gameState", "period", "clock", "inIntermission", "homeScore", "awayScore", "homeSOG", "awaySOG"]
+ENDPOINTS = ["landing", "boxscore", "play-by-play"]
+
+
+def record_payloads(directory: Path, game_ids: List[int]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    session = get_configured_session()
+    for game_id in game_ids:
+        payloads = {
+            "landing": fetch_game_landing(game_id, session=session),
+            "boxscore": fetch_game_boxscore(game_id, session=session),
+            "play-by-play": fetch_game_pbp(game_id, session=session),
+        }
+        for endpoint, data in payloads.items():
+            (directory / f"{game_id}_{endpoint}.json").write_text(json.dumps(data), encoding="utf-8")
+        print(f"Recorded payloads for game {game_id}")
+
+
+def load_payloads(directory: Path, game_id: int) -> Dict[str, Dict[str, Any]]:
+    return {
+        endpoint: json.loads((directory / f"{game_id}_{endpoint}.json").read_text(encoding="utf-8"))
+        for endpoint in ENDPOINTS
+    }
+
+
+def compare_game(game_id: int, payloads: Dict[str, Dict[str, Any]]) -> bool:
+    landing, box, pbp = payloads["landing"], payloads["boxscore"], payloads["play-by-play"]
+    expected = derive_game_fields_from_gamecenter(landing, box)
+    # Mirror live_service: the boxscore is only handed over when play-by-play lacks a field
+    actual = derive_game_fields_from_pbp(pbp, box if pbp_needs_boxscore(pbp) else None)
+
+    mismatches = [
+        (name, e, a) for name, e, a in zip(FIELD_NAMES, expected, actual) if e != a
+    ]
+    if mismatches:
+        print(f"[MISMATCH] game {game_id}")
+        for name, e, a in mismatches:
+            print(f"  {name}: landing+boxscore={e!r} play-by-play={a!r}")
+        return False
+    needs_box = " (boxscore fallback used)" if pbp_needs_boxscore(pbp) else ""
+    print(f"[OK] game {game_id}: {dict(zip(FIELD_NAMES, actual))}{needs_box}")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare live game fields: landing+boxscore vs play-by-play only")
+    parser.add_argument("--recorded", help="Directory of recorded payloads to compare")
+    parser.add_argument("--record", help="Fetch the given games and save their payloads to this directory first")
+    parser.add_argument("games", nargs="*", type=int, help="Game IDs (default with --recorded: every recorded game)")
+    args = parser.parse_args()
+
+    directory = Path(args.record or args.recorded or "")
+    if not (args.record or args.recorded):
+        parser.error("one of --record or --recorded is required")
+    if args.record:
+        if not args.games:
+            parser.error("--record needs at least one game ID")
+        record_payloads(directory, args.games)
+
+    game_ids = args.games or sorted({int(p.name.split("_", 1)[0]) for p in directory.glob("*_play-by-play.json")})
+    ok = True
+    for game_id in game_ids:
+        ok = compare_game(game_id, load_payloads(directory, game_id)) and ok
+    print(f"\nCompared {len(game_ids)} game(s): {'all identical' if ok else 'differences found'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -85,3 +85,66 @@ def derive_game_fields_from_gamecenter(landing: Dict[str, Any], box: Dict[str, A
     return (game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog)
 
 
+
+
+def _clock_fields(clock_block: Any, pd: Any) -> Tuple[Optional[str], Optional[bool]]:
+    clock: Optional[str] = None
+    in_intermission: Optional[bool] = None
+    if isinstance(clock_block, dict):
+        in_intermission = clock_block.get("inIntermission")
+        clock = clock_block.get("timeRemaining") or clock_block.get("displayValue") or str(clock_block)
+    elif clock_block is not None:
+        clock = str(clock_block)
+    elif isinstance(pd, dict):
+        tr = pd.get("timeRemaining")
+        if tr is not None:
+            clock = str(tr)
+    return clock, in_intermission
+
+
+def pbp_needs_boxscore(pbp: Dict[str, Any]) -> bool:
+    """True when the play-by-play payload lacks a field that only the boxscore can supply (shots on goal)."""
+    for side in ("homeTeam", "awayTeam"):
+        team = pbp.get(side)
+        if not isinstance(team, dict) or team.get("sog") is None:
+            return True
+    return False
+
+
+def derive_game_fields_from_pbp(pbp: Dict[str, Any], box: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[int], Optional[str], Optional[bool], int, int, int, int]:
+    """
+    Derive the same fields as derive_game_fields_from_gamecenter from a single
+    play-by-play payload, which carries gameState, clock, periodDescriptor and the
+    team scores. ``box`` is only consulted for values the play-by-play lacks.
+    """
+    box = box or {}
+    game_state = pbp.get("gameState") or box.get("gameState")
+
+    period: Optional[int] = None
+    pd = pbp.get("periodDescriptor") or {}
+    if isinstance(pd, dict):
+        pnum = pd.get("number")
+        try:
+            period = int(pnum) if pnum is not None else None
+        except Exception:
+            period = None
+
+    clock, in_intermission = _clock_fields(pbp.get("clock"), pd)
+
+    home = pbp.get("homeTeam") or {}
+    away = pbp.get("awayTeam") or {}
+    box_home = box.get("homeTeam") or {}
+    box_away = box.get("awayTeam") or {}
+
+    def _pick(primary: Dict[str, Any], fallback: Dict[str, Any], key: str) -> int:
+        value = primary.get(key)
+        if value is None:
+            value = fallback.get(key)
+        return _safe_int(value) if value is not None else 0
+
+    home_score = _pick(home, box_home, "score")
+    away_score = _pick(away, box_away, "score")
+    home_sog = _pick(home, box_home, "sog")
+    away_sog = _pick(away, box_away, "sog")
+
+    return (game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog)
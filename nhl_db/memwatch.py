@@ -0,0 +1,175 @@
+from typing import Optional
+
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+from .config import get_env
+
+logger = logging.getLogger(__name__)
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, or None if it cannot be read."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # Not Linux: fall back to the peak RSS (KiB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:
+        return None
+
+
+def release_free_memory() -> None:
+    """Run a full GC and, on glibc, hand freed heap pages back to the OS."""
+    gc.collect()
+    try:
+        import ctypes
+
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception:
+        pass
+
+
+def _mb(n: Optional[int]) -> str:
+    return "n/a" if n is None else f"{n / (1024 * 1024):.1f}MB"
+
+
+class MemoryWatchdog:
+    """
+    Opt-in memory instrumentation for long-running commands (watch-live).
+
+    Every ``interval_seconds`` it samples RSS and, when ``trace_frames`` > 0,
+    takes a tracemalloc snapshot and logs the ``top_n`` allocation sites that grew
+    the most since the previous sample. Once RSS exceeds ``soft_limit_mb``,
+    over_soft_limit() returns True so the caller can reset its sessions, caches
+    and pools in-process; it fires again only after ``reset_cooldown_seconds``.
+
+    Configured from the environment by from_env():
+    NHL_MEMWATCH (1 to enable sampling), NHL_MEMWATCH_INTERVAL_SECONDS (default 300),
+    NHL_MEMWATCH_TRACE_FRAMES (default 1; 0 disables tracemalloc),
+    NHL_MEMWATCH_TOP (default 10) and NHL_MEMORY_SOFT_LIMIT_MB (default 0, off).
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 300,
+        trace_frames: int = 1,
+        top_n: int = 10,
+        soft_limit_mb: float = 0,
+        sample: bool = True,
+        reset_cooldown_seconds: float = 600,
+    ) -> None:
+        self.interval_seconds = max(1.0, float(interval_seconds))
+        self.trace_frames = max(0, int(trace_frames)) if sample else 0
+        self.top_n = max(1, int(top_n))
+        self.soft_limit_bytes = int(float(soft_limit_mb) * 1024 * 1024)
+        self.sample = sample
+        self.reset_cooldown_seconds = reset_cooldown_seconds
+        self.baseline_rss = rss_bytes()
+        self.last_rss = self.baseline_rss
+        self.resets = 0
+        self._last_sample = time.monotonic()
+        self._last_reset: Optional[float] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        if self.trace_frames and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        if self.trace_frames:
+            self._previous = self._take_snapshot()
+
+    @classmethod
+    def from_env(cls, enabled: Optional[bool] = None) -> Optional["MemoryWatchdog"]:
+        """Build a watchdog from the environment; None when neither sampling nor a soft limit is on."""
+        if enabled is None:
+            enabled = get_env("NHL_MEMWATCH", "0").lower() in ("1", "true", "yes")
+        soft_limit_mb = float(get_env("NHL_MEMORY_SOFT_LIMIT_MB", "0"))
+        if not enabled and soft_limit_mb <= 0:
+            return None
+        return cls(
+            interval_seconds=float(get_env("NHL_MEMWATCH_INTERVAL_SECONDS", "300")),
+            trace_frames=int(get_env("NHL_MEMWATCH_TRACE_FRAMES", "1")),
+            top_n=int(get_env("NHL_MEMWATCH_TOP", "10")),
+            soft_limit_mb=soft_limit_mb,
+            sample=enabled,
+        )
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        snapshot = tracemalloc.take_snapshot()
+        # Ignore tracemalloc's own bookkeeping and import machinery
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def maybe_sample(self) -> None:
+        """Sample RSS (and allocation growth) if the interval has elapsed; cheap otherwise."""
+        now = time.monotonic()
+        if now - self._last_sample < self.interval_seconds:
+            return
+        self._last_sample = now
+        self.last_rss = rss_bytes()
+        if not self.sample:
+            return
+        growth = None
+        if self.last_rss is not None and self.baseline_rss is not None:
+            growth = self.last_rss - self.baseline_rss
+        traced = ""
+        if self.trace_frames:
+            current, peak = tracemalloc.get_traced_memory()
+            traced = f" | traced {_mb(current)} (peak {_mb(peak)})"
+        sign = "+" if growth is not None and growth >= 0 else ""
+        logger.info(f"memwatch: RSS {_mb(self.last_rss)} ({sign}{_mb(growth)} since start){traced}")
+        if self.trace_frames:
+            self._log_growth()
+
+    def _log_growth(self) -> None:
+        snapshot = self._take_snapshot()
+        if self._previous is not None:
+            stats = snapshot.compare_to(self._previous, "traceback" if self.trace_frames > 1 else "lineno")
+            growing = [s for s in stats if s.size_diff > 0][:self.top_n]
+            for stat in growing:
+                where = " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in stat.traceback)
+                logger.info(
+                    f"memwatch: +{stat.size_diff / 1024:.1f}KiB (+{stat.count_diff} blocks, "
+                    f"{stat.size / 1024:.1f}KiB total) at {where}"
+                )
+        self._previous = snapshot
+
+    def over_soft_limit(self) -> bool:
+        """
+        True when RSS is above the soft limit and no reset happened within the cooldown.
+
+        Checks RSS on every call, which costs a single small /proc read.
+        """
+        if self.soft_limit_bytes <= 0:
+            return False
+        if self._last_reset is not None and time.monotonic() - self._last_reset < self.reset_cooldown_seconds:
+            return False
+        rss = rss_bytes()
+        if rss is None or rss < self.soft_limit_bytes:
+            return False
+        logger.warning(f"memwatch: RSS {_mb(rss)} is above the soft limit of {_mb(self.soft_limit_bytes)}; resetting")
+        return True
+
+    def after_reset(self) -> None:
+        """Record a completed reset, release freed memory and log the effect."""
+        before = rss_bytes()
+        release_free_memory()
+        after = rss_bytes()
+        self.resets += 1
+        self._last_reset = time.monotonic()
+        if self.trace_frames:
+            # Start diffing from the post-reset heap
+            self._previous = self._take_snapshot()
+        logger.warning(f"memwatch: reset #{self.resets} done; RSS {_mb(before)} -> {_mb(after)}")
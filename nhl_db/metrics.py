@@ -0,0 +1,283 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .config import get_env
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from sub-millisecond mapping work to slow HTTP calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def items(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for values, total in sorted(self.items().items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {total:g}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with optional labels.
+
+    observe() is a bisect and three additions under a lock, cheap enough for the
+    per-game hot path.
+    """
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+                self._series[label_values] = series
+            series[0][i] += 1
+            series[1][0] += value
+            series[1][1] += 1
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def snapshot(self) -> Dict[LabelValues, Tuple[List[int], float, int]]:
+        with self._lock:
+            return {k: (list(b), s[0], int(s[1])) for k, (b, s) in self._series.items()}
+
+    def quantile(self, q: float, *label_values: str) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        series = self.snapshot().get(label_values)
+        if series is None or series[2] == 0:
+            return None
+        return _bucket_quantile(self.buckets, series[0], series[2], q)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total, count) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, values, ('le', f'{bound:g}'))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, values, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, values)} {total:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, values)} {count}")
+        return lines
+
+
+class Gauge:
+    """Last-value gauge with optional labels; series can be removed, which keeps per-entity gauges bounded."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def remove(self, *label_values: str) -> None:
+        with self._lock:
+            self._values.pop(label_values, None)
+
+    def items(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for values, value in sorted(self.items().items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {value:.6f}")
+        return lines
+
+
+def _bucket_quantile(buckets: Sequence[float], counts: List[int], count: int, q: float) -> float:
+    rank = q * count
+    cumulative = 0
+    for bound, n in zip(buckets, counts):
+        cumulative += n
+        if cumulative >= rank:
+            return bound
+    return float("inf")
+
+
+# Pipeline stages: schedule_fetch, fetch_<endpoint>, json_decode, map_plays,
+# db_update_game, db_seed_digest, db_upsert_plays, db_delete_plays, db_commit,
+# db_write_cycle, sleep, idle_sleep
+STAGE_SECONDS = Histogram("nhl_stage_seconds", "Time spent per pipeline stage", labels=("stage",))
+GAME_CYCLE_SECONDS = Histogram("nhl_game_cycle_seconds", "Per-game poll time from the start of the game's own fetch until its snapshot is queued for writing")
+# One series per watched game, removed once the game is no longer watched
+GAME_LAST_CYCLE_SECONDS = Gauge("nhl_game_last_cycle_seconds", "Latest per-game poll time (see nhl_game_cycle_seconds) of each watched game", labels=("game",))
+HTTP_RESPONSES = Counter("nhl_http_responses_total", "HTTP responses by endpoint and status code", labels=("endpoint", "status"))
+HTTP_RETRIES = Counter("nhl_http_retries_total", "Requests retried by the HTTP client before the final response", labels=("endpoint",))
+ROWS_WRITTEN = Counter("nhl_rows_written_total", "Rows written by table and operation", labels=("table", "operation"))
+PLAYS_MAPPED = Counter("nhl_plays_mapped_total", "Plays mapped with map_play")
+WRITE_CYCLES = Counter("nhl_write_cycles_total", "Live write cycles by outcome", labels=("outcome",))
+COALESCED_SNAPSHOTS = Counter("nhl_coalesced_snapshots_total", "Pending game snapshots replaced by a newer one before being written")
+GAME_WRITE_FAILURES = Counter(
+    "nhl_game_write_failures_total",
+    "Live game snapshots rolled back to their savepoint, by what happened next (retry, quarantine, skipped)",
+    labels=("outcome",),
+)
+
+REGISTRY: List[object] = [
+    STAGE_SECONDS,
+    GAME_CYCLE_SECONDS,
+    GAME_LAST_CYCLE_SECONDS,
+    HTTP_RESPONSES,
+    HTTP_RETRIES,
+    ROWS_WRITTEN,
+    PLAYS_MAPPED,
+    WRITE_CYCLES,
+    COALESCED_SNAPSHOTS,
+    GAME_WRITE_FAILURES,
+]
+
+
+def register(metric: object) -> None:
+    """Add a metric (anything with a render() -> List[str] method) to the Prometheus output."""
+    if metric not in REGISTRY:
+        REGISTRY.append(metric)
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())  # type: ignore[attr-defined]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # type: ignore[no-untyped-def]
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve Prometheus text metrics on http://<host>:<port>/metrics from a daemon thread.
+
+    The port defaults to NHL_METRICS_PORT; 0 (the default) disables the endpoint.
+    Calling it again returns the already running server.
+    """
+    global _server
+    if _server is not None:
+        return _server
+    if port is None:
+        port = int(get_env("NHL_METRICS_PORT", "0"))
+    if port <= 0:
+        return None
+    _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+    return _server
+
+
+class SummaryLogger:
+    """Logs a one-line summary of the metrics every ``interval_seconds`` (0 disables it)."""
+
+    def __init__(self, interval_seconds: Optional[float] = None) -> None:
+        if interval_seconds is None:
+            interval_seconds = float(get_env("NHL_METRICS_SUMMARY_SECONDS", "60"))
+        self.interval_seconds = interval_seconds
+        self._last = time.monotonic()
+
+    def maybe_log(self) -> None:
+        if self.interval_seconds <= 0 or time.monotonic() - self._last < self.interval_seconds:
+            return
+        self._last = time.monotonic()
+        logger.info(f"metrics: {summary_line()}")
+
+
+def summary_line() -> str:
+    """Compact per-stage count / mean / p95 plus HTTP and write totals."""
+    parts: List[str] = []
+    for (stage,), (counts, total, count) in sorted(STAGE_SECONDS.snapshot().items()):
+        if count:
+            p95 = _bucket_quantile(STAGE_SECONDS.buckets, counts, count, 0.95)
+            parts.append(f"{stage}={count}x{total / count * 1000:.1f}ms(p95<={p95 * 1000:g}ms)")
+    cycle = GAME_CYCLE_SECONDS.snapshot().get(())
+    if cycle and cycle[2]:
+        parts.append(f"game_cycle={cycle[2]}x{cycle[1] / cycle[2] * 1000:.1f}ms")
+    by_status: Dict[str, float] = {}
+    for (_, status), n in HTTP_RESPONSES.items().items():
+        by_status[status] = by_status.get(status, 0) + n
+    if by_status:
+        parts.append("http=" + ",".join(f"{s}:{n:g}" for s, n in sorted(by_status.items())))
+    retries = sum(HTTP_RETRIES.items().values())
+    if retries:
+        parts.append(f"retries={retries:g}")
+    rows = sorted(ROWS_WRITTEN.items().items())
+    if rows:
+        parts.append("rows=" + ",".join(f"{t}.{op}:{n:g}" for (t, op), n in rows))
+    return " ".join(parts) or "no samples yet"
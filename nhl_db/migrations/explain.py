@@ -0,0 +1,104 @@
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import logging
+from datetime import datetime
+
+from ..db import get_db_connection
+from ..repositories.games_repo import (
+    SELECT_GAME_BY_ID_SQL,
+    SELECT_GAME_IDS_BY_SEASON_SQL,
+    SELECT_GAMES_BY_SEASON_SQL,
+    SELECT_GAMES_IN_UTC_RANGE_SQL,
+)
+from ..repositories.players_repo import SELECT_PLAYER_BY_ID_SQL, SELECT_PLAYERS_BY_TEAM_SQL
+from ..repositories.plays_repo import (
+    SELECT_PLAY_IDS_BY_GAME_SQL,
+    SELECT_PLAY_STATS_IN_GAME_ID_RANGE_SQL,
+    SELECT_PLAYS_BY_GAME_SQL,
+    SELECT_PLAYS_IN_GAME_ID_RANGE_SQL,
+)
+from ..repositories.teams_repo import SELECT_ACTIVE_TEAMS_SQL
+
+logger = logging.getLogger(__name__)
+
+# (name, SQL, sample parameters) for each filtered repository read. Unfiltered
+# reads such as get_all_teams are full scans by design and are not listed.
+REPOSITORY_QUERIES: List[Tuple[str, str, Tuple[Any, ...]]] = [
+    ("games_repo.get_games_by_date", SELECT_GAMES_IN_UTC_RANGE_SQL, (datetime(2025, 10, 14, 4), datetime(2025, 10, 15, 4))),
+    ("games_repo.get_game_by_id", SELECT_GAME_BY_ID_SQL, (2025020001,)),
+    ("games_repo.get_game_ids_by_season", SELECT_GAME_IDS_BY_SEASON_SQL + " AND gameType IN (%s) ORDER BY gameId", (20252026, 2)),
+    ("games_repo.iter_games_by_season", SELECT_GAMES_BY_SEASON_SQL, (20252026,)),
+    ("plays_repo.get_plays_by_game", SELECT_PLAYS_BY_GAME_SQL, (2025020001,)),
+    ("plays_repo.iter_plays_by_season", SELECT_PLAYS_IN_GAME_ID_RANGE_SQL, (2025000000, 2026000000)),
+    ("plays_repo.get_play_stats_by_season", SELECT_PLAY_STATS_IN_GAME_ID_RANGE_SQL, (2025000000, 2026000000)),
+    ("plays_repo.get_play_ids_by_game", SELECT_PLAY_IDS_BY_GAME_SQL, (2025020001,)),
+    ("players_repo.get_players_by_team", SELECT_PLAYERS_BY_TEAM_SQL, (10,)),
+    ("players_repo.get_player_by_id", SELECT_PLAYER_BY_ID_SQL, (8478402,)),
+    ("teams_repo.get_active_teams", SELECT_ACTIVE_TEAMS_SQL, ()),
+]
+
+
+class ExplainResult(NamedTuple):
+    name: str
+    status: str  # "ok", "warn" or "fail"
+    detail: str
+
+
+def _judge(plan: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Classify an EXPLAIN plan.
+
+    A table read with access type ALL and no candidate index fails. A scan with a
+    candidate index only warns: on small or empty tables the optimizer prefers
+    scanning, which says nothing about production plans.
+    """
+    status = "ok"
+    details: List[str] = []
+    for row in plan:
+        table = row.get("table")
+        access = row.get("type")
+        key = row.get("key")
+        extra = row.get("Extra") or ""
+        if access is None:
+            # Optimized away, e.g. "no matching row in const table"
+            details.append(f"{table}: {extra or 'no table access'}")
+            continue
+        if access == "ALL":
+            if row.get("possible_keys"):
+                status = "fail" if status == "fail" else "warn"
+                details.append(f"{table}: full scan although {row['possible_keys']} could be used (small table?)")
+            else:
+                status = "fail"
+                details.append(f"{table}: full scan, no usable index")
+            continue
+        note = f"{table}: {access} via {key}"
+        if "Using filesort" in extra:
+            note += " (filesort)"
+        details.append(note)
+    return status, "; ".join(details)
+
+
+def explain_query_with_conn(conn, sql: str, params: Tuple[Any, ...]) -> List[Dict[str, Any]]:  # type: ignore[no-untyped-def]
+    cur = conn.cursor(dictionary=True)
+    try:
+        cur.execute("EXPLAIN " + sql, params)
+        return cur.fetchall()
+    finally:
+        cur.close()
+
+
+def check_repository_queries() -> List[ExplainResult]:
+    """EXPLAIN each query in REPOSITORY_QUERIES and report whether it uses an index."""
+    results: List[ExplainResult] = []
+    conn = get_db_connection()
+    try:
+        for name, sql, params in REPOSITORY_QUERIES:
+            try:
+                status, detail = _judge(explain_query_with_conn(conn, sql, params))
+            except Exception as e:
+                logger.error(f"EXPLAIN failed for {name}: {e}", exc_info=True)
+                status, detail = "fail", f"EXPLAIN failed: {e}"
+            results.append(ExplainResult(name, status, detail))
+    finally:
+        conn.close()
+    return results
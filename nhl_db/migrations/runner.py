@@ -0,0 +1,260 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import hashlib
+import logging
+import re
+import time
+from pathlib import Path
+
+from ..db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = Path(__file__).parent / "versions"
+
+CREATE_SCHEMA_MIGRATIONS_SQL = (
+    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+    "migrationVersion INT NOT NULL, "
+    "migrationName VARCHAR(255) NOT NULL, "
+    "migrationChecksum CHAR(40) NOT NULL, "
+    "migrationDurationMs INT NOT NULL DEFAULT 0, "
+    "migrationAppliedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+    "PRIMARY KEY (migrationVersion)"
+    ")"
+)
+
+SELECT_APPLIED_MIGRATIONS_SQL = "SELECT migrationVersion, migrationName, migrationChecksum FROM schema_migrations"
+
+INSERT_SCHEMA_MIGRATION_SQL = (
+    "INSERT INTO schema_migrations (migrationVersion, migrationName, migrationChecksum, migrationDurationMs) "
+    "VALUES (%s, %s, %s, %s)"
+)
+
+# Serializes concurrent `migrate` runs (e.g. a release phase racing a one-off dyno)
+MIGRATION_LOCK_NAME = "nhl_db.schema_migrations"
+
+# MySQL errors meaning the change is already in place (added by hand or by an older script):
+# 1060 duplicate column, 1061 duplicate key name, 1091 can't drop (does not exist)
+ALREADY_APPLIED_ERRNOS = (1060, 1061, 1091)
+# 1845 / 1846: the requested ALGORITHM / LOCK is not supported for this ALTER
+ONLINE_DDL_UNSUPPORTED_ERRNOS = (1845, 1846)
+
+_ONLINE_CLAUSE_RE = re.compile(r",\s*(ALGORITHM\s*=\s*\w+|LOCK\s*=\s*\w+)", re.IGNORECASE)
+_FILENAME_RE = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def label(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    def checksum(self) -> str:
+        return hashlib.sha1(self.sql().encode("utf-8")).hexdigest()
+
+    def statements(self) -> List[str]:
+        """The file's statements, without comment lines, split on trailing semicolons."""
+        lines = [line for line in self.sql().splitlines() if not line.strip().startswith("--")]
+        return [s.strip() for s in re.split(r";\s*(?:\n|$)", "\n".join(lines)) if s.strip()]
+
+
+def load_migrations(directory: Path = VERSIONS_DIR) -> List[Migration]:
+    """
+    Migrations in ``directory``, named NNNN_description.sql, in version order.
+
+    Raises:
+        ValueError: If a file name does not match or two files share a version.
+    """
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            raise ValueError(f"Migration file {path.name} must be named NNNN_description.sql")
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Migrations {migrations[version].path.name} and {path.name} share version {version}")
+        migrations[version] = Migration(version, match.group(2), path)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def ensure_schema_migrations_table(conn) -> None:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(CREATE_SCHEMA_MIGRATIONS_SQL)
+        except Exception as e:
+            logger.error(f"Database error creating schema_migrations table: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def get_applied_migrations_with_conn(conn) -> Dict[int, Tuple[str, str]]:  # type: ignore[no-untyped-def]
+    """Applied migrations as version -> (name, checksum)."""
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(SELECT_APPLIED_MIGRATIONS_SQL)
+            return {int(row[0]): (row[1], row[2]) for row in cur.fetchall()}
+        except Exception as e:
+            logger.error(f"Database error reading schema_migrations: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def _execute_statement(cur, statement: str, allow_locking: bool) -> None:  # type: ignore[no-untyped-def]
+    try:
+        cur.execute(statement)
+    except Exception as e:
+        errno = getattr(e, "errno", None)
+        if errno in ALREADY_APPLIED_ERRNOS:
+            print(f"    already in place ({e}); skipping")
+            return
+        if errno in ONLINE_DDL_UNSUPPORTED_ERRNOS and _ONLINE_CLAUSE_RE.search(statement):
+            if not allow_locking:
+                raise RuntimeError(
+                    f"MySQL cannot run this change online ({e}). Re-run with --allow-locking "
+                    f"during a quiet period to apply it with a table lock."
+                ) from e
+            print(f"    online DDL not supported ({e}); retrying with the server's default algorithm and lock")
+            cur.execute(_ONLINE_CLAUSE_RE.sub("", statement))
+            return
+        raise
+
+
+def apply_migration_with_conn(conn, migration: Migration, allow_locking: bool = False) -> int:  # type: ignore[no-untyped-def]
+    """
+    Run a migration's statements and record it in schema_migrations.
+
+    DDL commits implicitly in MySQL, so a migration that fails halfway is not
+    rolled back; keep one schema change per migration file. Statements whose
+    change already exists (duplicate index or column) are skipped.
+
+    Returns:
+        Duration in milliseconds.
+    """
+    started = time.perf_counter()
+    cur = conn.cursor()
+    try:
+        for statement in migration.statements():
+            print(f"    {statement}")
+            _execute_statement(cur, statement, allow_locking)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        cur.execute(INSERT_SCHEMA_MIGRATION_SQL, (migration.version, migration.name, migration.checksum(), duration_ms))
+        conn.commit()
+        return duration_ms
+    except Exception as e:
+        logger.error(f"Migration {migration.label} failed: {e}", exc_info=True)
+        raise
+    finally:
+        cur.close()
+
+
+def _acquire_lock(conn, timeout_seconds: int) -> None:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK_NAME, timeout_seconds))
+        row = cur.fetchone()
+    finally:
+        cur.close()
+    if not row or row[0] != 1:
+        raise RuntimeError(f"Another migrate run holds the {MIGRATION_LOCK_NAME} lock")
+
+
+def _release_lock(conn) -> None:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+        cur.fetchone()
+    except Exception as e:
+        logger.warning(f"Failed to release migration lock: {e}")
+    finally:
+        cur.close()
+
+
+def migration_status() -> List[Tuple[Migration, Optional[str]]]:
+    """
+    Every known migration with its state: None if pending, "applied", or
+    "applied (modified since)" when the file changed after it was applied.
+    """
+    conn = get_db_connection()
+    try:
+        ensure_schema_migrations_table(conn)
+        applied = get_applied_migrations_with_conn(conn)
+    finally:
+        conn.close()
+    result: List[Tuple[Migration, Optional[str]]] = []
+    for migration in load_migrations():
+        entry = applied.get(migration.version)
+        if entry is None:
+            result.append((migration, None))
+        elif entry[1] != migration.checksum():
+            result.append((migration, "applied (modified since)"))
+        else:
+            result.append((migration, "applied"))
+    return result
+
+
+def migrate(target: Optional[int] = None, dry_run: bool = False, allow_locking: bool = False, lock_wait_timeout: int = 10) -> List[Migration]:
+    """
+    Apply pending migrations in version order, up to and including ``target``.
+
+    Index and column changes are written with ALGORITHM=INPLACE, LOCK=NONE so
+    reads and writes continue while they build. Even an online ALTER briefly
+    needs an exclusive metadata lock; ``lock_wait_timeout`` (seconds) bounds how
+    long it waits behind running queries, so a long query makes the migration
+    fail instead of stalling every other query queued behind the ALTER.
+
+    Args:
+        target: Highest version to apply. None applies everything.
+        dry_run: Only print the pending migrations and their statements.
+        allow_locking: Retry changes MySQL cannot run online without the
+                       ALGORITHM/LOCK clause (the table may be locked while they run).
+        lock_wait_timeout: Session lock_wait_timeout for the DDL, in seconds.
+
+    Returns:
+        Migrations applied (or, with dry_run, that would be applied).
+    """
+    conn = get_db_connection()
+    try:
+        ensure_schema_migrations_table(conn)
+        _acquire_lock(conn, timeout_seconds=30)
+        try:
+            applied = get_applied_migrations_with_conn(conn)
+            pending = [
+                m for m in load_migrations()
+                if m.version not in applied and (target is None or m.version <= target)
+            ]
+            if not pending:
+                print("Schema is up to date.")
+                return []
+            if dry_run:
+                for migration in pending:
+                    print(f"Pending {migration.label}:")
+                    for statement in migration.statements():
+                        print(f"    {statement}")
+                return pending
+
+            cur = conn.cursor()
+            try:
+                cur.execute("SET SESSION lock_wait_timeout = %s", (int(lock_wait_timeout),))
+            finally:
+                cur.close()
+            done: List[Migration] = []
+            for migration in pending:
+                print(f"Applying {migration.label}...")
+                duration_ms = apply_migration_with_conn(conn, migration, allow_locking=allow_locking)
+                print(f"  done in {duration_ms} ms")
+                done.append(migration)
+            return done
+        finally:
+            _release_lock(conn)
+    finally:
+        conn.close()
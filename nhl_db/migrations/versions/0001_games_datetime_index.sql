@@ -0,0 +1,4 @@
+-- Index for get_games_by_date / get_games_by_date_range, which filter on a half-open
+-- UTC range of the bare gameDateTimeUtc column.
+
+ALTER TABLE games ADD INDEX idx_games_gameDateTimeUtc (gameDateTimeUtc), ALGORITHM=INPLACE, LOCK=NONE;
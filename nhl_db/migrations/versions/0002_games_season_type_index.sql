@@ -0,0 +1,4 @@
+-- Index for get_game_ids_by_season (backfill-plays), which filters on gameSeason and,
+-- optionally, gameType.
+
+ALTER TABLE games ADD INDEX idx_games_gameSeason_gameType (gameSeason, gameType), ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,5 @@
+-- Index for get_plays_by_game: playGameId filters, (playPeriod, playIndex) matches its
+-- ORDER BY so the rows come back in index order without a filesort. Also serves the
+-- playId lookups per game used by watch-live and the play digest.
+
+ALTER TABLE plays ADD INDEX idx_plays_game_period_index (playGameId, playPeriod, playIndex), ALGORITHM=INPLACE, LOCK=NONE;
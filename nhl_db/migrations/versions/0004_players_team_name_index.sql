@@ -0,0 +1,3 @@
+-- Index for get_players_by_team: playerTeamId filters, the name columns match its ORDER BY.
+
+ALTER TABLE players ADD INDEX idx_players_team_name (playerTeamId, playerLastName, playerFirstName), ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,3 @@
+-- Index for get_active_teams (WHERE teamIsActive = TRUE ORDER BY teamName).
+
+ALTER TABLE teams ADD INDEX idx_teams_active_name (teamIsActive, teamName), ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,6 @@
+-- plays.playFirstSeenUtc, written by watch-live --persist-first-seen: when a play first
+-- appeared in a fetched play-by-play payload (UTC, ms precision), so feed-to-database
+-- freshness can be analysed per play in SQL. Nullable: plays loaded by other commands,
+-- or before a game was first observed, have none.
+
+ALTER TABLE plays ADD COLUMN playFirstSeenUtc DATETIME(3) NULL, ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,188 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# pstats function key: (filename, line number, function name)
+FuncKey = Tuple[str, int, str]
+
+# Categories for the wall-time breakdown, checked in order against a function's
+# file name (or, for built-ins, its name). The first match wins.
+CATEGORY_RULES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("sleep", ("time.sleep",)),
+    ("json", ("/json/", "_json", "orjson", "ujson")),
+    ("mapping", ("nhl_db/mappers/",)),
+    ("db", ("mysql/connector", "mysql\\connector", "_mysql_connector", "aiomysql", "pymysql", "nhl_db/repositories/", "nhl_db/db.py", "nhl_db/db_async.py")),
+    ("http", ("requests/", "urllib3/", "http/client.py", "aiohttp/", "nhl_db/clients/")),
+    ("wait", ("threading.py", "queue.py", "concurrent/futures/", "selectors.py")),
+]
+
+# Low-level modules shared by HTTP and DB code; their time belongs to whoever called them
+NEUTRAL_MARKERS = ("socket.py", "ssl.py")
+
+BREAKDOWN_ORDER = ["http", "json", "mapping", "db", "sleep", "other"]
+
+
+def _category(func: FuncKey) -> Optional[str]:
+    filename, _, name = func
+    text = (filename + " " + name).replace("\\", "/")
+    for category, markers in CATEGORY_RULES:
+        if any(m in text for m in markers):
+            return category
+    if filename == "~" or any(m in text for m in NEUTRAL_MARKERS):
+        return None
+    return "other"
+
+
+def wall_time_breakdown(stats: pstats.Stats, max_depth: int = 6) -> Dict[str, float]:
+    """
+    Split profiled self-time into http / json / mapping / db / sleep / wait / other.
+
+    Built-ins and low-level socket/ssl code have no category of their own; their
+    self-time is split across their callers (in proportion to the time spent per
+    caller) and classified there, up to ``max_depth`` levels up. A blocking
+    recv() therefore counts as HTTP when urllib3 called it and as DB when
+    mysql-connector did.
+    """
+    raw: Dict[FuncKey, Tuple[int, int, float, float, Dict[FuncKey, Tuple[int, int, float, float]]]] = stats.stats  # type: ignore[attr-defined]
+    totals: Dict[str, float] = {}
+
+    def attribute(func: FuncKey, seconds: float, depth: int) -> None:
+        category = _category(func)
+        if category is None and depth < max_depth:
+            callers = raw.get(func, (0, 0, 0.0, 0.0, {}))[4]
+            weights = {caller: max(entry[2], 0.0) for caller, entry in callers.items()}
+            total_weight = sum(weights.values())
+            if total_weight > 0:
+                for caller, weight in weights.items():
+                    attribute(caller, seconds * weight / total_weight, depth + 1)
+                return
+        totals[category or "other"] = totals.get(category or "other", 0.0) + seconds
+
+    for func, (_, _, tottime, _, _) in raw.items():
+        if tottime > 0:
+            attribute(func, tottime, 0)
+    return totals
+
+
+class ProfileSession:
+    """
+    Deterministic (cProfile) profile of a command, including its worker threads.
+
+    cProfile only sees the thread it is enabled in, so while the session is
+    active every new threading.Thread runs under its own profiler; all profiles
+    are merged into one pstats.Stats at the end. Threads still running when the
+    command returns (idle pool workers, daemon threads) contribute what they
+    recorded so far.
+    """
+
+    def __init__(self) -> None:
+        self._main = cProfile.Profile()
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._original_run: Optional[Callable[..., Any]] = None
+        self.wall_seconds = 0.0
+        self._started = 0.0
+
+    def __enter__(self) -> "ProfileSession":
+        session = self
+        original_run = threading.Thread.run
+        self._original_run = original_run
+
+        def profiled_run(thread_self: threading.Thread) -> None:
+            profile = cProfile.Profile()
+            with session._lock:
+                session._thread_profiles.append(profile)
+            profile.enable()
+            try:
+                original_run(thread_self)
+            finally:
+                profile.disable()
+
+        threading.Thread.run = profiled_run  # type: ignore[method-assign]
+        self._started = time.perf_counter()
+        self._main.enable()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._main.disable()
+        self.wall_seconds = time.perf_counter() - self._started
+        if self._original_run is not None:
+            threading.Thread.run = self._original_run  # type: ignore[method-assign]
+
+    def stats(self, stream: Optional[io.StringIO] = None) -> pstats.Stats:
+        stats = pstats.Stats(self._main, stream=stream or io.StringIO())
+        with self._lock:
+            profiles = list(self._thread_profiles)
+        for profile in profiles:
+            try:
+                stats.add(profile)
+            except Exception:
+                # Nothing recorded in that thread (yet)
+                continue
+        return stats
+
+
+def write_reports(session: ProfileSession, prefix: Path, sort: str = "cumulative", limit: int = 60) -> Tuple[Path, Path, str]:
+    """
+    Write ``<prefix>.prof`` (loadable with pstats / snakeviz) and a sorted ``<prefix>.txt`` report.
+
+    Returns:
+        (stats file, text report, time breakdown)
+    """
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    prof_path = prefix.with_suffix(".prof")
+    txt_path = prefix.with_suffix(".txt")
+
+    stats = session.stats()
+    stats.dump_stats(str(prof_path))
+
+    out = io.StringIO()
+    report = pstats.Stats(str(prof_path), stream=out)
+    report.strip_dirs()
+    breakdown = format_breakdown(wall_time_breakdown(stats), session.wall_seconds)
+    out.write(breakdown + "\n\n")
+    for key in [sort] + [k for k in ("tottime",) if k != sort]:
+        out.write(f"===== Top {limit} by {key} =====\n")
+        report.sort_stats(key).print_stats(limit)
+    txt_path.write_text(out.getvalue(), encoding="utf-8")
+    return prof_path, txt_path, breakdown
+
+
+def format_breakdown(totals: Dict[str, float], wall_seconds: float) -> str:
+    busy = sum(v for k, v in totals.items() if k != "wait")
+    lines = [f"Time breakdown ({busy:.2f}s busy across all threads, {wall_seconds:.2f}s wall):"]
+    for category in BREAKDOWN_ORDER:
+        seconds = totals.get(category, 0.0)
+        share = seconds / busy * 100 if busy > 0 else 0.0
+        lines.append(f"  {category:<8} {seconds:8.2f}s  {share:5.1f}%")
+    if totals.get("wait"):
+        lines.append(f"  (idle threads waiting on locks/queues: {totals['wait']:.2f}s, excluded)")
+    return "\n".join(lines)
+
+
+def run_profiled(func: Callable[[Any], Any], args: Any, command: str, directory: str = "profiles", sort: str = "cumulative") -> Any:
+    """
+    Run ``func(args)`` under ProfileSession and write its reports to ``directory``.
+
+    Reports are written even if the command raises or is interrupted.
+    """
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    prefix = Path(directory) / f"{command}-{stamp}"
+    session = ProfileSession()
+    try:
+        with session:
+            return func(args)
+    finally:
+        prof_path, txt_path, breakdown = write_reports(session, prefix, sort=sort)
+        print(breakdown, file=sys.stderr)
+        print(f"Profile written to {prof_path} (report: {txt_path})", file=sys.stderr)
@@ -0,0 +1,210 @@
+from typing import Dict, List, Optional, Tuple
+
+import bisect
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from ..clients.recorder import API_NAMES, recording_relpath
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_PREFIX = "web/schedule/"
+
+
+class RecordedTimeline:
+    """All recorded bodies of one URL, ordered by capture time."""
+
+    def __init__(self, path: Path) -> None:
+        self.times: List[float] = []
+        self.latencies: List[float] = []
+        self.bodies: List[bytes] = []
+        self.etags: List[str] = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                body = json.dumps(entry.get("body"), separators=(",", ":")).encode("utf-8")
+                self.times.append(float(entry["t"]))
+                self.latencies.append(float(entry.get("elapsed_ms") or 0) / 1000.0)
+                self.bodies.append(body)
+                self.etags.append('"' + hashlib.sha1(body).hexdigest()[:16] + '"')
+        # Recordings appended by several runs are not guaranteed to be in order
+        order = sorted(range(len(self.times)), key=self.times.__getitem__)
+        self.times = [self.times[i] for i in order]
+        self.latencies = [self.latencies[i] for i in order]
+        self.bodies = [self.bodies[i] for i in order]
+        self.etags = [self.etags[i] for i in order]
+
+    def at(self, t: float) -> int:
+        """Index of the snapshot current at recording time ``t`` (the first one before it starts)."""
+        return max(0, bisect.bisect_right(self.times, t) - 1)
+
+
+class ReplayStore:
+    """
+    A recording directory (see clients.recorder) served on a virtual clock.
+
+    The clock starts at the earliest capture time in the recording, plus
+    ``start_offset`` seconds, and advances ``speed`` times faster than real
+    time. Each request is answered with the snapshot of its URL that was current
+    at that virtual time, so recorded games play out in accelerated time.
+    Timelines are loaded lazily on first request.
+    """
+
+    def __init__(self, directory: str, speed: float = 1.0, start_offset: float = 0.0) -> None:
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise ValueError(f"recording directory {directory} does not exist")
+        self.speed = max(0.0, float(speed))
+        self._timelines: Dict[str, RecordedTimeline] = {}
+        self._lock = threading.Lock()
+        self.recording_start = self._earliest_capture_time() + float(start_offset)
+        self._started = time.monotonic()
+
+    def _earliest_capture_time(self) -> float:
+        earliest: Optional[float] = None
+        for path in self.directory.glob("*/**/*.jsonl"):
+            with open(path, "r", encoding="utf-8") as f:
+                first = f.readline().strip()
+            if not first:
+                continue
+            # The recorder writes "body" last, so the header fields parse without decoding it
+            t = float(json.loads(first.split(',"body":', 1)[0] + "}")["t"])
+            earliest = t if earliest is None else min(earliest, t)
+        if earliest is None:
+            raise ValueError(f"no recordings found in {self.directory}")
+        return earliest
+
+    def now(self) -> float:
+        """Current virtual time, on the recording's wall clock."""
+        return self.recording_start + (time.monotonic() - self._started) * self.speed
+
+    def _timeline(self, relpath: str) -> Optional[RecordedTimeline]:
+        with self._lock:
+            timeline = self._timelines.get(relpath)
+            if timeline is not None:
+                return timeline
+            path = self.directory / relpath
+            if not path.is_file():
+                return None
+            timeline = RecordedTimeline(path)
+            self._timelines[relpath] = timeline
+            return timeline
+
+    def _nearest_schedule(self, relpath: str) -> Optional[str]:
+        """
+        Fall back to the recorded schedule week closest to the requested date.
+
+        watch-live asks for the schedule relative to today, which never matches the
+        date a night was recorded on.
+        """
+        requested = relpath[len(SCHEDULE_PREFIX):-len(".jsonl")]
+        candidates = sorted(p.relative_to(self.directory).as_posix() for p in (self.directory / SCHEDULE_PREFIX).glob("*.jsonl"))
+        if not candidates:
+            return None
+        return min(candidates, key=lambda c: (abs(_days_between(c[len(SCHEDULE_PREFIX):-len(".jsonl")], requested)), c))
+
+    def lookup(self, api: str, relative_url: str) -> Optional[Tuple[bytes, str, float]]:
+        """
+        Find the body to serve for a request.
+
+        Returns:
+            (body, etag, recorded latency in seconds), or None if nothing was recorded.
+        """
+        relpath = recording_relpath(api, relative_url)
+        timeline = self._timeline(relpath)
+        if timeline is None and relpath.startswith(SCHEDULE_PREFIX):
+            fallback = self._nearest_schedule(relpath)
+            if fallback is not None:
+                timeline = self._timeline(fallback)
+        if timeline is None or not timeline.times:
+            return None
+        i = timeline.at(self.now())
+        return timeline.bodies[i], timeline.etags[i], timeline.latencies[i]
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "virtualTime": self.now(),
+            "recordingStart": self.recording_start,
+            "speed": self.speed,
+            "loadedTimelines": len(self._timelines),
+        }
+
+
+def _days_between(a: str, b: str) -> int:
+    try:
+        return (date.fromisoformat(a) - date.fromisoformat(b)).days
+    except ValueError:
+        return 10 ** 6
+
+
+def make_handler(store: ReplayStore, simulate_latency: bool = False):  # type: ignore[no-untyped-def]
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path == "/_replay/status":
+                self._send(200, json.dumps(store.status()).encode("utf-8"))
+                return
+
+            api, _, rest = self.path.lstrip("/").partition("/")
+            if api not in API_NAMES:
+                self._send(404, b'{"error":"unknown API prefix"}')
+                return
+            found = store.lookup(api, "/" + rest)
+            if found is None:
+                self._send(404, b'{"error":"not recorded"}')
+                return
+            body, etag, latency = found
+            if simulate_latency and latency > 0:
+                time.sleep(latency)
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, None, etag)
+                return
+            self._send(200, body, etag)
+
+        def _send(self, status: int, body: Optional[bytes], etag: Optional[str] = None) -> None:
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            if body is not None:
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+            else:
+                self.send_header("Content-Length", "0")
+            self.end_headers()
+            if body is not None:
+                self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # type: ignore[no-untyped-def]
+            logger.debug(f"{self.address_string()} {format % args}")
+
+    return ReplayHandler
+
+
+def serve_replay(directory: str, host: str = "127.0.0.1", port: int = 8765, speed: float = 1.0, start_offset: float = 0.0, simulate_latency: bool = False) -> None:
+    """
+    Serve a recording directory over HTTP until interrupted.
+
+    The NHL Web API is served under /web and the Records API under /records;
+    point the clients at it with NHL_REPLAY_URL=http://<host>:<port>.
+    """
+    store = ReplayStore(directory, speed=speed, start_offset=start_offset)
+    server = ThreadingHTTPServer((host, port), make_handler(store, simulate_latency=simulate_latency))
+    server.daemon_threads = True
+    print(f"Replaying {directory} at {speed}x on http://{host}:{port}")
+    print(f"Point the clients at it with: NHL_REPLAY_URL=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping replay server...")
+    finally:
+        server.server_close()
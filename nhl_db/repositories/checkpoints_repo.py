@@ -0,0 +1,72 @@
+from typing import List, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CREATE_BACKFILL_CHECKPOINTS_SQL = (
+    "CREATE TABLE IF NOT EXISTS backfill_checkpoints ("
+    "checkpointJob VARCHAR(64) NOT NULL, "
+    "checkpointGameId INT NOT NULL, "
+    "checkpointRowCount INT NOT NULL DEFAULT 0, "
+    "checkpointCompletedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+    "PRIMARY KEY (checkpointJob, checkpointGameId)"
+    ")"
+)
+
+
+def ensure_backfill_checkpoints_table(conn) -> None:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(CREATE_BACKFILL_CHECKPOINTS_SQL)
+        except Exception as e:
+            logger.error(f"Database error creating backfill_checkpoints table: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def get_completed_game_ids_with_conn(conn, job: str) -> Set[int]:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute("SELECT checkpointGameId FROM backfill_checkpoints WHERE checkpointJob = %s", (job,))
+            return {int(row[0]) for row in cur.fetchall()}
+        except Exception as e:
+            logger.error(f"Database error fetching checkpoints for job {job}: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def mark_games_completed_with_conn(conn, job: str, items: List[Tuple[int, int]]) -> None:  # type: ignore[no-untyped-def]
+    """Record (gameId, rowCount) pairs as completed for a job."""
+    if not items:
+        return
+    sql = (
+        "INSERT INTO backfill_checkpoints (checkpointJob, checkpointGameId, checkpointRowCount) "
+        "VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE checkpointRowCount=VALUES(checkpointRowCount), checkpointCompletedAt=CURRENT_TIMESTAMP"
+    )
+    cur = conn.cursor()
+    try:
+        try:
+            cur.executemany(sql, [(job, game_id, count) for game_id, count in items])
+        except Exception as e:
+            logger.error(f"Database error recording {len(items)} checkpoints for job {job}: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def clear_checkpoints_with_conn(conn, job: str) -> int:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute("DELETE FROM backfill_checkpoints WHERE checkpointJob = %s", (job,))
+            return cur.rowcount
+        except Exception as e:
+            logger.error(f"Database error clearing checkpoints for job {job}: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
@@ -0,0 +1,183 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CREATE_ROW_FINGERPRINTS_SQL = (
+    "CREATE TABLE IF NOT EXISTS row_fingerprints ("
+    "fingerprintTable VARCHAR(32) NOT NULL, "
+    "fingerprintRowId BIGINT NOT NULL, "
+    "fingerprintHash CHAR(40) NOT NULL, "
+    "fingerprintRowChecksum CHAR(32) NULL, "
+    "fingerprintUpdatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP, "
+    "PRIMARY KEY (fingerprintTable, fingerprintRowId)"
+    ")"
+)
+
+# Tables created before fingerprints were checked against the target rows
+ADD_ROW_CHECKSUM_COLUMN_SQL = "ALTER TABLE row_fingerprints ADD COLUMN fingerprintRowChecksum CHAR(32) NULL AFTER fingerprintHash"
+
+SELECT_STORED_FINGERPRINTS_SQL = (
+    "SELECT fingerprintRowId, fingerprintHash, fingerprintRowChecksum FROM row_fingerprints "
+    "WHERE fingerprintTable = %s AND fingerprintRowId IN"
+)
+
+UPSERT_FINGERPRINTS_SQL = (
+    "INSERT INTO row_fingerprints (fingerprintTable, fingerprintRowId, fingerprintHash, fingerprintRowChecksum) "
+    "VALUES (%s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE fingerprintHash=VALUES(fingerprintHash), fingerprintRowChecksum=VALUES(fingerprintRowChecksum)"
+)
+
+# Keep IN (...) lists well below max_allowed_packet
+_ID_CHUNK_SIZE = 1000
+
+_table_ready = False
+_table_lock = threading.Lock()
+
+
+class UpsertStats(NamedTuple):
+    """Outcome of a fingerprinted batch upsert."""
+
+    unchanged: int = 0
+    inserted: int = 0
+    updated: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.unchanged + self.inserted + self.updated
+
+    def __add__(self, other: "UpsertStats") -> "UpsertStats":  # type: ignore[override]
+        return UpsertStats(self.unchanged + other.unchanged, self.inserted + other.inserted, self.updated + other.updated)
+
+    def describe(self) -> str:
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
+
+def row_fingerprint(row: Sequence[Any]) -> str:
+    """Stable SHA-1 of a mapper output row."""
+    return hashlib.sha1(json.dumps(list(row), default=str, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def _ensure_table(conn) -> None:  # type: ignore[no-untyped-def]
+    global _table_ready
+    with _table_lock:
+        if _table_ready:
+            return
+        cur = conn.cursor()
+        try:
+            cur.execute(CREATE_ROW_FINGERPRINTS_SQL)
+            cur.execute(
+                "SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+                "AND TABLE_NAME = 'row_fingerprints' AND COLUMN_NAME = 'fingerprintRowChecksum'"
+            )
+            if not cur.fetchone()[0]:
+                logger.info("Adding fingerprintRowChecksum to row_fingerprints; every row is rewritten once")
+                cur.execute(ADD_ROW_CHECKSUM_COLUMN_SQL)
+        finally:
+            cur.close()
+        _table_ready = True
+
+
+def _select_in_chunks(conn, sql_prefix: str, leading_params: Tuple[Any, ...], ids: List[int]) -> List[Tuple[Any, ...]]:  # type: ignore[no-untyped-def]
+    out: List[Tuple[Any, ...]] = []
+    cur = conn.cursor()
+    try:
+        for start in range(0, len(ids), _ID_CHUNK_SIZE):
+            chunk = ids[start:start + _ID_CHUNK_SIZE]
+            cur.execute(f"{sql_prefix} ({', '.join(['%s'] * len(chunk))})", (*leading_params, *chunk))
+            out.extend(cur.fetchall())
+    finally:
+        cur.close()
+    return out
+
+
+def _row_checksum_sql(table: str, id_column: str, columns: Sequence[str]) -> str:
+    # MD5 of the row's synced columns as computed by the server; JSON_ARRAY keeps
+    # NULLs and types distinct, so any write to one of them changes the checksum
+    return f"SELECT {id_column}, MD5(JSON_ARRAY({', '.join(columns)})) FROM {table} WHERE {id_column} IN"
+
+
+def _row_checksums(conn, table: str, id_column: str, columns: Sequence[str], ids: List[int]) -> Dict[int, str]:  # type: ignore[no-untyped-def]
+    return {
+        int(row_id): str(checksum)
+        for row_id, checksum in _select_in_chunks(conn, _row_checksum_sql(table, id_column, columns), (), ids)
+    }
+
+
+def upsert_changed_rows_with_conn(
+    conn,  # type: ignore[no-untyped-def]
+    table: str,
+    id_column: str,
+    columns: Sequence[str],
+    rows: List[Tuple[Any, ...]],
+    upsert: Callable[[Any, List[Tuple[Any, ...]]], None],
+    force: bool = False,
+) -> UpsertStats:
+    """
+    Upsert only the rows whose fingerprint differs from the one stored for them.
+
+    Each row's first element is its primary key in ``table``. Rows are hashed and
+    compared against row_fingerprints; changed rows are passed to ``upsert`` and
+    their new fingerprints stored, all in one transaction. Changed rows whose ID
+    is not yet in ``table`` are counted as inserted, the rest as updated.
+
+    A stored fingerprint is only trusted while the row it describes is unchanged:
+    with it, row_fingerprints keeps a server-side checksum of the row's ``columns``
+    as written. A row that was deleted, recreated, or changed since by a writer
+    that does not keep fingerprints (the live game updates, manual edits) fails
+    that check and is written again.
+
+    Args:
+        columns: The columns of ``table`` that ``upsert`` writes
+        force: Ignore stored fingerprints and write every row.
+    """
+    if not rows:
+        return UpsertStats()
+    _ensure_table(conn)
+
+    # Last row wins when a batch contains the same ID twice
+    by_id: Dict[int, Tuple[Any, ...]] = {int(row[0]): row for row in rows}
+    hashes = {row_id: row_fingerprint(row) for row_id, row in by_id.items()}
+    ids = list(by_id)
+
+    # Doubles as the existence check for every row
+    current = _row_checksums(conn, table, id_column, columns, ids)
+    stored: Dict[int, Tuple[str, Optional[str]]] = {}
+    if not force:
+        for row_id, fp, checksum in _select_in_chunks(conn, SELECT_STORED_FINGERPRINTS_SQL, (table,), ids):
+            stored[int(row_id)] = (str(fp), checksum)
+
+    changed_ids = [
+        row_id for row_id in ids
+        if row_id not in current or stored.get(row_id) != (hashes[row_id], current[row_id])
+    ]
+    if not changed_ids:
+        return UpsertStats(unchanged=len(ids))
+
+    started = not getattr(conn, "in_transaction", False)
+    if started:
+        conn.start_transaction()
+    try:
+        upsert(conn, [by_id[row_id] for row_id in changed_ids])
+        written = _row_checksums(conn, table, id_column, columns, changed_ids)
+        cur = conn.cursor()
+        try:
+            cur.executemany(
+                UPSERT_FINGERPRINTS_SQL,
+                [(table, row_id, hashes[row_id], written.get(row_id)) for row_id in changed_ids],
+            )
+        finally:
+            cur.close()
+        if started:
+            conn.commit()
+    except Exception as e:
+        if started:
+            conn.rollback()
+        logger.error(f"Database error upserting {len(changed_ids)} changed rows into {table}: {e}", exc_info=True)
+        raise
+
+    inserted = sum(1 for row_id in changed_ids if row_id not in current)
+    return UpsertStats(unchanged=len(ids) - len(changed_ids), inserted=inserted, updated=len(changed_ids) - inserted)
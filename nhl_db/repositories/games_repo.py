@@ -1,36 +1,40 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 import pytz
 
-from ..db import get_db_connection
+from ..db import execute_prepared, get_db_connection, iter_query
+from .fingerprints_repo import UpsertStats, upsert_changed_rows_with_conn
 
 logger = logging.getLogger(__name__)
 
+# Columns written by UPSERT_GAMES_SQL, checksummed to validate stored row fingerprints
+UPSERT_GAMES_COLUMNS = ("gameId", "gameSeason", "gameType", "gameDateTimeUtc", "gameVenue", "gameHomeTeamId", "gameAwayTeamId", "gameState", "gameHomeScore", "gameAwayScore")
 
-def upsert_games(rows: List[Tuple[Any, ...]]) -> None:
+UPSERT_GAMES_SQL = (
+    "INSERT INTO games (gameId, gameSeason, gameType, gameDateTimeUtc, gameVenue, gameHomeTeamId, gameAwayTeamId, "
+    "gameState, gameHomeScore, gameAwayScore) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE gameSeason=VALUES(gameSeason), gameType=VALUES(gameType), gameDateTimeUtc=VALUES(gameDateTimeUtc), "
+    "gameVenue=VALUES(gameVenue), gameHomeTeamId=VALUES(gameHomeTeamId), gameAwayTeamId=VALUES(gameAwayTeamId), "
+    "gameState=VALUES(gameState), gameHomeScore=VALUES(gameHomeScore), gameAwayScore=VALUES(gameAwayScore)"
+)
+
+UPDATE_GAME_FIELDS_SQL = (
+    "UPDATE games SET gameState=%s, gamePeriod=%s, gameClock=%s, gameInIntermission=%s, gameHomeScore=%s, gameAwayScore=%s, "
+    "gameHomeSOG=%s, gameAwaySOG=%s WHERE gameId=%s"
+)
+
+
+def upsert_games(rows: List[Tuple[Any, ...]], force: bool = False) -> UpsertStats:
+    """Upsert schedule game rows, skipping rows whose fingerprint is unchanged (unless force)."""
     if not rows:
-        return
-    sql = (
-        "INSERT INTO games (gameId, gameSeason, gameType, gameDateTimeUtc, gameVenue, gameHomeTeamId, gameAwayTeamId, "
-        "gameState, gameHomeScore, gameAwayScore) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE gameSeason=VALUES(gameSeason), gameType=VALUES(gameType), gameDateTimeUtc=VALUES(gameDateTimeUtc), "
-        "gameVenue=VALUES(gameVenue), gameHomeTeamId=VALUES(gameHomeTeamId), gameAwayTeamId=VALUES(gameAwayTeamId), "
-        "gameState=VALUES(gameState), gameHomeScore=VALUES(gameHomeScore), "
-        "gameAwayScore=VALUES(gameAwayScore)"
-    )
+        return UpsertStats()
     conn = get_db_connection()
     try:
-        cur = conn.cursor()
-        try:
-            cur.executemany(sql, rows)
-        except Exception as e:
-            logger.error(f"Database error upserting {len(rows)} games: {e}", exc_info=True)
-            raise
-        finally:
-            cur.close()
+        return upsert_changed_rows_with_conn(conn, "games", "gameId", UPSERT_GAMES_COLUMNS, rows, upsert_games_with_conn, force=force)
     finally:
         conn.close()
 
@@ -69,14 +73,7 @@ def update_game_fields(game_id: int, game_state: Optional[str], period: Optional
 def upsert_games_with_conn(conn, rows: List[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
     if not rows:
         return
-    sql = (
-        "INSERT INTO games (gameId, gameSeason, gameType, gameDateTimeUtc, gameVenue, gameHomeTeamId, gameAwayTeamId, "
-        "gameState, gameHomeScore, gameAwayScore) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE gameSeason=VALUES(gameSeason), gameType=VALUES(gameType), gameDateTimeUtc=VALUES(gameDateTimeUtc), "
-        "gameVenue=VALUES(gameVenue), gameHomeTeamId=VALUES(gameHomeTeamId), gameAwayTeamId=VALUES(gameAwayTeamId), "
-        "gameState=VALUES(gameState), gameHomeScore=VALUES(gameHomeScore), gameAwayScore=VALUES(gameAwayScore)"
-    )
+    sql = UPSERT_GAMES_SQL
     cur = conn.cursor()
     try:
         try:
@@ -89,15 +86,75 @@ def upsert_games_with_conn(conn, rows: List[Tuple[Any, ...]]) -> None:  # type:
 
 
 def update_game_fields_with_conn(conn, game_id: int, game_state: Optional[str], period: Optional[int], clock: Optional[str], in_intermission: bool, home_score: int, away_score: int, home_sog: int, away_sog: int) -> None:  # type: ignore[no-untyped-def]
-    sql = (
-        "UPDATE games SET gameState=%s, gamePeriod=%s, gameClock=%s, gameInIntermission=%s, gameHomeScore=%s, gameAwayScore=%s, "
-        "gameHomeSOG=%s, gameAwaySOG=%s WHERE gameId=%s"
-    )
-    cur = conn.cursor()
+    # Hot path for watch-live: runs as a cached server-side prepared statement
+    try:
+        execute_prepared(
+            conn,
+            UPDATE_GAME_FIELDS_SQL,
+            (
+                game_state,
+                period,
+                clock,
+                in_intermission,
+                home_score,
+                away_score,
+                home_sog,
+                away_sog,
+                game_id,
+            ),
+        )
+    except Exception as e:
+        logger.error(f"Database error updating game fields with connection for game_id={game_id}: {e}", exc_info=True)
+        raise
+
+
+SELECT_GAME_IDS_BY_SEASON_SQL = "SELECT gameId FROM games WHERE gameSeason = %s"
+
+
+def get_game_ids_by_season(season: int, game_types: Optional[List[int]] = None, states: Optional[List[str]] = None) -> List[int]:
+    """Fetch gameIds for a season, optionally limited to game types and game states."""
+    sql = SELECT_GAME_IDS_BY_SEASON_SQL
+    params: List[Any] = [season]
+    if game_types:
+        sql += f" AND gameType IN ({', '.join(['%s'] * len(game_types))})"
+        params.extend(game_types)
+    if states:
+        sql += f" AND gameState IN ({', '.join(['%s'] * len(states))})"
+        params.extend(states)
+    sql += " ORDER BY gameId"
+    conn = get_db_connection()
     try:
+        cur = conn.cursor()
         try:
-            cur.execute(
-                sql,
+            cur.execute(sql, tuple(params))
+            return [int(row[0]) for row in cur.fetchall()]
+        except Exception as e:
+            logger.error(f"Database error fetching game ids for season {season}: {e}", exc_info=True)
+            raise
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+async def upsert_games_async(conn, rows: List[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
+    """Async variant of upsert_games_with_conn for an aiomysql connection."""
+    if not rows:
+        return
+    async with conn.cursor() as cur:
+        try:
+            await cur.executemany(UPSERT_GAMES_SQL, rows)
+        except Exception as e:
+            logger.error(f"Database error upserting {len(rows)} games (async): {e}", exc_info=True)
+            raise
+
+
+async def update_game_fields_async(conn, game_id: int, game_state: Optional[str], period: Optional[int], clock: Optional[str], in_intermission: bool, home_score: int, away_score: int, home_sog: int, away_sog: int) -> None:  # type: ignore[no-untyped-def]
+    """Async variant of update_game_fields_with_conn for an aiomysql connection."""
+    async with conn.cursor() as cur:
+        try:
+            await cur.execute(
+                UPDATE_GAME_FIELDS_SQL,
                 (
                     game_state,
                     period,
@@ -111,10 +168,85 @@ def update_game_fields_with_conn(conn, game_id: int, game_state: Optional[str],
                 ),
             )
         except Exception as e:
-            logger.error(f"Database error updating game fields with connection for game_id={game_id}: {e}", exc_info=True)
+            logger.error(f"Database error updating game fields (async) for game_id={game_id}: {e}", exc_info=True)
             raise
+
+
+GAMES_WITH_TEAMS_SELECT = (
+    "SELECT g.gameId, g.gameSeason, g.gameType, g.gameDateTimeUtc, g.gameVenue, "
+    "g.gameHomeTeamId, g.gameAwayTeamId, g.gameState, g.gamePeriod, g.gameClock, "
+    "g.gameHomeScore, g.gameAwayScore, g.gameHomeSOG, g.gameAwaySOG, "
+    "ht.teamName as homeTeamName, ht.teamAbbrev as homeTeamAbbrev, "
+    "at.teamName as awayTeamName, at.teamAbbrev as awayTeamAbbrev "
+    "FROM games g "
+    "JOIN teams ht ON g.gameHomeTeamId = ht.teamId "
+    "JOIN teams at ON g.gameAwayTeamId = at.teamId "
+)
+
+# Half-open UTC range on the bare column, so idx_games_gameDateTimeUtc can serve it
+# (see nhl_db/migrations/versions/0001_games_datetime_index.sql)
+SELECT_GAMES_IN_UTC_RANGE_SQL = (
+    GAMES_WITH_TEAMS_SELECT
+    + "WHERE g.gameDateTimeUtc >= %s AND g.gameDateTimeUtc < %s "
+    "ORDER BY g.gameDateTimeUtc"
+)
+
+
+@lru_cache(maxsize=4096)
+def _local_midnight_utc(timezone: str, date: str) -> datetime:
+    """
+    UTC instant (naive, like gameDateTimeUtc) at which ``date`` starts in ``timezone``.
+
+    Memoized per (timezone, date): a date's bounds never change. If midnight is
+    skipped by a DST change the day starts at the transition; if it occurs twice
+    the day starts at the first one.
+    """
+    tz = pytz.timezone(timezone)
+    midnight = datetime.strptime(date, "%Y-%m-%d")
+    try:
+        local = tz.localize(midnight, is_dst=None)
+    except pytz.exceptions.AmbiguousTimeError:
+        local = tz.localize(midnight, is_dst=True)
+    except pytz.exceptions.NonExistentTimeError:
+        local = tz.localize(midnight, is_dst=False)
+    return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def local_dates_utc_window(start_date: str, end_date: str, timezone: str = "UTC") -> Tuple[datetime, datetime]:
+    """
+    Half-open UTC range [start, end) covering local dates ``start_date``..``end_date`` inclusive.
+
+    Each edge uses the UTC offset in effect at that local midnight, so a range
+    spanning a DST change is 23 or 25 hours longer or shorter as it should be.
+    An unknown timezone falls back to UTC.
+
+    Args:
+        start_date: First local date (YYYY-MM-DD)
+        end_date: Last local date (YYYY-MM-DD), inclusive
+        timezone: IANA timezone string
+
+    Returns:
+        (start, end) as naive UTC datetimes
+    """
+    day_after = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    try:
+        return _local_midnight_utc(timezone, start_date), _local_midnight_utc(timezone, day_after)
+    except pytz.exceptions.UnknownTimeZoneError:
+        logger.error(f"Unknown timezone {timezone}; falling back to UTC")
+        return _local_midnight_utc("UTC", start_date), _local_midnight_utc("UTC", day_after)
+
+
+def _select_games_in_utc_range(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        try:
+            cur.execute(SELECT_GAMES_IN_UTC_RANGE_SQL, (start, end))
+            return cur.fetchall()
+        finally:
+            cur.close()
     finally:
-        cur.close()
+        conn.close()
 
 
 def get_games_by_date(date: str, timezone: str = "UTC") -> List[Dict[str, Any]]:
@@ -128,77 +260,77 @@ def get_games_by_date(date: str, timezone: str = "UTC") -> List[Dict[str, Any]]:
     Returns:
         List of game dictionaries with team information
     """
-    logger.info(f"=== get_games_by_date called with date={date}, timezone={timezone} ===")
-    
-    # Convert IANA timezone to UTC offset for MySQL
+    start, end = local_dates_utc_window(date, date, timezone)
     try:
-        tz = pytz.timezone(timezone)
-        # Use a date in the middle of the target date to get the correct offset
-        # (handles DST correctly)
-        target_date = datetime.strptime(date, "%Y-%m-%d")
-        localized_date = tz.localize(target_date.replace(hour=12))
-        offset_seconds = localized_date.utcoffset().total_seconds()
-        offset_hours = int(offset_seconds / 3600)
-        offset_minutes = int((abs(offset_seconds) % 3600) / 60)
-        
-        # Format as MySQL timezone offset: '+HH:MM' or '-HH:MM'
-        if offset_seconds >= 0:
-            tz_offset = f"+{offset_hours:02d}:{offset_minutes:02d}"
-        else:
-            tz_offset = f"{offset_hours:03d}:{offset_minutes:02d}"
-        
-        logger.info(f"Converting timezone {timezone} to offset {tz_offset} for date {date}")
+        results = _select_games_in_utc_range(start, end)
     except Exception as e:
-        logger.error(f"Error converting timezone {timezone}: {e}", exc_info=True)
-        tz_offset = "+00:00"  # Fallback to UTC
+        logger.error(f"Database error fetching games for date {date} in timezone {timezone}: {e}", exc_info=True)
+        raise
+    logger.info(f"Found {len(results)} games for date {date} in timezone {timezone} (UTC {start} to {end})")
+    return results
+
+
+def get_games_by_date_range(start_date: str, end_date: str, timezone: str = "UTC") -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch the games of several consecutive local dates with one query, e.g. for a calendar view.
+    
+    Args:
+        start_date: First date in YYYY-MM-DD format
+        end_date: Last date in YYYY-MM-DD format (inclusive)
+        timezone: IANA timezone string
     
-    sql = """
-        SELECT g.gameId, g.gameSeason, g.gameType, g.gameDateTimeUtc, g.gameVenue,
-               g.gameHomeTeamId, g.gameAwayTeamId, g.gameState, g.gamePeriod, g.gameClock,
-               g.gameHomeScore, g.gameAwayScore, g.gameHomeSOG, g.gameAwaySOG,
-               ht.teamName as homeTeamName, ht.teamAbbrev as homeTeamAbbrev,
-               at.teamName as awayTeamName, at.teamAbbrev as awayTeamAbbrev
-        FROM games g
-        JOIN teams ht ON g.gameHomeTeamId = ht.teamId
-        JOIN teams at ON g.gameAwayTeamId = at.teamId
-        WHERE DATE(CONVERT_TZ(g.gameDateTimeUtc, '+00:00', %s)) = %s
-        ORDER BY g.gameDateTimeUtc
+    Returns:
+        Dict of local date (YYYY-MM-DD) -> game dictionaries in start time order;
+        every date in the range is present, with an empty list if it has no games
     """
-    conn = get_db_connection()
+    start, end = local_dates_utc_window(start_date, end_date, timezone)
     try:
-        cur = conn.cursor(dictionary=True)
-        try:
-            cur.execute(sql, (tz_offset, date))
-            results = cur.fetchall()
-            logger.info(f"Found {len(results)} games for date {date} in timezone {timezone} (offset {tz_offset})")
-            return results
-        except Exception as e:
-            logger.error(f"Database error fetching games for date {date} in timezone {timezone}: {e}", exc_info=True)
-            raise
-        finally:
-            cur.close()
-    finally:
-        conn.close()
+        results = _select_games_in_utc_range(start, end)
+    except Exception as e:
+        logger.error(f"Database error fetching games for {start_date}..{end_date} in timezone {timezone}: {e}", exc_info=True)
+        raise
+
+    try:
+        tz = pytz.timezone(timezone)
+    except pytz.exceptions.UnknownTimeZoneError:
+        tz = pytz.utc
+    by_date: Dict[str, List[Dict[str, Any]]] = {}
+    day = datetime.strptime(start_date, "%Y-%m-%d")
+    last = datetime.strptime(end_date, "%Y-%m-%d")
+    while day <= last:
+        by_date[day.strftime("%Y-%m-%d")] = []
+        day += timedelta(days=1)
+    for row in results:
+        local_date = pytz.utc.localize(row["gameDateTimeUtc"]).astimezone(tz).strftime("%Y-%m-%d")
+        by_date.setdefault(local_date, []).append(row)
+    logger.info(f"Found {len(results)} games for {start_date}..{end_date} in timezone {timezone}")
+    return by_date
+
+
+def iter_games_by_date(date: str, timezone: str = "UTC", chunk_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+    """Stream the games of a local date as GameRow namedtuples (same columns and order as get_games_by_date)."""
+    start, end = local_dates_utc_window(date, date, timezone)
+    return iter_query(SELECT_GAMES_IN_UTC_RANGE_SQL, (start, end), row_name="GameRow", chunk_size=chunk_size)
+
+
+SELECT_GAMES_BY_SEASON_SQL = GAMES_WITH_TEAMS_SELECT + "WHERE g.gameSeason = %s ORDER BY g.gameId"
+
+
+def iter_games_by_season(season: int, chunk_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+    """Stream every game of a season, with team names, as GameRow namedtuples ordered by gameId."""
+    return iter_query(SELECT_GAMES_BY_SEASON_SQL, (season,), row_name="GameRow", chunk_size=chunk_size)
+
+
+SELECT_GAME_BY_ID_SQL = GAMES_WITH_TEAMS_SELECT + "WHERE g.gameId = %s"
 
 
 def get_game_by_id(game_id: int) -> Optional[Dict[str, Any]]:
     """Fetch a single game by ID with team details."""
-    sql = """
-        SELECT g.gameId, g.gameSeason, g.gameType, g.gameDateTimeUtc, g.gameVenue,
-               g.gameHomeTeamId, g.gameAwayTeamId, g.gameState, g.gamePeriod, g.gameClock,
-               g.gameHomeScore, g.gameAwayScore, g.gameHomeSOG, g.gameAwaySOG,
-               ht.teamName as homeTeamName, ht.teamAbbrev as homeTeamAbbrev,
-               at.teamName as awayTeamName, at.teamAbbrev as awayTeamAbbrev
-        FROM games g
-        JOIN teams ht ON g.gameHomeTeamId = ht.teamId
-        JOIN teams at ON g.gameAwayTeamId = at.teamId
-        WHERE g.gameId = %s
-    """
     conn = get_db_connection()
     try:
         cur = conn.cursor(dictionary=True)
         try:
-            cur.execute(sql, (game_id,))
+            cur.execute(SELECT_GAME_BY_ID_SQL, (game_id,))
             return cur.fetchone()
         except Exception as e:
             logger.error(f"Database error fetching game {game_id}: {e}", exc_info=True)
@@ -1,50 +1,70 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
-from ..db import get_db_connection
+from ..db import get_db_connection, iter_query
+from .fingerprints_repo import UpsertStats, upsert_changed_rows_with_conn
 
 logger = logging.getLogger(__name__)
 
+# Columns written by UPSERT_PLAYERS_SQL, checksummed to validate stored row fingerprints
+UPSERT_PLAYERS_COLUMNS = (
+    "playerId", "playerTeamId", "playerFirstName", "playerLastName", "playerNumber",
+    "playerPosition", "playerHeadshotUrl", "playerHomeCity", "playerHomeCountry", "playerIsActive",
+)
 
-def upsert_players(rows: List[Tuple[Any, ...]]) -> None:
+UPSERT_PLAYERS_SQL = (
+    "INSERT INTO players (playerId, playerTeamId, playerFirstName, playerLastName, playerNumber, "
+    "playerPosition, playerHeadshotUrl, playerHomeCity, playerHomeCountry, playerIsActive) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE playerTeamId=VALUES(playerTeamId), playerFirstName=VALUES(playerFirstName), "
+    "playerLastName=VALUES(playerLastName), playerNumber=VALUES(playerNumber), playerPosition=VALUES(playerPosition), "
+    "playerHeadshotUrl=VALUES(playerHeadshotUrl), playerHomeCity=VALUES(playerHomeCity), playerHomeCountry=VALUES(playerHomeCountry), playerIsActive=VALUES(playerIsActive)"
+)
+
+
+def upsert_players(rows: List[Tuple[Any, ...]], force: bool = False) -> UpsertStats:
+    """Upsert player rows in one transaction, skipping rows whose fingerprint is unchanged (unless force)."""
     if not rows:
-        return
-    sql = (
-        "INSERT INTO players (playerId, playerTeamId, playerFirstName, playerLastName, playerNumber, "
-        "playerPosition, playerHeadshotUrl, playerHomeCity, playerHomeCountry, playerIsActive) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE playerTeamId=VALUES(playerTeamId), playerFirstName=VALUES(playerFirstName), "
-        "playerLastName=VALUES(playerLastName), playerNumber=VALUES(playerNumber), playerPosition=VALUES(playerPosition), "
-        "playerHeadshotUrl=VALUES(playerHeadshotUrl), playerHomeCity=VALUES(playerHomeCity), playerHomeCountry=VALUES(playerHomeCountry), playerIsActive=VALUES(playerIsActive)"
-    )
+        return UpsertStats()
     conn = get_db_connection()
     try:
-        cur = conn.cursor()
-        try:
-            cur.executemany(sql, rows)
-        except Exception as e:
-            logger.error(f"Database error upserting {len(rows)} players: {e}", exc_info=True)
-            raise
-        finally:
-            cur.close()
+        return upsert_changed_rows_with_conn(conn, "players", "playerId", UPSERT_PLAYERS_COLUMNS, rows, upsert_players_with_conn, force=force)
     finally:
         conn.close()
 
 
+def upsert_players_with_conn(conn, rows: List[Tuple[Any, ...]], chunk_size: int = 1000) -> None:  # type: ignore[no-untyped-def]
+    if not rows:
+        return
+    cur = conn.cursor()
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                cur.executemany(UPSERT_PLAYERS_SQL, chunk)
+            except Exception as e:
+                logger.error(f"Database error upserting {len(chunk)} players with connection: {e}", exc_info=True)
+                raise
+    finally:
+        cur.close()
+
+
+SELECT_PLAYERS_BY_TEAM_SQL = (
+    "SELECT playerId, playerTeamId, playerFirstName, playerLastName, playerNumber, "
+    "playerPosition, playerHeadshotUrl, playerHomeCity, playerHomeCountry, playerIsActive "
+    "FROM players "
+    "WHERE playerTeamId = %s "
+    "ORDER BY playerLastName, playerFirstName"
+)
+
+
 def get_players_by_team(team_id: int) -> List[Dict[str, Any]]:
     """Fetch all players for a specific team."""
-    sql = """
-        SELECT playerId, playerTeamId, playerFirstName, playerLastName, playerNumber,
-               playerPosition, playerHeadshotUrl, playerHomeCity, playerHomeCountry, playerIsActive
-        FROM players
-        WHERE playerTeamId = %s
-        ORDER BY playerLastName, playerFirstName
-    """
     conn = get_db_connection()
     try:
         cur = conn.cursor(dictionary=True)
         try:
-            cur.execute(sql, (team_id,))
+            cur.execute(SELECT_PLAYERS_BY_TEAM_SQL, (team_id,))
             return cur.fetchall()
         except Exception as e:
             logger.error(f"Database error fetching players for team {team_id}: {e}", exc_info=True)
@@ -55,19 +75,26 @@ def get_players_by_team(team_id: int) -> List[Dict[str, Any]]:
         conn.close()
 
 
+def iter_players_by_team(team_id: int, chunk_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+    """Stream a team's players as PlayerRow namedtuples (same columns and order as get_players_by_team)."""
+    return iter_query(SELECT_PLAYERS_BY_TEAM_SQL, (team_id,), row_name="PlayerRow", chunk_size=chunk_size)
+
+
+SELECT_PLAYER_BY_ID_SQL = (
+    "SELECT playerId, playerTeamId, playerFirstName, playerLastName, playerNumber, "
+    "playerPosition, playerHeadshotUrl, playerHomeCity, playerHomeCountry, playerIsActive "
+    "FROM players "
+    "WHERE playerId = %s"
+)
+
+
 def get_player_by_id(player_id: int) -> Optional[Dict[str, Any]]:
     """Fetch a single player by player ID."""
-    sql = """
-        SELECT playerId, playerTeamId, playerFirstName, playerLastName, playerNumber,
-               playerPosition, playerHeadshotUrl, playerHomeCity, playerHomeCountry, playerIsActive
-        FROM players
-        WHERE playerId = %s
-    """
     conn = get_db_connection()
     try:
         cur = conn.cursor(dictionary=True)
         try:
-            cur.execute(sql, (player_id,))
+            cur.execute(SELECT_PLAYER_BY_ID_SQL, (player_id,))
             return cur.fetchone()
         except Exception as e:
             logger.error(f"Database error fetching player {player_id}: {e}", exc_info=True)
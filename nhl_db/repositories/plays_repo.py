@@ -1,26 +1,31 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 import logging
 
-from ..db import get_db_connection
+from ..db import execute_prepared, executemany_prepared, get_db_connection, iter_query
 
 logger = logging.getLogger(__name__)
 
+UPSERT_PLAYS_SQL = (
+    "INSERT INTO plays (playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
+    "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
+    "playType, playZone, playXCoord, playYCoord) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE playTeamId=VALUES(playTeamId), playPrimaryPlayerId=VALUES(playPrimaryPlayerId), "
+    "playLosingPlayerId=VALUES(playLosingPlayerId), playSecondaryPlayerId=VALUES(playSecondaryPlayerId), "
+    "playTertiaryPlayerId=VALUES(playTertiaryPlayerId), playPeriod=VALUES(playPeriod), playTime=VALUES(playTime), "
+    "playTimeReamaining=VALUES(playTimeReamaining), playType=VALUES(playType), "
+    "playZone=VALUES(playZone), playXCoord=VALUES(playXCoord), playYCoord=VALUES(playYCoord)"
+)
+
+# Requires the playFirstSeenUtc column (migration 0006_plays_first_seen)
+SET_PLAY_FIRST_SEEN_SQL = "UPDATE plays SET playFirstSeenUtc = %s WHERE playId = %s AND playFirstSeenUtc IS NULL"
+
 
 def upsert_plays_from_pbp(game_id: int, pbp: Dict[str, Any], rows: List[Tuple[Any, ...]]) -> int:
     if not rows:
         return 0
 
-    sql = (
-        "INSERT INTO plays (playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
-        "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
-        "playType, playZone, playXCoord, playYCoord) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE playTeamId=VALUES(playTeamId), playPrimaryPlayerId=VALUES(playPrimaryPlayerId), "
-        "playLosingPlayerId=VALUES(playLosingPlayerId), playSecondaryPlayerId=VALUES(playSecondaryPlayerId), "
-        "playTertiaryPlayerId=VALUES(playTertiaryPlayerId), playPeriod=VALUES(playPeriod), playTime=VALUES(playTime), "
-        "playTimeReamaining=VALUES(playTimeReamaining), playType=VALUES(playType), "
-        "playZone=VALUES(playZone), playXCoord=VALUES(playXCoord), playYCoord=VALUES(playYCoord)"
-    )
+    sql = UPSERT_PLAYS_SQL
 
     conn = get_db_connection()
     try:
@@ -41,45 +46,151 @@ def upsert_plays_with_conn(conn, rows: List[Tuple[Any, ...]]) -> int:  # type: i
     if not rows:
         return 0
 
-    sql = (
-        "INSERT INTO plays (playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
-        "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
-        "playType, playZone, playXCoord, playYCoord) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE playTeamId=VALUES(playTeamId), playPrimaryPlayerId=VALUES(playPrimaryPlayerId), "
-        "playLosingPlayerId=VALUES(playLosingPlayerId), playSecondaryPlayerId=VALUES(playSecondaryPlayerId), "
-        "playTertiaryPlayerId=VALUES(playTertiaryPlayerId), playPeriod=VALUES(playPeriod), playTime=VALUES(playTime), "
-        "playTimeReamaining=VALUES(playTimeReamaining), playType=VALUES(playType), "
-        "playZone=VALUES(playZone), playXCoord=VALUES(playXCoord), playYCoord=VALUES(playYCoord)"
-    )
+    if len(rows) > 1:
+        # The connector rewrites executemany into one multi-row INSERT per chunk:
+        # one round trip, where a prepared statement would need one per row
+        return upsert_plays_batch_with_conn(conn, rows)
+
+    # Hot path for watch-live (usually a single new play per poll): runs as a
+    # cached server-side prepared statement
+    try:
+        execute_prepared(conn, UPSERT_PLAYS_SQL, rows[0])
+    except Exception as e:
+        logger.error(f"Database error upserting 1 play with connection: {e}", exc_info=True)
+        raise
+    return len(rows)
+
 
+def upsert_plays_batch_with_conn(conn, rows: List[Tuple[Any, ...]], chunk_size: int = 1000) -> int:  # type: ignore[no-untyped-def]
+    """
+    Upsert plays in multi-row INSERT statements of at most ``chunk_size`` rows.
+
+    Used by upsert_plays_with_conn for more than one row, and directly for bulk
+    loads inside an explicit transaction.
+    """
+    if not rows:
+        return 0
+    cur = conn.cursor()
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                cur.executemany(UPSERT_PLAYS_SQL, chunk)
+            except Exception as e:
+                logger.error(f"Database error bulk upserting {len(chunk)} plays with connection: {e}", exc_info=True)
+                raise
+    finally:
+        cur.close()
+    return len(rows)
+
+
+SELECT_PLAY_IDS_BY_GAME_SQL = "SELECT playId FROM plays WHERE playGameId = %s"
+
+
+def get_play_ids_by_game_with_conn(conn, game_id: int) -> List[int]:  # type: ignore[no-untyped-def]
     cur = conn.cursor()
     try:
         try:
-            cur.executemany(sql, rows)
+            cur.execute(SELECT_PLAY_IDS_BY_GAME_SQL, (game_id,))
+            return [int(row[0]) for row in cur.fetchall()]
+        except Exception as e:
+            logger.error(f"Database error fetching play ids for game {game_id} with connection: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def set_play_first_seen_with_conn(conn, items: List[Tuple[Any, int]]) -> int:  # type: ignore[no-untyped-def]
+    """
+    Store when each play was first seen in a fetched payload.
+
+    Args:
+        items: (first seen UTC datetime, playId) pairs. Plays that already have a
+               first-seen time keep it.
+    """
+    if not items:
+        return 0
+    try:
+        executemany_prepared(conn, SET_PLAY_FIRST_SEEN_SQL, items)
+    except Exception as e:
+        logger.error(f"Database error storing first-seen times for {len(items)} plays with connection: {e}", exc_info=True)
+        raise
+    return len(items)
+
+
+def delete_plays_with_conn(conn, game_id: int, play_ids: List[int]) -> int:  # type: ignore[no-untyped-def]
+    if not play_ids:
+        return 0
+    placeholders = ", ".join(["%s"] * len(play_ids))
+    sql = f"DELETE FROM plays WHERE playGameId = %s AND playId IN ({placeholders})"
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(sql, (game_id, *play_ids))
+            return cur.rowcount
         except Exception as e:
-            logger.error(f"Database error upserting {len(rows)} plays with connection: {e}", exc_info=True)
+            logger.error(f"Database error deleting {len(play_ids)} plays for game_id={game_id} with connection: {e}", exc_info=True)
             raise
     finally:
         cur.close()
+
+
+async def upsert_plays_async(conn, rows: List[Tuple[Any, ...]]) -> int:  # type: ignore[no-untyped-def]
+    """Async variant of upsert_plays_with_conn for an aiomysql connection."""
+    if not rows:
+        return 0
+    async with conn.cursor() as cur:
+        try:
+            await cur.executemany(UPSERT_PLAYS_SQL, rows)
+        except Exception as e:
+            logger.error(f"Database error upserting {len(rows)} plays (async): {e}", exc_info=True)
+            raise
     return len(rows)
 
 
+async def get_play_ids_by_game_async(conn, game_id: int) -> List[int]:  # type: ignore[no-untyped-def]
+    """Async variant of get_play_ids_by_game_with_conn for an aiomysql connection."""
+    async with conn.cursor() as cur:
+        try:
+            await cur.execute(SELECT_PLAY_IDS_BY_GAME_SQL, (game_id,))
+            return [int(row[0]) for row in await cur.fetchall()]
+        except Exception as e:
+            logger.error(f"Database error fetching play ids for game {game_id} (async): {e}", exc_info=True)
+            raise
+
+
+async def delete_plays_async(conn, game_id: int, play_ids: List[int]) -> int:  # type: ignore[no-untyped-def]
+    """Async variant of delete_plays_with_conn for an aiomysql connection."""
+    if not play_ids:
+        return 0
+    placeholders = ", ".join(["%s"] * len(play_ids))
+    sql = f"DELETE FROM plays WHERE playGameId = %s AND playId IN ({placeholders})"
+    async with conn.cursor() as cur:
+        try:
+            await cur.execute(sql, (game_id, *play_ids))
+            return cur.rowcount
+        except Exception as e:
+            logger.error(f"Database error deleting {len(play_ids)} plays for game_id={game_id} (async): {e}", exc_info=True)
+            raise
+
+
+SELECT_PLAYS_BY_GAME_SQL = (
+    "SELECT playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
+    "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
+    "playType, playZone, playXCoord, playYCoord "
+    "FROM plays "
+    "WHERE playGameId = %s "
+    "ORDER BY playPeriod, playIndex"
+)
+
+
 def get_plays_by_game(game_id: int) -> List[Dict[str, Any]]:
     """Fetch all play-by-play data for a specific game."""
-    sql = """
-        SELECT playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId,
-               playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining,
-               playType, playZone, playXCoord, playYCoord
-        FROM plays
-        WHERE playGameId = %s
-        ORDER BY playPeriod, playIndex
-    """
     conn = get_db_connection()
     try:
         cur = conn.cursor(dictionary=True)
         try:
-            cur.execute(sql, (game_id,))
+            cur.execute(SELECT_PLAYS_BY_GAME_SQL, (game_id,))
             return cur.fetchall()
         except Exception as e:
             logger.error(f"Database error fetching plays for game {game_id}: {e}", exc_info=True)
@@ -90,3 +201,83 @@ def get_plays_by_game(game_id: int) -> List[Dict[str, Any]]:
         conn.close()
 
 
+def iter_plays_by_game(game_id: int, chunk_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+    """Stream a game's plays as PlayRow namedtuples (same columns and order as get_plays_by_game)."""
+    return iter_query(SELECT_PLAYS_BY_GAME_SQL, (game_id,), row_name="PlayRow", chunk_size=chunk_size)
+
+
+def season_game_id_bounds(season: int) -> Tuple[int, int]:
+    """
+    Half-open gameId range of a season: 20242025 -> [2024000000, 2025000000).
+
+    gameIds start with the season's first year, so filtering on this range uses
+    the playGameId index where a join to games would not be needed.
+    """
+    first_year = int(str(season)[:4])
+    return first_year * 1000000, (first_year + 1) * 1000000
+
+
+SELECT_PLAYS_IN_GAME_ID_RANGE_SQL = (
+    "SELECT playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
+    "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
+    "playType, playZone, playXCoord, playYCoord "
+    "FROM plays "
+    "WHERE playGameId >= %s AND playGameId < %s "
+    "ORDER BY playGameId, playPeriod, playIndex"
+)
+
+
+def iter_plays_by_season(season: int, chunk_size: int = 5000) -> Iterator[Tuple[Any, ...]]:
+    """
+    Stream every play of a season as PlayRow namedtuples, ordered by game, period and index.
+
+    Memory use stays at one chunk regardless of season size; see db.iter_query.
+    """
+    start, end = season_game_id_bounds(season)
+    return iter_query(SELECT_PLAYS_IN_GAME_ID_RANGE_SQL, (start, end), row_name="PlayRow", chunk_size=chunk_size)
+
+
+def iter_plays_by_game_id_range(first_game_id: int, last_game_id: int, chunk_size: int = 5000) -> Iterator[Tuple[Any, ...]]:
+    """Stream the plays of games first_game_id..last_game_id (inclusive) as PlayRow namedtuples."""
+    return iter_query(SELECT_PLAYS_IN_GAME_ID_RANGE_SQL, (first_game_id, last_game_id + 1), row_name="PlayRow", chunk_size=chunk_size)
+
+
+# One grouped range scan over the season's plays that reads full rows (the checksum
+# needs every column), so it costs about as much as reading the season once.
+# The checksum XORs a CRC32 per play over every column, so an in-place correction
+# to any play (coordinates, type, players) changes its game's value. JSON_ARRAY
+# keeps NULLs and column boundaries distinct.
+SELECT_PLAY_STATS_IN_GAME_ID_RANGE_SQL = (
+    "SELECT playGameId, COUNT(*), MAX(playId), "
+    "BIT_XOR(CRC32(JSON_ARRAY(playId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
+    "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
+    "playType, playZone, playXCoord, playYCoord))) "
+    "FROM plays "
+    "WHERE playGameId >= %s AND playGameId < %s "
+    "GROUP BY playGameId"
+)
+
+
+def get_play_stats_by_season(season: int) -> Dict[int, Tuple[int, int, int]]:
+    """
+    Per game of a season: (play count, highest playId, content checksum).
+
+    One grouped pass over the season's plays on the server; only one row per
+    game is returned.
+    """
+    start, end = season_game_id_bounds(season)
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(SELECT_PLAY_STATS_IN_GAME_ID_RANGE_SQL, (start, end))
+            return {int(row[0]): (int(row[1]), int(row[2]), int(row[3])) for row in cur.fetchall()}
+        except Exception as e:
+            logger.error(f"Database error fetching play stats for season {season}: {e}", exc_info=True)
+            raise
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
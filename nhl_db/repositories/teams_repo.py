@@ -1,46 +1,61 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 import logging
 
-from ..db import get_db_connection
+from ..db import get_db_connection, iter_query
+from .fingerprints_repo import UpsertStats, upsert_changed_rows_with_conn
 
 logger = logging.getLogger(__name__)
 
+# Columns written by UPSERT_TEAMS_SQL, checksummed to validate stored row fingerprints
+UPSERT_TEAMS_COLUMNS = ("teamId", "teamName", "teamCity", "teamAbbrev", "teamIsActive", "teamLogoUrl")
 
-def upsert_teams(rows: List[Tuple[Any, ...]]) -> None:
+UPSERT_TEAMS_SQL = (
+    "INSERT INTO teams (teamId, teamName, teamCity, teamAbbrev, teamIsActive, teamLogoUrl) "
+    "VALUES (%s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE teamName=VALUES(teamName), teamCity=VALUES(teamCity), teamAbbrev=VALUES(teamAbbrev), "
+    "teamIsActive=VALUES(teamIsActive), teamLogoUrl=VALUES(teamLogoUrl)"
+)
+
+
+def upsert_teams_with_conn(conn, rows: List[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
     if not rows:
         return
-    sql = (
-        "INSERT INTO teams (teamId, teamName, teamCity, teamAbbrev, teamIsActive, teamLogoUrl) "
-        "VALUES (%s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE teamName=VALUES(teamName), teamCity=VALUES(teamCity), teamAbbrev=VALUES(teamAbbrev), "
-        "teamIsActive=VALUES(teamIsActive), teamLogoUrl=VALUES(teamLogoUrl)"
-    )
-    conn = get_db_connection()
+    cur = conn.cursor()
     try:
-        cur = conn.cursor()
         try:
-            cur.executemany(sql, rows)
+            cur.executemany(UPSERT_TEAMS_SQL, rows)
         except Exception as e:
-            logger.error(f"Database error upserting {len(rows)} teams: {e}", exc_info=True)
+            logger.error(f"Database error upserting {len(rows)} teams with connection: {e}", exc_info=True)
             raise
-        finally:
-            cur.close()
+    finally:
+        cur.close()
+
+
+def upsert_teams(rows: List[Tuple[Any, ...]], force: bool = False) -> UpsertStats:
+    """Upsert team rows, skipping rows whose fingerprint is unchanged (unless force)."""
+    if not rows:
+        return UpsertStats()
+    conn = get_db_connection()
+    try:
+        return upsert_changed_rows_with_conn(conn, "teams", "teamId", UPSERT_TEAMS_COLUMNS, rows, upsert_teams_with_conn, force=force)
     finally:
         conn.close()
 
 
+SELECT_ALL_TEAMS_SQL = (
+    "SELECT teamId, teamName, teamCity, teamAbbrev, teamIsActive, teamLogoUrl "
+    "FROM teams "
+    "ORDER BY teamName"
+)
+
+
 def get_all_teams() -> List[Dict[str, Any]]:
     """Fetch all teams from the database."""
-    sql = """
-        SELECT teamId, teamName, teamCity, teamAbbrev, teamIsActive, teamLogoUrl
-        FROM teams
-        ORDER BY teamName
-    """
     conn = get_db_connection()
     try:
         cur = conn.cursor(dictionary=True)
         try:
-            cur.execute(sql)
+            cur.execute(SELECT_ALL_TEAMS_SQL)
             return cur.fetchall()
         except Exception as e:
             logger.error(f"Database error fetching all teams: {e}", exc_info=True)
@@ -51,19 +66,26 @@ def get_all_teams() -> List[Dict[str, Any]]:
         conn.close()
 
 
+def iter_all_teams(chunk_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+    """Stream all teams as TeamRow namedtuples (same columns and order as get_all_teams)."""
+    return iter_query(SELECT_ALL_TEAMS_SQL, (), row_name="TeamRow", chunk_size=chunk_size)
+
+
+SELECT_ACTIVE_TEAMS_SQL = (
+    "SELECT teamId, teamName, teamCity, teamAbbrev, teamIsActive, teamLogoUrl "
+    "FROM teams "
+    "WHERE teamIsActive = TRUE "
+    "ORDER BY teamName"
+)
+
+
 def get_active_teams() -> List[Dict[str, Any]]:
     """Fetch only active teams from the database."""
-    sql = """
-        SELECT teamId, teamName, teamCity, teamAbbrev, teamIsActive, teamLogoUrl
-        FROM teams
-        WHERE teamIsActive = TRUE
-        ORDER BY teamName
-    """
     conn = get_db_connection()
     try:
         cur = conn.cursor(dictionary=True)
         try:
-            cur.execute(sql)
+            cur.execute(SELECT_ACTIVE_TEAMS_SQL)
             return cur.fetchall()
         except Exception as e:
             logger.error(f"Database error fetching active teams: {e}", exc_info=True)
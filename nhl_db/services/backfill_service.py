@@ -0,0 +1,138 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import logging
+import time
+
+import requests
+
+from ..clients.nhl_web_client import FINAL_GAME_STATES, fetch_game_pbp, get_configured_session
+from ..db import get_db_connection
+from ..mappers.plays import map_play
+from ..repositories.checkpoints_repo import (
+    clear_checkpoints_with_conn,
+    ensure_backfill_checkpoints_table,
+    get_completed_game_ids_with_conn,
+    mark_games_completed_with_conn,
+)
+from ..repositories.games_repo import get_game_ids_by_season
+from ..repositories.plays_repo import upsert_plays_batch_with_conn
+
+logger = logging.getLogger(__name__)
+
+
+def _fetch_and_map_pbp(game_id: int, session: requests.Session) -> List[Tuple[Any, ...]]:
+    """Fetch one game's play-by-play and map it (runs on a backfill worker thread)."""
+    pbp = fetch_game_pbp(game_id, session=session)
+    plays: List[Dict[str, Any]] = pbp.get("plays") or []
+    return [map_play(game_id, p) for p in plays]
+
+
+def _write_batch(job: str, batch: List[Tuple[int, List[Tuple[Any, ...]]]]) -> int:
+    """Write a batch of games' plays and their checkpoints in a single transaction."""
+    rows = [row for _, game_rows in batch for row in game_rows]
+    conn = get_db_connection()
+    try:
+        conn.start_transaction()
+        try:
+            upsert_plays_batch_with_conn(conn, rows)
+            mark_games_completed_with_conn(conn, job, [(game_id, len(game_rows)) for game_id, game_rows in batch])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def backfill_plays(
+    season: int,
+    max_concurrency: int = 8,
+    batch_games: int = 25,
+    game_types: Optional[List[int]] = None,
+    restart: bool = False,
+) -> Tuple[int, int, int]:
+    """
+    Load play-by-play for every finished game of a season.
+
+    Game IDs come from the games table (run sync-schedule-dates first). Play-by-play
+    is fetched and mapped with map_play on a bounded worker pool, and plays are
+    written ``batch_games`` games at a time, each batch in one transaction together
+    with its rows in backfill_checkpoints, so a killed run resumes where it stopped.
+
+    Args:
+        season: Season in YYYYYYYY format, e.g. 20242025
+        max_concurrency: Maximum number of games fetched in parallel
+        batch_games: Number of games written per transaction
+        game_types: Optional game types to limit to (1=preseason, 2=regular, 3=playoffs)
+        restart: Clear existing checkpoints for the season and start over
+
+    Returns:
+        (games loaded, plays upserted, games failed)
+    """
+    job = f"plays:{season}"
+    max_concurrency = max(1, int(max_concurrency))
+    batch_games = max(1, int(batch_games))
+
+    conn = get_db_connection()
+    try:
+        ensure_backfill_checkpoints_table(conn)
+        if restart:
+            cleared = clear_checkpoints_with_conn(conn, job)
+            print(f"Cleared {cleared} checkpoints for {job}.")
+        completed: Set[int] = get_completed_game_ids_with_conn(conn, job)
+    finally:
+        conn.close()
+
+    game_ids = get_game_ids_by_season(season, game_types=game_types, states=list(FINAL_GAME_STATES))
+    todo = [g for g in game_ids if g not in completed]
+    print(f"Backfilling plays for season {season}: {len(todo)} games to load ({len(game_ids) - len(todo)} already checkpointed).")
+    if not todo:
+        return 0, 0, 0
+
+    session = get_configured_session(pool_maxsize=max_concurrency)
+    started = time.monotonic()
+    games_done = 0
+    plays_done = 0
+    failed = 0
+    batch: List[Tuple[int, List[Tuple[Any, ...]]]] = []
+
+    # Keep a bounded number of fetches in flight so finished payloads never pile up in memory
+    max_in_flight = max_concurrency * 2
+    pending: Dict[Future, int] = {}
+    remaining = iter(todo)
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="backfill") as executor:
+        while True:
+            while len(pending) < max_in_flight:
+                game_id = next(remaining, None)
+                if game_id is None:
+                    break
+                pending[executor.submit(_fetch_and_map_pbp, game_id, session)] = game_id
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                game_id = pending.pop(future)
+                try:
+                    batch.append((game_id, future.result()))
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Error backfilling plays for game {game_id}: {e}", exc_info=True)
+                    print(f"  Failed game {game_id}: {e} (will be retried on the next run)")
+
+            if len(batch) >= batch_games:
+                plays_done += _write_batch(job, batch)
+                games_done += len(batch)
+                batch = []
+                elapsed = time.monotonic() - started
+                print(f"  {games_done}/{len(todo)} games, {plays_done} plays ({games_done / elapsed:.1f} games/s)")
+
+    if batch:
+        plays_done += _write_batch(job, batch)
+        games_done += len(batch)
+
+    elapsed = time.monotonic() - started
+    print(f"Backfilled {plays_done} plays across {games_done} games in {elapsed:.1f}s ({failed} failed).")
+    return games_done, plays_done, failed
@@ -0,0 +1,267 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import csv
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+from ..repositories.fingerprints_repo import row_fingerprint
+from ..repositories.games_repo import iter_games_by_season
+from ..repositories.plays_repo import get_play_stats_by_season, iter_plays_by_game_id_range
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Column kinds, used for the Parquet schema (CSV writes every value as text)
+PLAY_COLUMNS: List[Tuple[str, str]] = [
+    ("playId", "int"), ("playGameId", "int"), ("playIndex", "int"), ("playTeamId", "int"),
+    ("playPrimaryPlayerId", "int"), ("playLosingPlayerId", "int"), ("playSecondaryPlayerId", "int"),
+    ("playTertiaryPlayerId", "int"), ("playPeriod", "int"), ("playTime", "str"), ("playTimeReamaining", "str"),
+    ("playType", "str"), ("playZone", "str"), ("playXCoord", "float"), ("playYCoord", "float"),
+]
+GAME_COLUMNS: List[Tuple[str, str]] = [
+    ("gameId", "int"), ("gameSeason", "int"), ("gameType", "int"), ("gameDateTimeUtc", "timestamp"),
+    ("gameVenue", "str"), ("gameHomeTeamId", "int"), ("gameAwayTeamId", "int"), ("gameState", "str"),
+    ("gamePeriod", "int"), ("gameClock", "str"), ("gameHomeScore", "int"), ("gameAwayScore", "int"),
+    ("gameHomeSOG", "int"), ("gameAwaySOG", "int"), ("homeTeamName", "str"), ("homeTeamAbbrev", "str"),
+    ("awayTeamName", "str"), ("awayTeamAbbrev", "str"),
+]
+
+
+class ExportStats(NamedTuple):
+    """Outcome of exporting one season."""
+
+    files_written: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    games_exported: int = 0
+    plays_exported: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"{self.files_written} files written ({self.games_exported} games, {self.plays_exported} plays), "
+            f"{self.files_unchanged} unchanged, {self.files_removed} removed"
+        )
+
+
+def resolve_format(fmt: str) -> str:
+    """
+    "parquet", "csv" or "auto" (Parquet when pyarrow is installed, else gzip-compressed CSV).
+
+    Raises:
+        RuntimeError: If "parquet" is requested and pyarrow is not installed.
+    """
+    if fmt not in ("auto", "parquet", "csv"):
+        raise ValueError(f"Unknown export format {fmt}")
+    if fmt == "csv":
+        return fmt
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        if fmt == "parquet":
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        return "csv"
+    return "parquet"
+
+
+class _CsvGzWriter:
+    suffix = ".csv.gz"
+
+    def __init__(self, path: Path, columns: Sequence[Tuple[str, str]]) -> None:
+        self._file = gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+        self._csv = csv.writer(self._file)
+        self._csv.writerow([name for name, _ in columns])
+
+    def write(self, rows: List[Sequence[Any]]) -> None:
+        self._csv.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    suffix = ".parquet"
+
+    def __init__(self, path: Path, columns: Sequence[Tuple[str, str]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        kinds = {"int": pa.int64(), "float": pa.float64(), "str": pa.string(), "timestamp": pa.timestamp("s", tz="UTC")}
+        self._pa = pa
+        self._kinds = [kind for _, kind in columns]
+        self._schema = pa.schema([(name, kinds[kind]) for name, kind in columns])
+        self._writer = pq.ParquetWriter(str(path), self._schema, compression="zstd")
+
+    def write(self, rows: List[Sequence[Any]]) -> None:
+        # One row group per chunk: pivot the chunk to columns and let Arrow convert it
+        arrays = []
+        for i, (field, kind) in enumerate(zip(self._schema, self._kinds)):
+            values = [row[i] for row in rows]
+            if kind == "str":
+                values = [None if v is None else str(v) for v in values]
+            elif kind == "float":
+                values = [None if v is None else float(v) for v in values]
+            elif kind == "int":
+                values = [None if v is None else int(v) for v in values]
+            arrays.append(self._pa.array(values, type=field.type))
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _write_file(path: Path, fmt: str, columns: Sequence[Tuple[str, str]], rows: Iterable[Sequence[Any]], chunk_size: int) -> int:
+    """
+    Write ``rows`` to ``path`` ``chunk_size`` rows at a time; returns the row count.
+
+    Written to a temporary file first and renamed into place, so readers never see
+    a partial file and an interrupted export leaves the previous file intact.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    writer = _ParquetWriter(tmp, columns) if fmt == "parquet" else _CsvGzWriter(tmp, columns)
+    count = 0
+    try:
+        it = iter(rows)
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                break
+            writer.write(chunk)
+            count += len(chunk)
+    except BaseException:
+        writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    writer.close()
+    os.replace(tmp, path)
+    return count
+
+
+def load_manifest(out_dir: Path) -> Dict[str, Any]:
+    path = out_dir / MANIFEST_NAME
+    if not path.is_file():
+        return {"version": MANIFEST_VERSION, "seasons": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning(f"Ignoring export manifest with version {manifest.get('version')}; doing a full export")
+        return {"version": MANIFEST_VERSION, "seasons": {}}
+    return manifest
+
+
+def _save_manifest(out_dir: Path, manifest: Dict[str, Any]) -> None:
+    path = out_dir / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _partition_dir(table: str, season: int, game_type: int) -> str:
+    # "type" rather than "gameType": partition keys must not collide with columns in the files
+    return f"{table}/season={season}/type={game_type}"
+
+
+def export_season(
+    season: int,
+    out_dir: str = "exports",
+    fmt: str = "auto",
+    games_per_file: int = 100,
+    chunk_size: int = 50000,
+    full: bool = False,
+) -> ExportStats:
+    """
+    Export a season's games and plays to partitioned files under ``out_dir``.
+
+    Layout (Hive-style partitions, readable by pyarrow.dataset, DuckDB, Spark, pandas):
+        games/season=S/type=T/games.<ext>
+        plays/season=S/type=T/part-NNNN.<ext>
+
+    Plays are split into files of ``games_per_file`` consecutive game numbers and
+    read from MySQL one file at a time as a gameId range, streamed through an
+    unbuffered cursor. At most ``chunk_size`` rows are held in memory, and each
+    chunk becomes one Parquet row group.
+
+    Incremental by default: each game's signature is a fingerprint of its games
+    row plus its play count, highest playId and a checksum over the content of
+    its plays (one grouped query per season, see get_play_stats_by_season), and
+    manifest.json records a digest of the signatures of the games in every file.
+    Only files containing a new, changed or removed game are rewritten, including
+    games whose existing plays were corrected in place.
+
+    Args:
+        season: Season in YYYYYYYY format, e.g. 20242025
+        out_dir: Export root directory
+        fmt: "auto", "parquet" or "csv" (gzip-compressed)
+        games_per_file: Game numbers per plays file
+        chunk_size: Rows read and written per batch
+        full: Ignore the manifest and rewrite every file
+
+    Returns:
+        ExportStats for the season
+    """
+    fmt = resolve_format(fmt)
+    root = Path(out_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(root)
+    previous: Dict[str, Any] = manifest["seasons"].get(str(season)) or {}
+    if previous.get("format") != fmt:
+        full = True
+    previous_files: Dict[str, Dict[str, Any]] = previous.get("files") or {}
+
+    games = list(iter_games_by_season(season, chunk_size=chunk_size))
+    play_stats = get_play_stats_by_season(season)
+    signatures: Dict[int, List[Any]] = {}
+    for game in games:
+        signatures[int(game.gameId)] = [row_fingerprint(game), *play_stats.get(int(game.gameId), (0, 0, 0))]
+
+    # Target files and the games each one holds
+    targets: Dict[str, List[Any]] = {}
+    ext = _ParquetWriter.suffix if fmt == "parquet" else _CsvGzWriter.suffix
+    for game in games:
+        game_type = int(game.gameType)
+        targets.setdefault(f"{_partition_dir('games', season, game_type)}/games{ext}", []).append(game)
+        bucket = (int(game.gameId) % 10000) // max(1, games_per_file)
+        targets.setdefault(f"{_partition_dir('plays', season, game_type)}/part-{bucket:04d}{ext}", []).append(game)
+
+    written = unchanged = removed = games_exported = plays_exported = 0
+    season_entry: Dict[str, Any] = {"format": fmt, "files": {} if full else dict(previous_files)}
+    manifest["seasons"][str(season)] = season_entry
+    for relpath in sorted(targets):
+        members = targets[relpath]
+        ids = [int(g.gameId) for g in members]
+        # A file's digest covers the signatures of exactly the games it holds, so adding,
+        # removing or changing any of them marks it dirty
+        digest = row_fingerprint([signatures[gid] for gid in ids])
+        recorded = previous_files.get(relpath) or {}
+        if not full and recorded.get("digest") == digest and recorded.get("games") == ids and (root / relpath).is_file():
+            unchanged += 1
+            continue
+        if relpath.startswith("games/"):
+            _write_file(root / relpath, fmt, GAME_COLUMNS, members, chunk_size)
+            games_exported += len(members)
+        else:
+            rows = iter_plays_by_game_id_range(min(ids), max(ids), chunk_size=chunk_size)
+            plays_exported += _write_file(root / relpath, fmt, PLAY_COLUMNS, rows, chunk_size)
+        written += 1
+        print(f"  wrote {relpath}")
+        # Record each file as soon as it is written, so an interrupted export resumes where it stopped
+        season_entry["files"][relpath] = {"games": ids, "digest": digest}
+        _save_manifest(root, manifest)
+
+    for relpath in sorted(set(previous_files) - set(targets)):
+        (root / relpath).unlink(missing_ok=True)
+        season_entry["files"].pop(relpath, None)
+        removed += 1
+        print(f"  removed {relpath}")
+    season_entry["exportedAt"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    _save_manifest(root, manifest)
+    return ExportStats(written, unchanged, removed, games_exported, plays_exported)
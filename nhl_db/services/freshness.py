@@ -0,0 +1,156 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+
+import pytz
+
+from ..metrics import Histogram, register
+
+logger = logging.getLogger(__name__)
+
+FRESHNESS_QUANTILES = (0.5, 0.95, 0.99)
+
+# Seconds from a play first appearing in a fetched payload to its row being committed
+PLAY_FRESHNESS_SECONDS = Histogram(
+    "nhl_play_freshness_seconds",
+    "Seconds from a play first appearing in a fetched play-by-play payload until its row was committed",
+    buckets=(1, 2, 3, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 300),
+)
+register(PLAY_FRESHNESS_SECONDS)
+
+_EASTERN = pytz.timezone("America/New_York")
+
+
+def night_of(ts: float) -> str:
+    """
+    The game night a timestamp belongs to, as YYYY-MM-DD in US Eastern time.
+
+    Anything before 6 AM Eastern still counts as the previous night, so late
+    West Coast games stay with the night they started on.
+    """
+    eastern = datetime.fromtimestamp(ts, tz=timezone.utc).astimezone(_EASTERN)
+    return (eastern - timedelta(hours=6)).date().isoformat()
+
+
+def quantiles(samples: Sequence[float], qs: Sequence[float] = FRESHNESS_QUANTILES) -> List[float]:
+    """Nearest-rank quantiles of ``samples`` (which must be non-empty)."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    return [ordered[min(n - 1, max(0, int(q * n + 0.999999) - 1))] for q in qs]
+
+
+def describe_samples(samples: Sequence[float]) -> str:
+    p50, p95, p99 = quantiles(samples)
+    return f"p50={p50:.1f}s p95={p95:.1f}s p99={p99:.1f}s over {len(samples)} plays"
+
+
+class FreshnessTracker:
+    """
+    Measures end-to-end freshness of live plays: first seen in a fetched payload
+    until the transaction writing it committed.
+
+    Pollers call observe() with each fetched game's playIds. Plays present the
+    first time a game is observed are the baseline (their real appearance time is
+    unknown) and are never measured. The writer calls first_seen() to persist
+    timestamps and committed() once its transaction has committed.
+
+    Samples are kept per game and per night for the most recent ``max_games``
+    games and ``max_nights`` nights, and exported to Prometheus as exact
+    quantiles alongside the nhl_play_freshness_seconds histogram.
+    """
+
+    def __init__(self, max_games: int = 64, max_nights: int = 7) -> None:
+        self.max_games = max_games
+        self.max_nights = max_nights
+        self._lock = threading.Lock()
+        self._known: Dict[int, set] = {}
+        self._pending: Dict[int, Dict[int, float]] = {}
+        self._by_game: "OrderedDict[int, List[float]]" = OrderedDict()
+        self._by_night: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def observe(self, game_id: int, play_ids: Iterable[int], fetched_at: float) -> int:
+        """Record the first-seen time of plays not seen before. Returns how many were new."""
+        ids = {int(pid) for pid in play_ids}
+        with self._lock:
+            known = self._known.get(game_id)
+            if known is None:
+                self._known[game_id] = ids
+                return 0
+            new_ids = ids - known
+            if new_ids:
+                known.update(new_ids)
+                pending = self._pending.setdefault(game_id, {})
+                for pid in new_ids:
+                    pending[pid] = fetched_at
+            return len(new_ids)
+
+    def first_seen(self, game_id: int, play_ids: Iterable[int]) -> Dict[int, float]:
+        """First-seen times of the given plays that are still waiting to be committed."""
+        with self._lock:
+            pending = self._pending.get(game_id) or {}
+            return {int(pid): pending[int(pid)] for pid in play_ids if int(pid) in pending}
+
+    def committed(self, game_id: int, play_ids: Iterable[int], committed_at: float) -> List[float]:
+        """Record freshness samples for plays whose write just committed."""
+        samples: List[Tuple[float, float]] = []
+        with self._lock:
+            pending = self._pending.get(game_id)
+            if not pending:
+                return []
+            for pid in play_ids:
+                seen = pending.pop(int(pid), None)
+                if seen is not None:
+                    samples.append((seen, max(0.0, committed_at - seen)))
+            if not samples:
+                return []
+            game_samples = self._by_game.setdefault(game_id, [])
+            self._by_game.move_to_end(game_id)
+            while len(self._by_game) > self.max_games:
+                self._by_game.popitem(last=False)
+            for seen, fresh in samples:
+                game_samples.append(fresh)
+                night = night_of(seen)
+                self._by_night.setdefault(night, []).append(fresh)
+            while len(self._by_night) > self.max_nights:
+                self._by_night.popitem(last=False)
+        for _, fresh in samples:
+            PLAY_FRESHNESS_SECONDS.observe(fresh)
+        return [fresh for _, fresh in samples]
+
+    def forget(self, game_id: int) -> None:
+        """Stop tracking a game that is no longer watched (its stats are kept)."""
+        with self._lock:
+            self._known.pop(game_id, None)
+            self._pending.pop(game_id, None)
+
+    def game_summary(self, game_id: int) -> Optional[str]:
+        with self._lock:
+            samples = list(self._by_game.get(game_id) or [])
+        return describe_samples(samples) if samples else None
+
+    def night_summary(self, night: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            if night is None and self._by_night:
+                night = next(reversed(self._by_night))
+            samples = list(self._by_night.get(night or "") or [])
+        return f"night {night}: {describe_samples(samples)}" if samples else None
+
+    def render(self) -> List[str]:
+        """Prometheus text lines with exact per-game and per-night quantiles."""
+        name = "nhl_play_freshness_quantile_seconds"
+        lines = [
+            f"# HELP {name} Exact play freshness quantiles per game and per night",
+            f"# TYPE {name} gauge",
+        ]
+        with self._lock:
+            scopes = [("game", str(k), list(v)) for k, v in self._by_game.items()]
+            scopes += [("night", k, list(v)) for k, v in self._by_night.items()]
+        for scope, key, samples in scopes:
+            if not samples:
+                continue
+            for q, value in zip(FRESHNESS_QUANTILES, quantiles(samples)):
+                lines.append(f'{name}{{scope="{scope}",key="{key}",quantile="{q:g}"}} {value:.3f}')
+        return lines
@@ -0,0 +1,166 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncio
+from datetime import datetime
+import logging
+
+import aiohttp
+
+from ..clients.nhl_web_async_client import (
+    create_async_session,
+    fetch_game_boxscore_async,
+    fetch_game_landing_async,
+    fetch_game_pbp_async,
+    fetch_schedule_for_date_async,
+)
+from ..db_async import create_async_db_pool
+from ..mappers.games import derive_game_fields_from_gamecenter, to_game_rows_from_schedule
+from ..mappers.plays import map_play
+from ..repositories.games_repo import update_game_fields_async, upsert_games_async
+from ..repositories.plays_repo import delete_plays_async, get_play_ids_by_game_async, upsert_plays_async
+from .live_service import _idle_sleep_seconds, _live_ids_from_schedule
+from .play_digest import PlayDigest
+
+logger = logging.getLogger(__name__)
+
+
+async def _list_live_games_today_async(session: aiohttp.ClientSession, pool, base_url: Optional[str] = None) -> Tuple[List[int], List[Dict[str, Any]]]:  # type: ignore[no-untyped-def]
+    today = datetime.now().strftime("%Y-%m-%d")
+    games = await fetch_schedule_for_date_async(today, session, base_url=base_url)
+    rows = to_game_rows_from_schedule(games)
+    # Ensure rows exist minimally (id and basic fields)
+    async with pool.acquire() as conn:
+        await upsert_games_async(conn, rows)
+    return _live_ids_from_schedule(games), games
+
+
+async def _update_game_async(game_id: int, session: aiohttp.ClientSession, pool, semaphore: asyncio.Semaphore, digest: PlayDigest, base_url: Optional[str] = None) -> int:  # type: ignore[no-untyped-def]
+    """Fetch the three gamecenter payloads concurrently, then write game fields and new/changed plays in one transaction."""
+    async with semaphore:
+        landing, box, pbp = await asyncio.gather(
+            fetch_game_landing_async(game_id, session, base_url=base_url),
+            fetch_game_boxscore_async(game_id, session, base_url=base_url),
+            fetch_game_pbp_async(game_id, session, base_url=base_url),
+        )
+
+    game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog = derive_game_fields_from_gamecenter(landing, box)
+    plays: List[Dict[str, Any]] = pbp.get("plays") or []
+    rows = [map_play(game_id, p) for p in plays]
+
+    async with pool.acquire() as conn:
+        if not digest.is_seeded(game_id):
+            digest.seed(game_id, await get_play_ids_by_game_async(conn, game_id))
+        changed, deleted, new_digest = digest.diff(game_id, rows)
+        # One transaction per game, as in the sync writer: a failure leaves the game's
+        # fields and plays as they were, and the digest unchanged so the next cycle retries
+        await conn.begin()
+        try:
+            await update_game_fields_async(conn, game_id, game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog)
+            count = await upsert_plays_async(conn, changed)
+            removed = await delete_plays_async(conn, game_id, deleted)
+            await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+    digest.commit(game_id, new_digest)
+    print(f"    → Upserted {count} new/changed plays, deleted {removed} for game {game_id}")
+    return count
+
+
+async def watch_live_games_async(
+    poll_seconds: int = 5,
+    max_concurrency: int = 0,
+    base_url: Optional[str] = None,
+    max_cycles: Optional[int] = None,
+) -> None:
+    """
+    Asyncio implementation of watch_live_games.
+
+    Runs the schedule poll and every live game's gamecenter fetches and DB writes on
+    a single event loop using aiohttp and aiomysql, so no thread pool is needed.
+
+    This engine polls every live game each cycle and writes directly. It has none
+    of the sync engine's later stages: no single-endpoint mode, conditional-GET or
+    disk cache, per-game poll scheduler, schedule snapshot, write-behind writer,
+    metrics, play freshness or memory watchdog. The watch-live command rejects the
+    flags for those features when --engine async is selected.
+
+    Args:
+        poll_seconds: Polling interval when there ARE live games (in seconds).
+                     Set to 0 to use config default.
+        max_concurrency: Maximum number of games fetched at the same time.
+                         Set to 0 to use config default.
+        base_url: Optional NHL Web API base URL (e.g. a local stub server).
+                  Defaults to NHL_WEB_BASE.
+        max_cycles: Stop after this many poll cycles. None runs indefinitely.
+    """
+    from ..config import NO_GAMES_POLL_SECONDS, LIVE_GAMES_POLL_SECONDS, LIVE_MAX_CONCURRENCY
+
+    if poll_seconds <= 0:
+        poll_seconds = LIVE_GAMES_POLL_SECONDS
+    if max_concurrency <= 0:
+        max_concurrency = LIVE_MAX_CONCURRENCY
+
+    print(f"Starting watch-live service (async engine)...")
+    print(f"Live games polling: {poll_seconds}s | No games polling: {NO_GAMES_POLL_SECONDS}s | Max concurrency: {max_concurrency}")
+
+    # Three requests per game are in flight at once
+    session = create_async_session(limit=max_concurrency * 3)
+    pool = await create_async_db_pool(maxsize=max_concurrency + 1)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    digest = PlayDigest()
+    cycles = 0
+    try:
+        while True:
+            live_ids: List[int] = []
+            scheduled_games: Optional[List[Dict[str, Any]]] = None
+            try:
+                live_ids, scheduled_games = await _list_live_games_today_async(session, pool, base_url=base_url)
+                current_time = datetime.now().strftime("%H:%M:%S")
+
+                if not live_ids:
+                    print(f"[{current_time}] No LIVE games found.")
+                else:
+                    print(f"[{current_time}] Found {len(live_ids)} live game(s)")
+
+                digest.retain(live_ids)
+                results = await asyncio.gather(
+                    *(_update_game_async(game_id, session, pool, semaphore, digest, base_url=base_url) for game_id in live_ids),
+                    return_exceptions=True,
+                )
+                for game_id, result in zip(live_ids, results):
+                    if isinstance(result, (aiohttp.ClientError, asyncio.TimeoutError)):
+                        logger.error(f"Request error for game {game_id}: {result}", exc_info=result)
+                        print(f"  Request error for game {game_id}: {result}")
+                    elif isinstance(result, Exception):
+                        logger.error(f"Unexpected error for game {game_id}: {result}", exc_info=result)
+                        print(f"  Unexpected error for game {game_id}: {result}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Request error while fetching live games: {e}", exc_info=True)
+                print(f"Request error while fetching live games: {e}")
+                print("Retrying in next iteration...")
+            except Exception as e:
+                logger.error(f"Unexpected error in async watch loop: {e}", exc_info=True)
+                print(f"Unexpected error in async watch loop: {e}")
+                print("Retrying in next iteration...")
+
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                print(f"Stopping after {cycles} cycles.")
+                break
+            if not live_ids:
+                idle_seconds, reason = _idle_sleep_seconds(scheduled_games)
+                print(f"Sleeping for {idle_seconds}s (no games; {reason})...\n")
+                await asyncio.sleep(idle_seconds)
+            else:
+                print(f"Sleeping for {poll_seconds}s (live games active)...\n")
+                await asyncio.sleep(max(1, int(poll_seconds)))
+    finally:
+        await session.close()
+        pool.close()
+        await pool.wait_closed()
+
+
+def run_watch_live_async(poll_seconds: int = 5, max_concurrency: int = 0, base_url: Optional[str] = None, max_cycles: Optional[int] = None) -> None:
+    """Blocking entry point that runs watch_live_games_async on a fresh event loop."""
+    asyncio.run(watch_live_games_async(poll_seconds=poll_seconds, max_concurrency=max_concurrency, base_url=base_url, max_cycles=max_cycles))
@@ -1,61 +1,133 @@
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from datetime import datetime, time as dt_time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, time as dt_time, timedelta, timezone
+import heapq
 import logging
+import signal
+import threading
+import time
 import requests
 
 logger = logging.getLogger(__name__)
 
 from ..clients.nhl_web_client import (
+    ConditionalCache,
     fetch_game_boxscore,
     fetch_game_landing,
     fetch_game_pbp,
     fetch_schedule_for_date,
     get_configured_session,
 )
-from ..db import get_db_connection
-from ..mappers.games import derive_game_fields_from_gamecenter, to_game_rows_from_schedule
-from ..mappers.plays import map_play
-from ..repositories.games_repo import (
-    upsert_games_with_conn,
-    update_game_fields_with_conn,
+from ..db import get_db_connection, get_db_pool
+from ..metrics import GAME_CYCLE_SECONDS, GAME_LAST_CYCLE_SECONDS, PLAYS_MAPPED, STAGE_SECONDS, SummaryLogger, register, start_metrics_server
+from ..mappers.games import (
+    derive_game_fields_from_gamecenter,
+    derive_game_fields_from_pbp,
+    pbp_needs_boxscore,
+    to_game_rows_from_schedule,
 )
-from ..repositories.plays_repo import upsert_plays_with_conn
+from ..mappers.plays import map_play
+from ..memwatch import MemoryWatchdog
+from ..repositories.games_repo import upsert_games_with_conn
+from .freshness import FreshnessTracker
+from .live_writer import GameSnapshot, LiveWriter, write_game_snapshot_with_conn
+from .play_digest import PlayDigest
 
 
-def update_live_once(game_id: int) -> int:
-    session = get_configured_session()
-    landing = fetch_game_landing(game_id, session=session)
-    box = fetch_game_boxscore(game_id, session=session)
-    pbp = fetch_game_pbp(game_id, session=session)
+def _fetch_game_payloads(
+    game_id: int,
+    session: requests.Session,
+    cache: Optional[ConditionalCache] = None,
+    single_endpoint: bool = False,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Fetch the gamecenter payloads for one game (runs on a fetch worker thread).
+
+    In single-endpoint mode only play-by-play is fetched; landing is None, and the
+    boxscore is fetched only when the play-by-play lacks a field it supplies.
+
+    Returns:
+        (landing, boxscore, play-by-play)
+    """
+    if single_endpoint:
+        pbp = fetch_game_pbp(game_id, session=session, cache=cache)
+        box = fetch_game_boxscore(game_id, session=session, cache=cache) if pbp_needs_boxscore(pbp) else None
+        return None, box, pbp
+    landing = fetch_game_landing(game_id, session=session, cache=cache)
+    box = fetch_game_boxscore(game_id, session=session, cache=cache)
+    pbp = fetch_game_pbp(game_id, session=session, cache=cache)
+    return landing, box, pbp
 
-    game_state, period, clock, home_score, away_score, home_sog, away_sog = derive_game_fields_from_gamecenter(landing, box)
-    conn = get_db_connection()
-    try:
-        update_game_fields_with_conn(conn, game_id, game_state, period, clock, home_score, away_score, home_sog, away_sog)
 
-        plays = pbp.get("plays") or []
+def _fetch_game_payloads_timed(
+    game_id: int,
+    session: requests.Session,
+    cache: Optional[ConditionalCache] = None,
+    single_endpoint: bool = False,
+) -> Tuple[float, Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Dict[str, Any]]]:
+    """_fetch_game_payloads, plus the perf_counter time at which this game's fetch started on its worker."""
+    started = time.perf_counter()
+    return started, _fetch_game_payloads(game_id, session, cache, single_endpoint)
+
+
+def _is_not_modified(*payloads: Optional[Dict[str, Any]]) -> bool:
+    """True when every fetched payload was served from the conditional-GET cache on a 304."""
+    return all(getattr(p, "not_modified", False) for p in payloads if p is not None)
+
+
+def _map_game_payloads(game_id: int, landing: Optional[Dict[str, Any]], box: Optional[Dict[str, Any]], pbp: Dict[str, Any]) -> GameSnapshot:
+    """
+    Map fetched gamecenter payloads to the game fields and play rows to write.
+
+    Without a landing payload (single-endpoint mode) the game fields are derived
+    from the play-by-play, with the boxscore as fallback.
+    """
+    if landing is None:
+        fields = derive_game_fields_from_pbp(pbp, box)
+    else:
+        fields = derive_game_fields_from_gamecenter(landing, box or {})
+    plays = pbp.get("plays") or []
+    with STAGE_SECONDS.time("map_plays"):
         rows = [map_play(game_id, p) for p in plays]
-        count = upsert_plays_with_conn(conn, rows)
-        return count
-    finally:
-        conn.close()
+    PLAYS_MAPPED.inc(len(rows))
+    return GameSnapshot(game_id, tuple(fields), rows)
+
+
+def _apply_game_payloads(conn, game_id: int, landing: Optional[Dict[str, Any]], box: Optional[Dict[str, Any]], pbp: Dict[str, Any], digest: Optional[PlayDigest] = None) -> Tuple[int, int]:  # type: ignore[no-untyped-def]
+    """
+    Map fetched gamecenter payloads and write game fields and plays immediately.
+
+    With a digest, only plays that are new or changed since the last write are
+    upserted and plays retracted from the feed are deleted.
+
+    Returns:
+        (plays upserted, plays deleted)
+    """
+    snapshot = _map_game_payloads(game_id, landing, box, pbp)
+    count, removed, new_digest = write_game_snapshot_with_conn(conn, snapshot, digest)
+    if digest is not None and new_digest is not None:
+        digest.commit(game_id, new_digest)
+    return count, removed
 
 
-def _list_live_games_today(session: Optional[requests.Session] = None) -> List[int]:
-    session = session or get_configured_session()
-    # Today's schedule only; can be extended to inch back/forward if desired
+def update_live_once(game_id: int, single_endpoint: bool = False) -> int:
+    session = get_configured_session()
+    landing, box, pbp = _fetch_game_payloads(game_id, session, single_endpoint=single_endpoint)
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    games = fetch_schedule_for_date(today, session=session)
-    rows = to_game_rows_from_schedule(games)
-    # Ensure rows exist minimally (id and basic fields)
     conn = get_db_connection()
     try:
-        upsert_games_with_conn(conn, rows)
+        count, _ = _apply_game_payloads(conn, game_id, landing, box, pbp)
+        return count
     finally:
         conn.close()
 
+
+# Games in these states will not be played (postponed / cancelled), so they are never watched
+UNPLAYED_GAME_STATES = ("PPD", "CNCL")
+
+
+def _live_ids_from_schedule(games: List[Dict[str, Any]]) -> List[int]:
     ids: List[int] = []
     for g in games:
         try:
@@ -66,90 +138,543 @@ def _list_live_games_today(session: Optional[requests.Session] = None) -> List[i
     return ids
 
 
-def watch_live_games(poll_seconds: int = 5) -> None:
+class ScheduleSnapshot:
+    """
+    In-memory copy of the schedule used by watch-live to discover games.
+
+    The schedule endpoint is only re-fetched once the snapshot is older than
+    ``ttl_seconds``. In between, game state and scores are kept current from the
+    gamecenter payloads already being fetched (update_from_gamecenter), and only
+    schedule rows that differ from what this process last wrote are upserted.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.games: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at: Optional[float] = None
+        self._written_rows: Dict[int, Tuple[Any, ...]] = {}
+
+    def is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.ttl_seconds
+
+    def clear(self) -> None:
+        """
+        Drop the cached schedule and written rows; the next cycle re-fetches it.
+
+        Without the written rows the next refresh upserts every schedule row once.
+        """
+        self.games = None
+        self._written_rows = {}
+        self._fetched_at = None
+
+    def refresh(self, session: requests.Session) -> int:
+        """Re-fetch the schedule and upsert games whose row changed. Returns rows written."""
+        # Start from yesterday so late games that began before midnight UTC are still listed
+        start = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        with STAGE_SECONDS.time("schedule_fetch"):
+            games = fetch_schedule_for_date(start, session=session)
+        rows = to_game_rows_from_schedule(games)
+        changed = [row for row in rows if self._written_rows.get(row[0]) != row]
+        if changed:
+            conn = get_db_connection()
+            try:
+                upsert_games_with_conn(conn, changed)
+            finally:
+                conn.close()
+        self._written_rows = {row[0]: row for row in rows}
+        self.games = games
+        self._fetched_at = time.monotonic()
+        return len(changed)
+
+    def update_from_gamecenter(self, game_id: int, payload: Dict[str, Any]) -> None:
+        """Fold a game's gamecenter state into the snapshot so it is not re-discovered as live."""
+        for g in self.games or []:
+            try:
+                if int(g.get("id")) != game_id:
+                    continue
+            except Exception:
+                continue
+            if payload.get("gameState"):
+                g["gameState"] = payload["gameState"]
+            return
+
+    def candidate_ids(self, now_utc: Optional[datetime] = None) -> List[int]:
+        """
+        Games that should be watched: LIVE/CRIT per the snapshot, plus non-final games
+        whose puck drop is within PREGAME_LEAD_SECONDS or already overdue.
+        """
+        from ..config import PREGAME_LEAD_SECONDS
+        from ..clients.nhl_web_client import FINAL_GAME_STATES
+
+        games = self.games or []
+        ids = _live_ids_from_schedule(games)
+        now_utc = now_utc or datetime.now(timezone.utc)
+        horizon = now_utc + timedelta(seconds=PREGAME_LEAD_SECONDS)
+        for g in games:
+            if str(g.get("gameState") or "").upper() in FINAL_GAME_STATES + UNPLAYED_GAME_STATES:
+                continue
+            start = _parse_start_time_utc(g)
+            if start is None or start > horizon:
+                continue
+            try:
+                game_id = int(g.get("id"))
+            except Exception:
+                continue
+            if game_id not in ids:
+                ids.append(game_id)
+        return ids
+
+
+def _parse_start_time_utc(game: Dict[str, Any]) -> Optional[datetime]:
+    start_utc = game.get("startTimeUTC")
+    if not isinstance(start_utc, str) or not start_utc:
+        return None
+    try:
+        return datetime.fromisoformat(start_utc.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+def _idle_sleep_seconds(games: Optional[List[Dict[str, Any]]], now_utc: Optional[datetime] = None) -> Tuple[int, str]:
+    """
+    Decide how long to sleep when no game is live, based on the scheduled games.
+
+    - Schedule unknown (fetch failed): coarse NO_GAMES_POLL_SECONDS poll.
+    - A game starts within PREGAME_LEAD_SECONDS, or is past its start time but not
+      live yet: PREGAME_POLL_SECONDS.
+    - Otherwise sleep until PREGAME_LEAD_SECONDS before the next puck drop, capped at
+      IDLE_MAX_SLEEP_SECONDS so schedule changes are still noticed.
+
+    Returns:
+        (seconds to sleep, human-readable reason)
+    """
+    from ..config import IDLE_MAX_SLEEP_SECONDS, NO_GAMES_POLL_SECONDS, PREGAME_LEAD_SECONDS, PREGAME_POLL_SECONDS
+    from ..clients.nhl_web_client import FINAL_GAME_STATES
+
+    if games is None:
+        return NO_GAMES_POLL_SECONDS, "schedule unknown"
+
+    now_utc = now_utc or datetime.now(timezone.utc)
+    next_start: Optional[datetime] = None
+    for g in games:
+        if str(g.get("gameState") or "").upper() in FINAL_GAME_STATES + UNPLAYED_GAME_STATES:
+            continue
+        start = _parse_start_time_utc(g)
+        if start is None:
+            continue
+        if next_start is None or start < next_start:
+            next_start = start
+
+    if next_start is None:
+        return IDLE_MAX_SLEEP_SECONDS, "no upcoming games scheduled this week"
+
+    until_wake = (next_start - now_utc).total_seconds() - PREGAME_LEAD_SECONDS
+    if until_wake <= 0:
+        return PREGAME_POLL_SECONDS, f"pregame (puck drop {next_start.strftime('%H:%M')} UTC)"
+    return int(min(until_wake, IDLE_MAX_SLEEP_SECONDS)), f"next puck drop {next_start.strftime('%Y-%m-%d %H:%M')} UTC"
+
+
+def _warm_connections(max_concurrency: int) -> requests.Session:
+    """Build a fresh HTTP session and check out a DB connection before live polling resumes."""
+    session = get_configured_session(pool_maxsize=max_concurrency)
+    try:
+        conn = get_db_connection()
+        conn.close()
+    except Exception as e:
+        logger.warning(f"DB warm-up failed: {e}")
+    return session
+
+
+class GamePollScheduler:
+    """
+    Min-heap of (next due time, gameId) for the games being watched.
+
+    Each game carries its own due time (time.monotonic() based), so games in a tight
+    third period are polled often while games in intermission wait. Rescheduling
+    pushes a new heap entry; superseded entries are skipped lazily on pop.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+        self._finished: set = set()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._due
+
+    def game_ids(self) -> List[int]:
+        return list(self._due)
+
+    def schedule(self, game_id: int, due: float) -> None:
+        self._due[game_id] = due
+        heapq.heappush(self._heap, (due, game_id))
+
+    def add(self, game_id: int, due: float) -> None:
+        """Start watching a game unless it is already scheduled or known to be final."""
+        if game_id not in self._due and game_id not in self._finished:
+            self.schedule(game_id, due)
+
+    def finish(self, game_id: int) -> None:
+        """Stop watching a game for good, even if a stale schedule still lists it as live."""
+        self._due.pop(game_id, None)
+        self._finished.add(game_id)
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_due(self) -> Optional[float]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[int]:
+        """Pop every game due at or before ``now``; they must be rescheduled or removed."""
+        due_ids: List[int] = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due_ids
+            _, game_id = heapq.heappop(self._heap)
+            del self._due[game_id]
+            due_ids.append(game_id)
+
+
+def _next_poll_delay(payload: Dict[str, Any], poll_seconds: int) -> Optional[float]:
+    """
+    Pick the delay until a game's next poll from its gamecenter payload.
+
+    Returns None once the game is final and should no longer be watched.
+    """
+    from ..config import (
+        CRIT_POLL_SECONDS,
+        INTERMISSION_POLL_SECONDS,
+        PREGAME_POLL_SECONDS,
+        SHOOTOUT_POLL_SECONDS,
+        STOPPAGE_POLL_SECONDS,
+    )
+    from ..clients.nhl_web_client import FINAL_GAME_STATES
+
+    state = str(payload.get("gameState") or "").upper()
+    if state in FINAL_GAME_STATES + UNPLAYED_GAME_STATES:
+        return None
+    if state in ("FUT", "PRE"):
+        return PREGAME_POLL_SECONDS
+
+    clock = payload.get("clock") if isinstance(payload.get("clock"), dict) else {}
+    pd = payload.get("periodDescriptor") if isinstance(payload.get("periodDescriptor"), dict) else {}
+
+    if clock.get("inIntermission"):
+        seconds_left = clock.get("secondsRemaining")
+        try:
+            # Wake up a little before the next period starts
+            return max(poll_seconds, min(INTERMISSION_POLL_SECONDS, int(seconds_left) - 30))
+        except (TypeError, ValueError):
+            return INTERMISSION_POLL_SECONDS
+    if str(pd.get("periodType") or "").upper() == "SO":
+        return SHOOTOUT_POLL_SECONDS
+    if state == "CRIT":
+        return min(poll_seconds, CRIT_POLL_SECONDS)
+    if clock.get("running") is False:
+        return max(poll_seconds, STOPPAGE_POLL_SECONDS)
+    return poll_seconds
+
+
+def watch_live_games(
+    poll_seconds: int = 5,
+    max_concurrency: int = 0,
+    single_endpoint: Optional[bool] = None,
+    metrics_port: Optional[int] = None,
+    persist_first_seen: bool = False,
+    max_cycles: Optional[int] = None,
+    memwatch: Optional[bool] = None,
+) -> None:
     """
     Continuously watch live games and update the database.
     
     Args:
-        poll_seconds: Polling interval when there ARE live games (in seconds).
+        poll_seconds: Polling interval for a live game with a running clock (in seconds).
                      Default is 5 seconds. Set to 0 to use config default.
+        max_concurrency: Maximum number of games fetched in parallel per cycle.
+                         Set to 0 to use config default.
+        single_endpoint: Derive game fields from play-by-play alone instead of
+                         landing + boxscore + play-by-play. None uses config default.
+        metrics_port: Serve Prometheus metrics on this local port. None uses
+                      NHL_METRICS_PORT; 0 disables the endpoint.
+        persist_first_seen: Also store when each new play was first seen in
+                            plays.playFirstSeenUtc (the column must exist).
+        max_cycles: Stop after this many loop iterations (used by --profile-cycles).
+                    None runs indefinitely.
+        memwatch: Log RSS and the fastest growing allocation sites (tracemalloc)
+                  every NHL_MEMWATCH_INTERVAL_SECONDS. None uses NHL_MEMWATCH.
     
     The function will run indefinitely:
-    - When live games exist: polls every `poll_seconds` (default: 5 seconds)
-    - When no live games: polls every 5 minutes (300 seconds)
+    - The schedule is kept in an in-memory ScheduleSnapshot, re-fetched every
+      SCHEDULE_TTL_SECONDS; games that are live or about to start are added to a
+      per-game poll scheduler (GamePollScheduler). From then on each game's own
+      gamecenter state decides whether it is still watched.
+    - Each game is polled on its own cadence derived from its gamecenter state
+      (running clock, stoppage, intermission, CRIT, shootout; see _next_poll_delay)
+      and dropped once it is final.
+    - When no game is watched: sleeps until shortly before the next scheduled puck
+      drop (see _idle_sleep_seconds), then warms the HTTP session and DB pool.
+      Falls back to every 5 minutes (300 seconds) if the schedule is unknown.
+    
+    Games that are due together are fetched on a bounded thread pool and each is
+    mapped as soon as its payloads arrive, then handed to a write-behind
+    LiveWriter: a dedicated thread writes every pending game in one transaction
+    per cycle, so a slow database never stalls polling. On SIGTERM (sent by
+    Heroku on every dyno restart) the loop stops and pending writes are flushed
+    for up to LIVE_WRITE_FLUSH_TIMEOUT_SECONDS.
+
+    Play freshness (first seen in a fetched payload until committed) is tracked
+    by a FreshnessTracker; p50/p95/p99 are reported per game when it is no longer
+    watched and per night when the last game of the night ends.
+
+    If RSS grows past NHL_MEMORY_SOFT_LIMIT_MB, the HTTP session, response cache,
+    schedule snapshot and idle DB connections are rebuilt in-process (see
+    _reset_for_memory) instead of letting the dyno hit its hard memory limit.
     """
-    from ..config import NO_GAMES_POLL_SECONDS, LIVE_GAMES_POLL_SECONDS
+    from ..config import (
+        LIVE_GAMES_POLL_SECONDS,
+        LIVE_MAX_CONCURRENCY,
+        LIVE_SINGLE_ENDPOINT,
+        LIVE_WRITE_FLUSH_TIMEOUT_SECONDS,
+        LIVE_WRITE_MAX_FAILURES,
+        LIVE_WRITE_MAX_PENDING,
+        LIVE_WRITE_QUARANTINE_SECONDS,
+        NO_GAMES_POLL_SECONDS,
+        SCHEDULE_TTL_SECONDS,
+    )
     
     # Use config default if poll_seconds is 0 or negative
     if poll_seconds <= 0:
         poll_seconds = LIVE_GAMES_POLL_SECONDS
+    if max_concurrency <= 0:
+        max_concurrency = LIVE_MAX_CONCURRENCY
+    if single_endpoint is None:
+        single_endpoint = LIVE_SINGLE_ENDPOINT
     
-    session = get_configured_session()
+    session = get_configured_session(pool_maxsize=max_concurrency)
+    http_cache = ConditionalCache()
+    scheduler = GamePollScheduler()
+    snapshot = ScheduleSnapshot(SCHEDULE_TTL_SECONDS)
     i = 0
     SESSION_REFRESH_INTERVAL = 50  # Recreate session every N iterations
     
     print(f"Starting watch-live service...")
-    print(f"Live games polling: {poll_seconds}s | No games polling: {NO_GAMES_POLL_SECONDS}s")
+    print(f"Live games polling: {poll_seconds}s | No games polling: {NO_GAMES_POLL_SECONDS}s | Max concurrency: {max_concurrency}")
+    print(f"Fetch mode: {'play-by-play only' if single_endpoint else 'landing + boxscore + play-by-play'}")
+    start_metrics_server(metrics_port)
+    summary = SummaryLogger()
+    watchdog = MemoryWatchdog.from_env(memwatch)
     
-    while True:
-        # Periodically refresh the session to prevent long-lived connection issues
-        if i > 0 and i % SESSION_REFRESH_INTERVAL == 0:
-            print(f"Refreshing session after {i} iterations...")
-            session = get_configured_session()
-        
-        try:
-            live_ids = _list_live_games_today(session=session)
-            current_time = datetime.now().strftime("%H:%M:%S")
-            
-            if not live_ids:
-                print(f"[{current_time}] No LIVE games found.")
-            else:
-                print(f"[{current_time}] Found {len(live_ids)} live game(s)")
+    tracker = FreshnessTracker()
+    register(tracker)
+    writer = LiveWriter(
+        max_pending=LIVE_WRITE_MAX_PENDING,
+        tracker=tracker,
+        persist_first_seen=persist_first_seen,
+        max_failures=LIVE_WRITE_MAX_FAILURES,
+        quarantine_seconds=LIVE_WRITE_QUARANTINE_SECONDS,
+    ).start()
+    previous_sigterm = _install_sigterm_handler()
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="live-fetch")
+    try:
+        while True:
+            # Periodically refresh the session to prevent long-lived connection issues
+            if i > 0 and i % SESSION_REFRESH_INTERVAL == 0:
+                print(f"Refreshing session after {i} iterations...")
+                session.close()
+                session = get_configured_session(pool_maxsize=max_concurrency)
             
-            conn = get_db_connection()
             try:
-                for game_id in live_ids:
-                    try:
-                        print(f"  Watching game: {game_id}")
-                        landing = fetch_game_landing(game_id, session=session)
-                        box = fetch_game_boxscore(game_id, session=session)
-                        pbp = fetch_game_pbp(game_id, session=session)
-
-                        game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog = derive_game_fields_from_gamecenter(landing, box)
-                        update_game_fields_with_conn(conn, game_id, game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog)
-
-                        plays = pbp.get("plays") or []
-                        rows = [map_play(game_id, p) for p in plays]
-                        count = upsert_plays_with_conn(conn, rows)
-                        print(f"    → Updated {count} plays for game {game_id}")
-                    except requests.exceptions.RequestException as e:
-                        logger.error(f"Request error for game {game_id}: {e}", exc_info=True)
-                        print(f"  Request error for game {game_id}: {e}")
-                        print("  Continuing to next game...")
-                        continue
-                    except Exception as e:
-                        logger.error(f"Unexpected error for game {game_id}: {e}", exc_info=True)
-                        print(f"  Unexpected error for game {game_id}: {e}")
-                        print("  Continuing to next game...")
-                        continue
-            finally:
-                conn.close()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error while fetching live games: {e}", exc_info=True)
-            print(f"Request error while fetching live games: {e}")
-            print("Retrying in next iteration...")
-        except Exception as e:
-            logger.error(f"Unexpected error in watch loop: {e}", exc_info=True)
-            print(f"Unexpected error in watch loop: {e}")
-            print("Retrying in next iteration...")
-
-        from time import sleep as _sleep
-        if not live_ids:
-            print(f"Sleeping for {NO_GAMES_POLL_SECONDS}s (no games)...\n")
-            _sleep(NO_GAMES_POLL_SECONDS)
+                if snapshot.is_stale():
+                    written = snapshot.refresh(session)
+                    print(f"Refreshed schedule snapshot ({len(snapshot.games or [])} games, {written} changed rows written)")
+                
+                watched_before = len(scheduler)
+                now = time.monotonic()
+                for game_id in snapshot.candidate_ids():
+                    scheduler.add(game_id, now)
+                if len(scheduler) != watched_before:
+                    current_time = datetime.now().strftime("%H:%M:%S")
+                    print(f"[{current_time}] Watching {len(scheduler)} game(s)")
+                
+                due_ids = scheduler.pop_due(time.monotonic())
+                if due_ids:
+                    _poll_due_games(executor, session, http_cache, writer, scheduler, snapshot, due_ids, poll_seconds, single_endpoint)
+                    writer.retain(scheduler.game_ids())
+                    if not scheduler:
+                        # Games were watched before this poll and it finished the last one: the night is over
+                        current_time = datetime.now().strftime("%H:%M:%S")
+                        print(f"[{current_time}] No LIVE games found.")
+                        _report_night_freshness(writer, tracker)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request error while fetching live games: {e}", exc_info=True)
+                print(f"Request error while fetching live games: {e}")
+                print("Retrying in next iteration...")
+            except Exception as e:
+                logger.error(f"Unexpected error in watch loop: {e}", exc_info=True)
+                print(f"Unexpected error in watch loop: {e}")
+                print("Retrying in next iteration...")
+
+            from time import sleep as _sleep
+            if not scheduler:
+                # A failed schedule fetch leaves the snapshot stale, so the idle logic falls back to a coarse poll
+                idle_seconds, reason = _idle_sleep_seconds(None if snapshot.is_stale() else snapshot.games)
+                print(f"Sleeping for {idle_seconds}s (no games; {reason})...\n")
+                with STAGE_SECONDS.time("idle_sleep"):
+                    _sleep(idle_seconds)
+                if idle_seconds > NO_GAMES_POLL_SECONDS:
+                    # Long idle stretch: sockets are likely stale, so warm up before polling again
+                    print("Warming HTTP session and DB pool...")
+                    session.close()
+                    session = _warm_connections(max_concurrency)
+            else:
+                wake_at = scheduler.next_due() or time.monotonic() + poll_seconds
+                with STAGE_SECONDS.time("sleep"):
+                    _sleep(max(0.5, wake_at - time.monotonic()))
+            summary.maybe_log()
+            if watchdog is not None:
+                watchdog.maybe_sample()
+                if watchdog.over_soft_limit():
+                    session = _reset_for_memory(session, http_cache, snapshot, writer, max_concurrency)
+                    watchdog.after_reset()
+            i += 1
+            if max_cycles is not None and i >= max_cycles:
+                print(f"Stopping after {i} cycles.")
+                break
+    except _Shutdown:
+        print("SIGTERM received; stopping watch-live...")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        pending = writer.pending_count()
+        print(f"Flushing {pending} pending game write(s)...")
+        if writer.close(timeout=LIVE_WRITE_FLUSH_TIMEOUT_SECONDS):
+            print("Pending writes flushed.")
         else:
-            print(f"Sleeping for {poll_seconds}s (live games active)...\n")
-            _sleep(max(1, int(poll_seconds)))
-        i += 1
+            print(f"Gave up flushing after {LIVE_WRITE_FLUSH_TIMEOUT_SECONDS}s; the next run will re-sync those games.")
+        night = tracker.night_summary()
+        if night:
+            print(f"Play freshness so far, {night}")
+        if previous_sigterm is not None:
+            signal.signal(signal.SIGTERM, previous_sigterm)
+
+
+def _reset_for_memory(
+    session: requests.Session,
+    http_cache: ConditionalCache,
+    snapshot: "ScheduleSnapshot",
+    writer: LiveWriter,
+    max_concurrency: int,
+) -> requests.Session:
+    """
+    Release what watch-live holds on to between cycles without restarting the process.
+
+    Pending writes are flushed first, then the HTTP session (and its urllib3
+    connection pools) is replaced, the conditional-GET cache and the schedule
+    snapshot are cleared so the next cycle re-fetches both, and idle DB connections
+    (with their prepared statements) are closed. Play digests are kept: they are
+    bounded by the watched games and rebuilding them costs a read per game.
+
+    Returns:
+        New session
+    """
+    print("Memory soft limit reached; resetting HTTP session, caches and DB pool...")
+    if not writer.flush(timeout=10):
+        logger.warning("Memory reset: writer did not flush within 10s; continuing")
+    try:
+        session.close()
+    except Exception as e:
+        logger.warning(f"Memory reset: closing HTTP session failed: {e}")
+    http_cache.clear()
+    snapshot.clear()
+    try:
+        get_db_pool().close_all()
+    except Exception as e:
+        logger.warning(f"Memory reset: closing idle DB connections failed: {e}")
+    return get_configured_session(pool_maxsize=max_concurrency)
+
+
+def _report_night_freshness(writer: LiveWriter, tracker: FreshnessTracker) -> None:
+    """Once the last watched game is done, flush its final writes and report the night's freshness."""
+    writer.flush(timeout=10)
+    writer.retain([])
+    night = tracker.night_summary()
+    if night:
+        print(f"Play freshness, {night}")
+        logger.info(f"Play freshness, {night}")
+
+
+class _Shutdown(BaseException):
+    """Raised in the main thread by the SIGTERM handler to leave the watch loop."""
+
+
+def _raise_shutdown(signum, frame) -> None:  # type: ignore[no-untyped-def]
+    raise _Shutdown()
 
 
+def _install_sigterm_handler():  # type: ignore[no-untyped-def]
+    """Turn SIGTERM into _Shutdown so watch-live can flush pending writes. Returns the previous handler."""
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    return signal.signal(signal.SIGTERM, _raise_shutdown)
+
+
+def _poll_due_games(
+    executor: ThreadPoolExecutor,
+    session: requests.Session,
+    http_cache: ConditionalCache,
+    writer: LiveWriter,
+    scheduler: GamePollScheduler,
+    snapshot: ScheduleSnapshot,
+    due_ids: List[int],
+    poll_seconds: int,
+    single_endpoint: bool = False,
+) -> None:
+    """Fetch the due games concurrently, map each as it arrives, queue it for writing and reschedule it."""
+    futures = {executor.submit(_fetch_game_payloads_timed, game_id, session, http_cache, single_endpoint): game_id for game_id in due_ids}
+    # Map each game as soon as its fetch completes; the writer thread does the DB work
+    for future in as_completed(futures):
+        game_id = futures[future]
+        # On errors, retry the game at the regular live cadence
+        delay: Optional[float] = poll_seconds
+        try:
+            print(f"  Watching game: {game_id}")
+            # Timed from this game's own fetch, not from the start of the batch
+            fetch_started, (landing, box, pbp) = future.result()
+            # Landing and play-by-play both carry gameState, clock and periodDescriptor
+            state_payload = landing if landing is not None else pbp
+            snapshot.update_from_gamecenter(game_id, state_payload)
+            delay = _next_poll_delay(state_payload, poll_seconds)
+            if _is_not_modified(landing, box, pbp):
+                print(f"    → Not modified since last poll; skipping game {game_id}")
+                continue
+            fetched_at = time.time()
+            game_snapshot = _map_game_payloads(game_id, landing, box, pbp)
+            if writer.tracker is not None:
+                writer.tracker.observe(game_id, (row[0] for row in game_snapshot.rows), fetched_at)
+            writer.submit(game_snapshot)
+            elapsed = time.perf_counter() - fetch_started
+            GAME_CYCLE_SECONDS.observe(elapsed)
+            GAME_LAST_CYCLE_SECONDS.set(elapsed, str(game_id))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error for game {game_id}: {e}", exc_info=True)
+            print(f"  Request error for game {game_id}: {e}")
+            print("  Continuing to next game...")
+            continue
+        except Exception as e:
+            logger.error(f"Unexpected error for game {game_id}: {e}", exc_info=True)
+            print(f"  Unexpected error for game {game_id}: {e}")
+            print("  Continuing to next game...")
+            continue
+        finally:
+            if delay is None:
+                print(f"    → Game {game_id} is final; no longer watching")
+                scheduler.finish(game_id)
+                GAME_LAST_CYCLE_SECONDS.remove(str(game_id))
+            else:
+                scheduler.schedule(game_id, time.monotonic() + delay)
@@ -0,0 +1,340 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+
+from ..db import get_db_connection
+from ..metrics import COALESCED_SNAPSHOTS, GAME_WRITE_FAILURES, ROWS_WRITTEN, STAGE_SECONDS, WRITE_CYCLES
+from ..repositories.games_repo import update_game_fields_with_conn
+from ..repositories.plays_repo import (
+    delete_plays_with_conn,
+    get_play_ids_by_game_with_conn,
+    set_play_first_seen_with_conn,
+    upsert_plays_with_conn,
+)
+from .freshness import FreshnessTracker
+from .play_digest import PlayDigest
+
+logger = logging.getLogger(__name__)
+
+# Back off this long after a failed write cycle before retrying
+WRITE_RETRY_SECONDS = 2.0
+
+
+class GameSnapshot(NamedTuple):
+    """Everything watch-live writes for one game after one poll."""
+
+    game_id: int
+    fields: Tuple[Any, ...]  # derive_game_fields_* 8-tuple
+    rows: List[Tuple[Any, ...]]  # map_play rows for the full plays array
+
+
+def write_game_snapshot_with_conn(conn, snapshot: GameSnapshot, digest: Optional[PlayDigest] = None) -> Tuple[int, int, Optional[Dict[int, Optional[int]]]]:  # type: ignore[no-untyped-def]
+    """
+    Write one game's fields and plays on ``conn`` without committing.
+
+    With a digest, only plays that are new or changed since the last write are
+    upserted and plays retracted from the feed are deleted. The digest itself is
+    not updated; commit the returned new digest once the transaction commits.
+
+    Returns:
+        (plays upserted, plays deleted, new digest or None)
+    """
+    game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog = snapshot.fields
+    with STAGE_SECONDS.time("db_update_game"):
+        update_game_fields_with_conn(conn, snapshot.game_id, game_state, period, clock, in_intermission, home_score, away_score, home_sog, away_sog)
+
+    if digest is None:
+        with STAGE_SECONDS.time("db_upsert_plays"):
+            return upsert_plays_with_conn(conn, snapshot.rows), 0, None
+
+    if not digest.is_seeded(snapshot.game_id):
+        with STAGE_SECONDS.time("db_seed_digest"):
+            digest.seed(snapshot.game_id, get_play_ids_by_game_with_conn(conn, snapshot.game_id))
+    changed, deleted, new_digest = digest.diff(snapshot.game_id, snapshot.rows)
+    with STAGE_SECONDS.time("db_upsert_plays"):
+        count = upsert_plays_with_conn(conn, changed)
+    with STAGE_SECONDS.time("db_delete_plays"):
+        removed = delete_plays_with_conn(conn, snapshot.game_id, deleted)
+    if removed:
+        logger.info(f"Deleted {removed} retracted plays for game {snapshot.game_id}")
+    return count, removed, new_digest
+
+
+class LiveWriter:
+    """
+    Write-behind stage between watch-live's mapping and the database.
+
+    Pollers hand each game's latest GameSnapshot to submit() and move on; a
+    dedicated writer thread drains everything pending and writes it in a single
+    transaction per cycle. Snapshots carry a game's full state, so while the
+    database is behind, a newer snapshot simply replaces the pending one for the
+    same game. At most ``max_pending`` games wait at once; submitting another game
+    blocks until the writer catches up.
+
+    The play digest is owned by the writer thread; callers only ask it to retain
+    the watched games (retain()), which is applied at the start of the next cycle.
+
+    Each game is written under its own SAVEPOINT, so a snapshot that fails (a
+    data error for one game) is rolled back alone and the rest of the cycle still
+    commits. The failed game is re-queued, unless a newer snapshot for it has
+    arrived meanwhile; after ``max_failures`` consecutive failures its snapshots
+    are skipped for ``quarantine_seconds``. A cycle that fails as a whole (lost
+    connection, deadlock, failed commit) is rolled back and all its snapshots
+    re-queued without counting against any game.
+
+    With a FreshnessTracker, every commit records how long its new plays took
+    from first being seen to being committed; with ``persist_first_seen`` their
+    first-seen times are also stored on the plays rows in the same transaction.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 64,
+        tracker: Optional[FreshnessTracker] = None,
+        persist_first_seen: bool = False,
+        max_failures: int = 5,
+        quarantine_seconds: float = 300,
+    ) -> None:
+        self.max_pending = max(1, int(max_pending))
+        self.max_failures = max(1, int(max_failures))
+        self.quarantine_seconds = max(0.0, float(quarantine_seconds))
+        self.tracker = tracker
+        self.persist_first_seen = persist_first_seen and tracker is not None
+        self.digest = PlayDigest()
+        # Consecutive failed writes per game, and quarantined games -> monotonic release time
+        self._failures: Dict[int, int] = {}
+        self._quarantined: Dict[int, float] = {}
+        self._pending: Dict[int, GameSnapshot] = {}
+        self._retain: Optional[Set[int]] = None
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._writing = False
+        self._thread = threading.Thread(target=self._run, name="live-writer", daemon=True)
+        self.cycles = 0
+        self.coalesced = 0
+
+    def start(self) -> "LiveWriter":
+        self._thread.start()
+        return self
+
+    def submit(self, snapshot: GameSnapshot) -> None:
+        """Queue a game's snapshot, replacing any pending one for the same game."""
+        with self._cond:
+            while (
+                not self._stopping
+                and snapshot.game_id not in self._pending
+                and len(self._pending) >= self.max_pending
+            ):
+                self._cond.wait()
+            if snapshot.game_id in self._pending:
+                self.coalesced += 1
+                COALESCED_SNAPSHOTS.inc()
+            self._pending[snapshot.game_id] = snapshot
+            self._cond.notify_all()
+
+    def retain(self, game_ids: Iterable[int]) -> None:
+        """Drop digests for games that are no longer watched (applied on the writer thread)."""
+        with self._cond:
+            self._retain = set(game_ids)
+            self._cond.notify_all()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is written. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting work, write whatever is pending and stop the writer thread.
+
+        Returns:
+            True if the writer finished within ``timeout``.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        left = self.pending_count()
+        if left:
+            logger.warning(f"Live writer stopped with {left} unwritten game snapshot(s)")
+        return not self._thread.is_alive() and not left
+
+    def _take_batch(self) -> Tuple[List[GameSnapshot], Optional[Set[int]], bool]:
+        with self._cond:
+            while not self._pending and not self._stopping and self._retain is None:
+                self._cond.wait()
+            batch = list(self._pending.values())
+            self._pending.clear()
+            retain, self._retain = self._retain, None
+            self._writing = bool(batch)
+            self._cond.notify_all()
+            return batch, retain, self._stopping
+
+    def _run(self) -> None:
+        while True:
+            batch, retain, stopping = self._take_batch()
+            if retain is not None:
+                keep = retain | {s.game_id for s in batch}
+                if self.tracker is not None:
+                    for game_id in self.digest.game_ids():
+                        if game_id not in keep:
+                            self._finish_game(game_id)
+                self.digest.retain(keep)
+                for game_id in [g for g in self._failures if g not in keep]:
+                    del self._failures[game_id]
+            batch = self._without_quarantined(batch)
+            if not batch:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+                if stopping:
+                    return
+                continue
+            failed = self._write_batch(batch)
+            if failed is None:
+                retry = batch
+            else:
+                retry = [snapshot for snapshot in batch if snapshot.game_id in failed and self._record_failure(snapshot.game_id)]
+                for snapshot in batch:
+                    if snapshot.game_id not in failed:
+                        self._failures.pop(snapshot.game_id, None)
+            with self._cond:
+                # Keep any newer snapshot that arrived while this one was failing
+                for snapshot in retry:
+                    self._pending.setdefault(snapshot.game_id, snapshot)
+                self._writing = False
+                self._cond.notify_all()
+                stopping = self._stopping
+            if retry:
+                if stopping:
+                    return
+                time.sleep(WRITE_RETRY_SECONDS)
+
+    def _without_quarantined(self, batch: List[GameSnapshot]) -> List[GameSnapshot]:
+        if not self._quarantined:
+            return batch
+        now = time.monotonic()
+        for game_id in [g for g, until in self._quarantined.items() if until <= now]:
+            del self._quarantined[game_id]
+            logger.info(f"Live writer: game {game_id} released from quarantine; writing its snapshots again")
+        kept = [snapshot for snapshot in batch if snapshot.game_id not in self._quarantined]
+        if len(kept) < len(batch):
+            GAME_WRITE_FAILURES.inc(len(batch) - len(kept), "skipped")
+        return kept
+
+    def _record_failure(self, game_id: int) -> bool:
+        """Count a failed write of ``game_id``; returns True if the snapshot should be retried."""
+        failures = self._failures.get(game_id, 0) + 1
+        if failures < self.max_failures:
+            self._failures[game_id] = failures
+            GAME_WRITE_FAILURES.inc(1, "retry")
+            return True
+        self._failures.pop(game_id, None)
+        self._quarantined[game_id] = time.monotonic() + self.quarantine_seconds
+        GAME_WRITE_FAILURES.inc(1, "quarantine")
+        logger.error(
+            f"Live writer: game {game_id} failed to write {failures} times in a row; "
+            f"skipping its snapshots for {self.quarantine_seconds:g}s"
+        )
+        print(f"  Quarantined game {game_id} for {self.quarantine_seconds:g}s after {failures} failed writes")
+        return False
+
+    def _finish_game(self, game_id: int) -> None:
+        """Report a no-longer-watched game's freshness and stop tracking it."""
+        assert self.tracker is not None
+        summary = self.tracker.game_summary(game_id)
+        if summary:
+            print(f"    → Freshness for game {game_id}: {summary}")
+            logger.info(f"Play freshness for game {game_id}: {summary}")
+        self.tracker.forget(game_id)
+
+    def _write_snapshot_with_conn(self, conn, snapshot: GameSnapshot) -> Tuple[int, int, Optional[Dict[int, Optional[int]]]]:  # type: ignore[no-untyped-def]
+        count, removed, new_digest = write_game_snapshot_with_conn(conn, snapshot, self.digest)
+        if self.persist_first_seen:
+            first_seen = self.tracker.first_seen(snapshot.game_id, (row[0] for row in snapshot.rows))  # type: ignore[union-attr]
+            set_play_first_seen_with_conn(conn, [
+                (datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None), play_id)
+                for play_id, ts in first_seen.items()
+            ])
+        return count, removed, new_digest
+
+    def _write_batch(self, batch: List[GameSnapshot]) -> Optional[Set[int]]:
+        """
+        Write all pending games in one transaction, each under its own savepoint.
+
+        Returns:
+            IDs of the games rolled back to their savepoint (empty if all were
+            written), or None if the transaction as a whole failed.
+        """
+        digests: List[Tuple[int, Optional[Dict[int, Optional[int]]]]] = []
+        failed: Set[int] = set()
+        totals = [0, 0]
+        try:
+            conn = get_db_connection()
+        except Exception as e:
+            logger.error(f"Live writer could not get a DB connection: {e}", exc_info=True)
+            return None
+        started = time.perf_counter()
+        try:
+            conn.start_transaction()
+            cur = conn.cursor()
+            try:
+                for snapshot in batch:
+                    cur.execute("SAVEPOINT live_game")
+                    try:
+                        count, removed, new_digest = self._write_snapshot_with_conn(conn, snapshot)
+                    except Exception as e:
+                        # Raises too if the server already rolled back the whole
+                        # transaction (deadlock, lost connection): the cycle fails
+                        cur.execute("ROLLBACK TO SAVEPOINT live_game")
+                        failed.add(snapshot.game_id)
+                        logger.error(f"Live write for game {snapshot.game_id} failed and was rolled back: {e}", exc_info=True)
+                        continue
+                    totals[0] += count
+                    totals[1] += removed
+                    digests.append((snapshot.game_id, new_digest))
+                with STAGE_SECONDS.time("db_commit"):
+                    conn.commit()
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                WRITE_CYCLES.inc(1, "rolled_back")
+                logger.error(f"Live write cycle for {len(batch)} game(s) failed and was rolled back: {e}", exc_info=True)
+                return None
+            finally:
+                cur.close()
+        finally:
+            conn.close()
+        STAGE_SECONDS.observe(time.perf_counter() - started, "db_write_cycle")
+        written = [snapshot for snapshot in batch if snapshot.game_id not in failed]
+        if self.tracker is not None:
+            committed_at = time.time()
+            for snapshot in written:
+                self.tracker.committed(snapshot.game_id, (row[0] for row in snapshot.rows), committed_at)
+        WRITE_CYCLES.inc(1, "committed" if not failed else "partial")
+        ROWS_WRITTEN.inc(len(written), "games", "update")
+        ROWS_WRITTEN.inc(totals[0], "plays", "upsert")
+        ROWS_WRITTEN.inc(totals[1], "plays", "delete")
+
+        for game_id, new_digest in digests:
+            if new_digest is not None:
+                self.digest.commit(game_id, new_digest)
+        self.cycles += 1
+        skipped = f", {len(failed)} game(s) rolled back" if failed else ""
+        print(f"    → Wrote {len(written)} game(s) in one transaction: {totals[0]} plays upserted, {totals[1]} deleted{skipped}")
+        return failed
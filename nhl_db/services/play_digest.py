@@ -0,0 +1,72 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PlayDigest:
+    """
+    In-memory digest of the plays last written for each live game.
+
+    Keyed by gameId, then by playId (first element of a map_play tuple), with a hash
+    of the full mapped row as the value. Diffing a freshly mapped plays array
+    against the digest yields only the rows that are new or changed since the last
+    successful write, plus the playIds the league has since retracted.
+    """
+
+    def __init__(self) -> None:
+        self._games: Dict[int, Dict[int, Optional[int]]] = {}
+
+    def is_seeded(self, game_id: int) -> bool:
+        return game_id in self._games
+
+    def game_ids(self) -> List[int]:
+        return list(self._games)
+
+    def seed(self, game_id: int, play_ids: Iterable[int]) -> None:
+        """
+        Seed a game with the playIds already stored in the database.
+
+        Their row hashes are unknown, so every seeded play is re-sent once on the
+        next diff, but stored plays missing from the feed are detected as deletions.
+        """
+        self._games[game_id] = {int(pid): None for pid in play_ids}
+
+    def diff(self, game_id: int, rows: List[Tuple[Any, ...]]) -> Tuple[List[Tuple[Any, ...]], List[int], Dict[int, Optional[int]]]:
+        """
+        Compare mapped play rows against the digest for a game.
+
+        Returns:
+            (changed_rows, deleted_play_ids, new_digest). Pass new_digest to commit()
+            once the changes have been written successfully.
+        """
+        previous = self._games.get(game_id, {})
+        current: Dict[int, Optional[int]] = {}
+        changed: List[Tuple[Any, ...]] = []
+        for row in rows:
+            play_id = int(row[0])
+            row_hash = hash(row)
+            current[play_id] = row_hash
+            if previous.get(play_id) != row_hash:
+                changed.append(row)
+
+        deleted: List[int] = []
+        if rows:
+            deleted = [pid for pid in previous if pid not in current]
+        elif previous:
+            # An empty plays array is far more likely a bad payload than a full retraction
+            logger.warning(f"Empty plays array for game_id={game_id}; keeping {len(previous)} known plays")
+            current = dict(previous)
+        return changed, deleted, current
+
+    def commit(self, game_id: int, digest: Dict[int, Optional[int]]) -> None:
+        self._games[game_id] = digest
+
+    def forget(self, game_id: int) -> None:
+        self._games.pop(game_id, None)
+
+    def retain(self, game_ids: Iterable[int]) -> None:
+        """Drop digests for games that are no longer being watched."""
+        keep = set(game_ids)
+        for game_id in [g for g in self._games if g not in keep]:
+            del self._games[game_id]
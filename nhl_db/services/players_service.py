@@ -1,16 +1,21 @@
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
-from ..clients.nhl_web_client import fetch_roster
+import requests
+
+from ..clients.nhl_web_client import fetch_roster, get_configured_session
+from ..clients.records_client import fetch_players_by_team
 from ..db import get_db_connection
 from ..mappers.players import to_player_rows
+from ..repositories.fingerprints_repo import UpsertStats
 from ..repositories.players_repo import upsert_players
 
 logger = logging.getLogger(__name__)
 
 
 def _get_active_teams_from_db() -> List[Tuple[int, str]]:
-    sql = "SELECT teamId, teamAbbrev FROM teams WHERE teamIsActive = 1 AND teamAbbrev IS NOT NULL"
+    sql = "SELECT teamId, teamAbbrev FROM teams WHERE teamIsActive = 1 AND teamAbbrev IS NOT NULL ORDER BY teamId"
     conn = get_db_connection()
     try:
         cur = conn.cursor()
@@ -24,25 +29,65 @@ def _get_active_teams_from_db() -> List[Tuple[int, str]]:
         conn.close()
 
 
-def sync_players_roster(season: str, teams_filter: Optional[str] = None) -> int:
+def _fetch_team_rows(team_id: int, tri: str, seasons: List[str], session: requests.Session) -> List[Tuple[str, List[Tuple[Any, ...]]]]:
+    """Fetch and map one team's rosters for every season (runs on a worker thread)."""
+    # Records API players do not depend on the season, so fetch them once per team
+    records_players = fetch_players_by_team(team_id, session=session)
+    out: List[Tuple[str, List[Tuple[Any, ...]]]] = []
+    for season in seasons:
+        roster = fetch_roster(tri, season, team_id, session=session, records_players=records_players)
+        out.append((season, to_player_rows(roster, team_id)))
+    return out
+
+
+def sync_players_roster(seasons: Union[str, Sequence[str]], teams_filter: Optional[str] = None, max_concurrency: int = 8, force: bool = False) -> UpsertStats:
+    """
+    Import players for every active team across one or more seasons.
+
+    Teams are fetched concurrently through one shared, pooled session, and the
+    rows for all teams are written in a single batched transaction. When a player
+    appears more than once, the row from the latest season wins, and within a
+    season an active roster row beats an inactive Records API row. Remaining ties
+    (a player traded mid-season is active on two rosters) go to the lowest team
+    ID, so the same input always stores the same row. Players whose
+    row is unchanged since the last sync are not rewritten unless ``force`` is set.
+
+    Returns:
+        Unchanged/inserted/updated counts for the distinct players synced.
+    """
+    season_list = sorted([seasons] if isinstance(seasons, str) else list(seasons))
+    if not season_list:
+        raise ValueError("at least one season is required")
+
     allow: Optional[Set[str]] = None
     if teams_filter:
         allow = {t.strip().upper() for t in teams_filter.split(',') if t.strip()}
 
-    team_rows = _get_active_teams_from_db()
-    total = 0
-    for team_id, tri in team_rows:
-        if allow and tri.upper() not in allow:
-            continue
-        try:
-            roster = fetch_roster(tri, season, team_id)
-            rows = to_player_rows(roster, team_id)
-            upsert_players(rows)
-            total += len(rows)
-            print(f"Synced {len(rows)} players for {tri} ({team_id}).")
-        except Exception as e:
-            logger.error(f"Error syncing players for team {tri} (team_id={team_id}): {e}", exc_info=True)
-            raise
-    return total
+    team_rows = [(team_id, tri) for team_id, tri in _get_active_teams_from_db() if not allow or tri.upper() in allow]
+    max_concurrency = max(1, int(max_concurrency))
+    session = get_configured_session(pool_maxsize=max_concurrency)
 
+    # playerId -> ((season index, is active), row)
+    best: Dict[int, Tuple[Tuple[int, int], Tuple[Any, ...]]] = {}
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="roster") as executor:
+        futures = [(executor.submit(_fetch_team_rows, team_id, tri, season_list, session), team_id, tri) for team_id, tri in team_rows]
+        # Merged in team order, not completion order: ties keep the first team's row
+        for future, team_id, tri in futures:
+            try:
+                per_season = future.result()
+            except Exception as e:
+                logger.error(f"Error syncing players for team {tri} (team_id={team_id}): {e}", exc_info=True)
+                raise
+            for season, rows in per_season:
+                rank_season = season_list.index(season)
+                for row in rows:
+                    rank = (rank_season, 1 if row[9] else 0)
+                    current = best.get(row[0])
+                    if current is None or rank > current[0]:
+                        best[row[0]] = (rank, row)
+                print(f"Fetched {len(rows)} players for {tri} ({team_id}) in {season}.")
 
+    rows = [row for _, row in best.values()]
+    stats = upsert_players(rows, force=force)
+    print(f"Synced {len(rows)} distinct players for {len(team_rows)} teams across seasons {', '.join(season_list)} ({stats.describe()}).")
+    return stats
@@ -1,33 +1,89 @@
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 import logging
-from typing import List
+from typing import Any, Dict, List, Set
 
-from ..clients.nhl_web_client import fetch_schedule_for_date
+from ..clients.nhl_web_client import fetch_schedule_week, get_configured_session
 from ..mappers.games import to_game_rows_from_schedule
+from ..repositories.fingerprints_repo import UpsertStats
 from ..repositories.games_repo import upsert_games
 
 logger = logging.getLogger(__name__)
 
+# /schedule/{date} returns a 7-day gameWeek starting at the requested date
+SCHEDULE_WEEK_DAYS = 7
 
-def sync_schedule_dates(start: str, end: str) -> int:
+
+def sync_schedule_dates(start: str, end: str, max_concurrency: int = 4, force: bool = False) -> UpsertStats:
+    """
+    Import all games scheduled between ``start`` and ``end`` (inclusive).
+
+    The range is walked in 7-day strides, since each schedule request already
+    returns a whole gameWeek. Weeks are fetched up to ``max_concurrency`` at a
+    time, games are de-duplicated by ID and clipped to the requested range, and any
+    day a response did not cover is fetched separately. Games whose row is
+    unchanged since the last sync are not rewritten unless ``force`` is set.
+
+    Returns:
+        Unchanged/inserted/updated counts for the distinct games in the range.
+    """
     start_date = datetime.strptime(start, "%Y-%m-%d").date()
     end_date = datetime.strptime(end, "%Y-%m-%d").date()
     if end_date < start_date:
         raise ValueError("end date must be >= start date")
+
+    stride_dates: List[date] = []
     d = start_date
-    total = 0
     while d <= end_date:
-        ds = d.strftime("%Y-%m-%d")
+        stride_dates.append(d)
+        d += timedelta(days=SCHEDULE_WEEK_DAYS)
+
+    max_concurrency = max(1, int(max_concurrency))
+    session = get_configured_session(pool_maxsize=max_concurrency)
+    games_by_id: Dict[int, Dict[str, Any]] = {}
+    covered: Set[str] = set()
+    first = start_date.strftime("%Y-%m-%d")
+    last = end_date.strftime("%Y-%m-%d")
+
+    def _collect(week_start: str, days: List[Dict[str, Any]]) -> None:
+        week_games = 0
+        for day in days:
+            day_str = day.get("date")
+            if not isinstance(day_str, str) or not (first <= day_str <= last):
+                continue
+            covered.add(day_str)
+            for g in day.get("games", []) or []:
+                try:
+                    game_id = int(g.get("id"))
+                except Exception:
+                    continue
+                if game_id not in games_by_id:
+                    games_by_id[game_id] = g
+                    week_games += 1
+        print(f"Week of {week_start}: {week_games} games")
+
+    def _fetch(ds: str) -> List[Dict[str, Any]]:
         try:
-            day_games = fetch_schedule_for_date(ds)
-            rows = to_game_rows_from_schedule(day_games)
-            upsert_games(rows)
-            total += len(rows)
-            print(f"{ds}: upserted {len(rows)} games")
+            return fetch_schedule_week(ds, session=session)
         except Exception as e:
             logger.error(f"Error syncing schedule for date {ds}: {e}", exc_info=True)
             raise
-        d += timedelta(days=1)
-    return total
 
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="schedule") as executor:
+        stride_strs = [s.strftime("%Y-%m-%d") for s in stride_dates]
+        for ds, days in zip(stride_strs, executor.map(_fetch, stride_strs)):
+            _collect(ds, days)
+
+    # Fill any day that a weekly response did not cover (e.g. a short gameWeek)
+    d = start_date
+    while d <= end_date:
+        ds = d.strftime("%Y-%m-%d")
+        if ds not in covered:
+            _collect(ds, _fetch(ds))
+            covered.add(ds)
+        d += timedelta(days=1)
 
+    rows = to_game_rows_from_schedule(list(games_by_id.values()))
+    stats = upsert_games(rows, force=force)
+    print(f"{first}..{last}: {len(rows)} games from {len(stride_dates)} weekly requests ({stats.describe()})")
+    return stats
@@ -3,17 +3,17 @@ import logging
 
 from ..clients.records_client import fetch_franchises
 from ..mappers.teams import to_team_rows
+from ..repositories.fingerprints_repo import UpsertStats
 from ..repositories.teams_repo import upsert_teams
 
 logger = logging.getLogger(__name__)
 
 
-def sync_teams_records() -> int:
+def sync_teams_records(force: bool = False) -> UpsertStats:
     try:
         franchises: List[Dict[str, Any]] = fetch_franchises()
         rows = to_team_rows(franchises)
-        upsert_teams(rows)
-        return len(rows)
+        return upsert_teams(rows, force=force)
     except Exception as e:
         logger.error(f"Error syncing teams from Records API: {e}", exc_info=True)
         raise
@@ -0,0 +1,66 @@
+"""
+Team-keyed shot counts and zone splits must credit blocked shots to the shooting
+team: the feed makes the blocking team their owner and playZone relative to it.
+"""
+from typing import List, Tuple
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from nhl_db.analytics.columns import MISSING_ID, SeasonPlays  # noqa: E402
+from nhl_db.analytics.events import event_counts, shooting_team_ids, zone_splits  # noqa: E402
+
+# (game, owning team, shooter, type, zone)
+PLAYS: List[Tuple[int, int, int, str, str]] = [
+    (2024020001, 10, MISSING_ID, "faceoff", "N"),
+    (2024020001, 10, 101, "shot-on-goal", "O"),
+    (2024020001, 10, 102, "missed-shot", "O"),
+    # Shots by team 6 blocked by team 10, in team 6's offensive zone
+    (2024020001, 10, 601, "blocked-shot", "D"),
+    (2024020001, 10, 602, "blocked-shot", "D"),
+    (2024020001, 6, 601, "goal", "O"),
+    # Another game of team 10; a shot by team 22 blocked in the neutral zone
+    (2024020002, 22, 2201, "shot-on-goal", "O"),
+    (2024020002, 10, 2201, "blocked-shot", "N"),
+    # Only one team owns events here, so the shooter's team is unknown
+    (2024020003, 5, 501, "blocked-shot", "D"),
+]
+
+
+def _season_plays() -> SeasonPlays:
+    types = sorted({p[3] for p in PLAYS})
+    zones = sorted({p[4] for p in PLAYS})
+    arrays = {
+        "game_id": np.array([p[0] for p in PLAYS], dtype=np.int64),
+        "team_id": np.array([p[1] for p in PLAYS], dtype=np.int32),
+        "primary_player_id": np.array([p[2] for p in PLAYS], dtype=np.int64),
+        "type_code": np.array([types.index(p[3]) for p in PLAYS], dtype=np.uint8),
+        "zone_code": np.array([zones.index(p[4]) for p in PLAYS], dtype=np.uint8),
+    }
+    return SeasonPlays(20242025, arrays, types, zones)
+
+
+def test_shooting_team_ids_swap_blocked_shots_to_the_opponent() -> None:
+    plays = _season_plays()
+    assert shooting_team_ids(plays).tolist() == [10, 10, 10, 6, 6, 6, 22, 22, MISSING_ID]
+    # The stored column is untouched
+    assert plays.team_id.tolist() == [p[1] for p in PLAYS]
+
+
+def test_event_counts_by_team_credit_blocked_shots_to_the_shooting_team() -> None:
+    table = event_counts(_season_plays(), by="team")
+    assert table.keys.tolist() == [6, 10, 22]
+    assert table.row(10) == {"shot-on-goal": 1, "missed-shot": 1, "blocked-shot": 0, "goal": 0}
+    assert table.row(6) == {"shot-on-goal": 0, "missed-shot": 0, "blocked-shot": 2, "goal": 1}
+    assert table.row(22) == {"shot-on-goal": 1, "missed-shot": 0, "blocked-shot": 1, "goal": 0}
+
+
+def test_zone_splits_view_blocked_shots_from_the_shooting_team() -> None:
+    by_team = zone_splits(_season_plays(), by="team")
+    assert by_team.row(6) == {"D": 0, "N": 0, "O": 3}
+    assert by_team.row(10) == {"D": 0, "N": 0, "O": 2}
+    assert by_team.row(22) == {"D": 0, "N": 1, "O": 1}
+
+    by_player = zone_splits(_season_plays(), by="player")
+    assert by_player.row(601) == {"D": 0, "N": 0, "O": 2}
+    assert by_player.row(501) == {"D": 0, "N": 0, "O": 1}
@@ -0,0 +1,217 @@
+"""
+Runs the asyncio watch-live engine for one cycle against a local stub NHL Web API
+server (aiohttp.web) and an in-memory stand-in for the aiomysql pool.
+"""
+from typing import Any, Dict, List, Tuple
+
+import asyncio
+import contextlib
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+pytest.importorskip("aiomysql")
+from aiohttp import web  # noqa: E402
+
+from nhl_db.services import live_async_service  # noqa: E402
+
+LIVE_GAME_ID = 2025020001
+FINAL_GAME_ID = 2025020002
+
+
+def _schedule() -> Dict[str, Any]:
+    return {
+        "gameWeek": [{
+            "date": "2025-10-14",
+            "games": [
+                {
+                    "id": LIVE_GAME_ID, "season": 20252026, "gameType": 2, "gameState": "LIVE",
+                    "startTimeUTC": "2025-10-14T23:00:00Z", "venue": {"default": "Arena"},
+                    "homeTeam": {"id": 10, "score": 1}, "awayTeam": {"id": 6, "score": 0},
+                },
+                {
+                    "id": FINAL_GAME_ID, "season": 20252026, "gameType": 2, "gameState": "OFF",
+                    "startTimeUTC": "2025-10-14T17:00:00Z", "venue": {"default": "Rink"},
+                    "homeTeam": {"id": 1, "score": 3}, "awayTeam": {"id": 2, "score": 2},
+                },
+            ],
+        }],
+    }
+
+
+def _landing() -> Dict[str, Any]:
+    return {
+        "gameState": "LIVE",
+        "periodDescriptor": {"number": 2},
+        "clock": {"timeRemaining": "12:34", "inIntermission": False},
+        "homeTeam": {"id": 10, "score": 1},
+        "awayTeam": {"id": 6, "score": 0},
+    }
+
+
+def _boxscore() -> Dict[str, Any]:
+    return {"gameState": "LIVE", "homeTeam": {"id": 10, "score": 1, "sog": 14}, "awayTeam": {"id": 6, "score": 0, "sog": 9}}
+
+
+def _pbp() -> Dict[str, Any]:
+    return {
+        "plays": [
+            {
+                "eventId": 101, "sortOrder": 10, "typeDescKey": "faceoff",
+                "periodDescriptor": {"number": 1}, "timeInPeriod": "00:00", "timeRemaining": "20:00",
+                "details": {"eventOwnerTeamId": 10, "winningPlayerId": 8478402, "losingPlayerId": 8477934, "zoneCode": "N", "xCoord": 0, "yCoord": 0},
+            },
+            {
+                "eventId": 102, "sortOrder": 20, "typeDescKey": "goal",
+                "periodDescriptor": {"number": 1}, "timeInPeriod": "05:12", "timeRemaining": "14:48",
+                "details": {"eventOwnerTeamId": 10, "scoringPlayerId": 8478402, "assist1PlayerId": 8477934, "zoneCode": "O", "xCoord": 80, "yCoord": -3},
+            },
+        ],
+    }
+
+
+class _FakeCursor:
+    def __init__(self, log: List[Tuple[str, Any]]) -> None:
+        self._log = log
+        self.rowcount = 0
+
+    async def __aenter__(self) -> "_FakeCursor":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def execute(self, sql: str, params: Any = None) -> None:
+        self._log.append((sql, params))
+
+    async def executemany(self, sql: str, rows: List[Any]) -> None:
+        self._log.append((sql, list(rows)))
+
+    async def fetchall(self) -> List[Tuple[Any, ...]]:
+        # No plays stored yet
+        return []
+
+
+class _FakeConnection:
+    def __init__(self, log: List[Tuple[str, Any]]) -> None:
+        self._log = log
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self._log)
+
+    async def begin(self) -> None:
+        self._log.append(("BEGIN", None))
+
+    async def commit(self) -> None:
+        self._log.append(("COMMIT", None))
+
+    async def rollback(self) -> None:
+        self._log.append(("ROLLBACK", None))
+
+
+class _FakePool:
+    """Just enough of aiomysql.Pool for the engine: acquire(), close(), wait_closed()."""
+
+    def __init__(self) -> None:
+        self.statements: List[Tuple[str, Any]] = []
+        self.closed = False
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):  # type: ignore[no-untyped-def]
+        yield _FakeConnection(self.statements)
+
+    def close(self) -> None:
+        self.closed = True
+
+    async def wait_closed(self) -> None:
+        return None
+
+
+async def _start_stub_server() -> Tuple[web.AppRunner, str, List[str]]:
+    requested: List[str] = []
+
+    def reply(payload: Dict[str, Any]):  # type: ignore[no-untyped-def]
+        async def handler(request: web.Request) -> web.Response:
+            requested.append(request.path)
+            return web.json_response(payload)
+        return handler
+
+    app = web.Application()
+    app.router.add_get("/schedule/{date}", reply(_schedule()))
+    app.router.add_get(f"/gamecenter/{LIVE_GAME_ID}/landing", reply(_landing()))
+    app.router.add_get(f"/gamecenter/{LIVE_GAME_ID}/boxscore", reply(_boxscore()))
+    app.router.add_get(f"/gamecenter/{LIVE_GAME_ID}/play-by-play", reply(_pbp()))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}", requested
+
+
+def test_async_engine_polls_live_games_from_stub_server(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = _FakePool()
+
+    async def fake_create_pool(**kwargs: Any) -> _FakePool:
+        return pool
+
+    monkeypatch.setattr(live_async_service, "create_async_db_pool", fake_create_pool)
+
+    async def scenario() -> List[str]:
+        runner, base_url, requested = await _start_stub_server()
+        try:
+            await live_async_service.watch_live_games_async(poll_seconds=1, max_concurrency=2, base_url=base_url, max_cycles=1)
+        finally:
+            await runner.cleanup()
+        return requested
+
+    requested = asyncio.run(scenario())
+
+    # The schedule is read once; only the LIVE game's gamecenter endpoints are fetched
+    assert requested[0].startswith("/schedule/")
+    assert sorted(requested[1:]) == sorted(
+        f"/gamecenter/{LIVE_GAME_ID}/{endpoint}" for endpoint in ("landing", "boxscore", "play-by-play")
+    )
+    assert pool.closed
+
+    games_upsert = [rows for sql, rows in pool.statements if sql.startswith("INSERT INTO games")]
+    assert [row[0] for row in games_upsert[0]] == [LIVE_GAME_ID, FINAL_GAME_ID]
+
+    field_updates = [params for sql, params in pool.statements if sql.startswith("UPDATE games")]
+    assert field_updates == [("LIVE", 2, "12:34", False, 1, 0, 14, 9, LIVE_GAME_ID)]
+
+    plays_upsert = [rows for sql, rows in pool.statements if sql.startswith("INSERT INTO plays")]
+    assert [row[0] for row in plays_upsert[0]] == [int(f"{LIVE_GAME_ID}101"), int(f"{LIVE_GAME_ID}102")]
+    assert not [sql for sql, _ in pool.statements if sql.startswith("DELETE")]
+
+    # The game's field update and plays upsert form one transaction
+    game_writes = [sql.split()[0] for sql, _ in pool.statements if not sql.startswith(("INSERT INTO games", "SELECT"))]
+    assert game_writes == ["BEGIN", "UPDATE", "INSERT", "COMMIT"]
+
+
+def test_failed_game_write_rolls_back_and_keeps_the_digest(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = _FakePool()
+
+    async def failing_delete(conn: Any, game_id: int, play_ids: List[int]) -> int:
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(live_async_service, "delete_plays_async", failing_delete)
+    digest = live_async_service.PlayDigest()
+
+    async def scenario() -> None:
+        runner, base_url, _ = await _start_stub_server()
+        try:
+            async with aiohttp.ClientSession() as session:
+                await live_async_service._update_game_async(
+                    LIVE_GAME_ID, session, pool, asyncio.Semaphore(1), digest, base_url=base_url,
+                )
+        finally:
+            await runner.cleanup()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
+
+    assert [sql.split()[0] for sql, _ in pool.statements if sql != "SELECT"][-4:] == ["BEGIN", "UPDATE", "INSERT", "ROLLBACK"]
+    # Nothing was committed, so the next cycle re-sends every play
+    rows = [live_async_service.map_play(LIVE_GAME_ID, p) for p in _pbp()["plays"]]
+    assert digest.diff(LIVE_GAME_ID, rows)[0] == rows
@@ -0,0 +1,80 @@
+"""
+Single-endpoint mode (watch-live --single-endpoint) must write exactly the same
+game fields as the default landing + boxscore + play-by-play mode.
+
+Payload sets live in tests/fixtures/live_fields as <gameId>_<endpoint>.json, the
+layout of ``python -m nhl_db.debug.compare_live_fields --record``.
+"""
+from typing import Any, Dict, List
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+from nhl_db.debug.compare_live_fields import ENDPOINTS, FIELD_NAMES, load_payloads  # noqa: E402
+from nhl_db.services import live_service  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures" / "live_fields"
+
+# Game fields as written by either mode, checked so a regression shared by both
+# derivations does not go unnoticed
+EXPECTED = {
+    # LIVE, clock running in the 2nd period
+    2025020071: ("LIVE", 2, "08:41", False, 2, 1, 17, 12),
+    # 1st intermission: period just ended, intermission countdown as the clock
+    2025020072: ("LIVE", 1, "14:32", True, 0, 1, 9, 11),
+    # Final after regulation
+    2025020073: ("OFF", 3, "00:00", False, 4, 2, 35, 28),
+    # Final after a shootout; play-by-play lacks shots on goal, the boxscore supplies them
+    2025020074: ("FINAL", 5, "00:00", False, 3, 2, 31, 33),
+}
+
+
+def _recorded_game_ids() -> List[int]:
+    return sorted({int(p.name.split("_", 1)[0]) for p in FIXTURES.glob("*_play-by-play.json")})
+
+
+def _stub_fetches(monkeypatch: pytest.MonkeyPatch, payloads: Dict[str, Dict[str, Any]]) -> List[str]:
+    fetched: List[str] = []
+
+    def stub(endpoint: str):  # type: ignore[no-untyped-def]
+        def fetch(game_id: int, session: Any = None, cache: Any = None) -> Dict[str, Any]:
+            fetched.append(endpoint)
+            # A fresh copy per fetch, as from a real response
+            return json.loads(json.dumps(payloads[endpoint]))
+        return fetch
+
+    monkeypatch.setattr(live_service, "fetch_game_landing", stub("landing"))
+    monkeypatch.setattr(live_service, "fetch_game_boxscore", stub("boxscore"))
+    monkeypatch.setattr(live_service, "fetch_game_pbp", stub("play-by-play"))
+    return fetched
+
+
+def test_fixtures_cover_every_expected_game() -> None:
+    assert _recorded_game_ids() == sorted(EXPECTED)
+    for game_id in EXPECTED:
+        for endpoint in ENDPOINTS:
+            assert (FIXTURES / f"{game_id}_{endpoint}.json").is_file()
+
+
+@pytest.mark.parametrize("game_id", sorted(EXPECTED))
+def test_single_endpoint_fields_match_landing_and_boxscore(monkeypatch: pytest.MonkeyPatch, game_id: int) -> None:
+    payloads = load_payloads(FIXTURES, game_id)
+    fetched = _stub_fetches(monkeypatch, payloads)
+
+    default = live_service._map_game_payloads(game_id, *live_service._fetch_game_payloads(game_id, session=None))
+    assert fetched == ["landing", "boxscore", "play-by-play"]
+
+    fetched.clear()
+    single = live_service._map_game_payloads(game_id, *live_service._fetch_game_payloads(game_id, session=None, single_endpoint=True))
+    needs_box = "sog" not in payloads["play-by-play"]["homeTeam"]
+    assert fetched == (["play-by-play", "boxscore"] if needs_box else ["play-by-play"])
+
+    mismatches = {
+        name: (d, s) for name, d, s in zip(FIELD_NAMES, default.fields, single.fields) if d != s
+    }
+    assert not mismatches, f"landing+boxscore vs play-by-play differ for {game_id}: {mismatches}"
+    assert default.fields == EXPECTED[game_id]
+    assert single.rows == default.rows